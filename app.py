@@ -1,91 +1,73 @@
-# app.py
-import math
 import streamlit as st
-from systems import SYSTEMS
-from translations import TRANSLATIONS, LANG_CHOICES, get_text
-
-# ---- Fixed assumptions (no UI) ----
-DEFAULT_YIELD_PER_KWP_YR = 1050   # kWh/kWp/year
-DEFAULT_RTE = 0.90                # round-trip efficiency
-DEFAULT_DOD = 0.95                # usable depth of discharge
-
-LOAD_PROFILES = {
-    "p_balanced": 0.40,
-    "p_workday": 0.30,
-    "p_home": 0.55,
-    "p_evening": 0.25,
-    "p_heatpump": 0.50,
-    "p_custom": None,
-}
-
-# ---- Helpers ----
-def orientation_factor(orientation: str) -> float:
-    o = orientation.lower()
-    if o in ["south", "s"]:
-        return 1.00
-    if o in ["southeast", "se", "south-east"]:
-        return 0.97
-    if o in ["southwest", "sw", "south-west"]:
-        return 0.97
-    if o in ["east", "e"]:
-        return 0.90
-    if o in ["west", "w"]:
-        return 0.90
-    if o in ["north", "n"]:
-        return 0.60
-    return 1.00
-
-def tilt_factor(tilt_deg: float) -> float:
-    if tilt_deg <= 15: return 0.95
-    if 16 <= tilt_deg <= 45: return 1.00
-    if 46 <= tilt_deg <= 60: return 0.90
-    return 0.80
-
-def estimate_yearly_pv_yield_kwp(region_yield, orient_factor, tilt_fac):
-    return region_yield * orient_factor * tilt_fac
-
-def pick_inverter(dc_kw: float, ac_sizes: list, models_map: dict, max_ratio: float) -> dict:
-    choices = []
-    for ac in ac_sizes:
-        ratio = dc_kw / ac if ac > 0 else float("inf")
-        ok = ratio <= max_ratio
-        score = abs(1.25 - ratio)
-        choices.append((ac, ratio, ok, score))
-    valid = [c for c in choices if c[2]]
-    best = min(valid, key=lambda x: (x[3], x[0])) if valid else max(choices, key=lambda x: x[0])
-    ac_kw = best[0]
-    return {"ac_kw": ac_kw, "model": models_map.get(ac_kw, f"{ac_kw:.1f} kW"), "dc_ac_ratio": best[1], "within_cap": best[2]}
-
-def estimate_battery_need_components(annual_kwh: float, pv_kw: float, specific_yield_kwh_per_kwp_yr: float,
-                                     day_fraction: float, backup_kw: float, backup_hours: float):
-    daily_load = annual_kwh / 365.0
-    daily_pv = (pv_kw * specific_yield_kwh_per_kwp_yr) / 365.0
-    day_load = daily_load * day_fraction
-    night_load = daily_load - day_load
-    # Single-side assumption -> no curve flattening factor
-    surplus_day = max(0.0, daily_pv - day_load)
-    shiftable = min(surplus_day, night_load)
-    backup_energy = max(0.0, backup_kw) * max(0.0, backup_hours)
-    return {
-        "daily_load": daily_load, "daily_pv": daily_pv,
-        "day_load": day_load, "night_load": night_load,
-        "surplus_day": surplus_day, "shiftable": shiftable,
-        "backup_energy": backup_energy,
-    }
-
-def apply_system_factors(usable_self_kwh: float, usable_backup_kwh: float,
-                         rte: float, dod: float):
-    usable_needed = usable_self_kwh + usable_backup_kwh
-    nominal_needed = 0.0 if usable_needed <= 0 else usable_needed / (dod * rte)
-    return usable_needed, nominal_needed
-
-def pick_battery_model(usable_kwh_needed: float, options: list, labels: list) -> tuple:
-    if usable_kwh_needed <= 0 or not options: return 0.0, ""
-    idx = min(range(len(options)), key=lambda i: abs(options[i] - usable_kwh_needed))
-    return options[idx], labels[idx] if idx < len(labels) else f"{options[idx]:.1f} kWh"
+from sizer import SYSTEMS, LANG_CHOICES, LOAD_PROFILES, ORIENT_AZIMUTH, get_text
+from sizer import timing
+from sizer.cache import cached_hourly_simulation, cached_meter_import, cached_monte_carlo, default_cache
+from sizer.degradation import pick_lifetime_batteries
+from sizer.economics import evaluate_options
+from sizer.layout import DEFAULT_MODULE
+from sizer.profiles import names as library_profiles
+from sizer.roof import OPPOSITE
+from sizer.uncertainty import YIELD_SIGMA, CONSUMPTION_SIGMA, DAY_FRACTION_SIGMA
+from sizer.stages import Graph, Stage, SYSTEM_STAGES, ROOF_STAGES, SIZING_DEFAULTS, sizing_result
+
+# ---- Stages ----
+# Sizing, simulation and economics form one memoized graph per session and
+# layout, so a widget change only recomputes the stages that read it. The slow
+# stages (roof PV, simulation, Monte Carlo) also go through the shared result
+# cache, so identical inputs from another session are not recomputed.
+def _simulation(hourly_sim, system_key, dc_kw, specific_yield, annual_kwh, day_fraction, rte, dod,
+                planes, module_wp, load_shape, meter):
+    if not hourly_sim:
+        return None
+    return cached_hourly_simulation(system_key, dc_kw, specific_yield, annual_kwh, day_fraction,
+                                    rte, dod, planes, module_wp, load_shape, meter["hourly_kwh"] if meter else None)
+
+def _economics(econ_enabled, system_key, components, tariff, feed_in, battery_price, fixed_cost, horizon,
+               discount_pct, simulation):
+    if not econ_enabled:
+        return None
+    return evaluate_options(SYSTEMS[system_key], components["shiftable"], tariff, feed_in, battery_price,
+                            fixed_cost, horizon, discount_pct / 100.0,
+                            annual_discharge_kwh=simulation["discharged_kwh"][1:] if simulation else None)
+
+def _lifetime(degradation, warranty_years, system_key, components):
+    if not degradation:
+        return None
+    SYS = SYSTEMS[system_key]
+    life = pick_lifetime_batteries(components["shiftable"], components["backup_energy"],
+                                   SYS["battery_options_kwh"], SYS["battery_labels"], warranty_years)
+    return {k: v[0].item() if hasattr(v[0], "item") else v[0] for k, v in life.items()}
+
+def _monte_carlo(uncertainty, system_key, dc_kw, specific_yield, annual_kwh, day_fraction, backup_kw, backup_hours,
+                 rte, dod):
+    if not uncertainty:
+        return None
+    return cached_monte_carlo(system_key=system_key, dc_kw=dc_kw, specific_yield=specific_yield, annual_kwh=annual_kwh,
+                              day_fraction=day_fraction, backup_kw=backup_kw, backup_hours=backup_hours, rte=rte,
+                              dod=dod)
+
+APP_STAGES = [
+    Stage("monte_carlo", _monte_carlo, ("uncertainty", "system_key", "dc_kw", "specific_yield", "annual_kwh",
+                                        "day_fraction", "backup_kw", "backup_hours", "rte", "dod")),
+    Stage("lifetime", _lifetime, ("degradation", "warranty_years", "system_key", "components")),
+    Stage("simulation", _simulation, ("hourly_sim", "system_key", "dc_kw", "specific_yield", "annual_kwh",
+                                      "day_fraction", "rte", "dod", "planes", "module_wp", "load_shape",
+                                      "meter")),
+    Stage("economics", _economics, ("econ_enabled", "system_key", "components", "tariff", "feed_in",
+                                    "battery_price", "fixed_cost", "horizon", "discount_pct", "simulation")),
+]
+
+def session_graph(split_roof: bool) -> Graph:
+    graphs = st.session_state.setdefault("stage_graphs", {})
+    key = "roof" if split_roof else "system"
+    if key not in graphs:
+        graphs[key] = Graph((ROOF_STAGES if split_roof else SYSTEM_STAGES) + APP_STAGES, SIZING_DEFAULTS)
+    return graphs[key]
 
 # ---- App ----
 st.set_page_config(page_title="Sungrow Battery Sizer", layout="centered")
+profiler = timing.start_profile()
+laps = timing.laps()
 
 # Language selector
 lang_codes = [c for c, _ in LANG_CHOICES]
@@ -103,6 +85,11 @@ st.caption(T("subtitle"))
 system_key = st.selectbox(T("system_type"), list(SYSTEMS.keys()), index=0)
 SYS = SYSTEMS[system_key]
 
+layout_keys = ["all_one_side", "split_two_sides"]
+layout_labels = [T(k) for k in layout_keys]
+layout_label = st.radio(T("where_modules"), layout_labels, index=0, horizontal=True)
+split_roof = layout_keys[layout_labels.index(layout_label)] == "split_two_sides"
+
 with st.form("inputs"):
     st.subheader(T("pv_consumption"))
     colA, colB = st.columns(2)
@@ -110,15 +97,23 @@ with st.form("inputs"):
     module_wp = colB.number_input(T("module_wattage"), min_value=250, max_value=700, value=430, step=5)
     annual_kwh = st.number_input(T("annual_consumption"), min_value=500, max_value=50000, value=5000, step=100)
 
-    # ---- Single-side only ----
+    # ---- Orientation: one side, or a main side plus the opposite side ----
     col3, col4 = st.columns(2)
     orient_keys = ["south", "southeast", "southwest", "east", "west", "north"]
     orient_labels = [T(o) for o in orient_keys]
-    orient_label = col3.selectbox(T("orientation"), options=orient_labels, index=0)
+    orient_label = col3.selectbox(T("main_side_orientation" if split_roof else "orientation"),
+                                  options=orient_labels, index=3 if split_roof else 0)
     orientation_single = orient_keys[orient_labels.index(orient_label)]
     tilt = col4.number_input("Tilt (degrees)", min_value=0, max_value=90, value=30, step=1)
-    orient_fac = orientation_factor(orientation_single)
     orientation_text = T(orientation_single)
+    planes = None
+    if split_roof:
+        main_share = st.slider(T("main_side_share"), min_value=0, max_value=100, value=50, step=5)
+        opposite = OPPOSITE[orientation_single]
+        n_main = int(round(total_modules * main_share / 100))
+        planes = [(n_main, ORIENT_AZIMUTH[orientation_single], tilt),
+                  (total_modules - n_main, ORIENT_AZIMUTH[opposite], tilt)]
+        orientation_text = f"{T(orientation_single)} ({n_main}) / {T(opposite)} ({total_modules - n_main})"
 
     # Load profiles
     st.markdown(f"**{T('daily_load_profile')}**")
@@ -130,6 +125,7 @@ with st.form("inputs"):
         day_fraction = st.slider(T("custom_day_pct"), min_value=0.2, max_value=0.8, value=0.40, step=0.05)
     else:
         day_fraction = LOAD_PROFILES[profile_choice]
+    meter_file = st.file_uploader(T("meter_upload"), type=["csv", "txt"], help=T("meter_help"))
 
     # Backup
     st.markdown(T("backup_optional"))
@@ -137,26 +133,67 @@ with st.form("inputs"):
     backup_kw = col5.number_input(T("backup_kw"), min_value=0.0, max_value=30.0, value=0.0, step=0.5)
     backup_hours = col6.number_input(T("backup_h"), min_value=0.0, max_value=48.0, value=0.0, step=0.5)
 
-    submitted = st.form_submit_button(T("calculate"))
+    # Advanced
+    with st.expander(T("advanced")):
+        degradation = st.checkbox(T("degradation"), value=False)
+        uncertainty = st.checkbox(T("uncertainty"), value=False)
+        warranty_years = st.slider(T("warranty_years"), min_value=5, max_value=20, value=10, step=1)
+        colm1, colm2, colm3 = st.columns(3)
+        module = {
+            "voc_v": colm1.number_input(T("module_voc"), min_value=10.0, max_value=100.0,
+                                        value=DEFAULT_MODULE["voc_v"], step=0.1),
+            "vmp_v": colm2.number_input(T("module_vmp"), min_value=10.0, max_value=100.0,
+                                        value=DEFAULT_MODULE["vmp_v"], step=0.1),
+            "imp_a": colm3.number_input(T("module_imp"), min_value=1.0, max_value=30.0,
+                                        value=DEFAULT_MODULE["imp_a"], step=0.1),
+        }
 
-if submitted:
-    # Fixed assumptions
-    region_yield = DEFAULT_YIELD_PER_KWP_YR
-    rte = DEFAULT_RTE
-    dod = DEFAULT_DOD
+    hourly_sim = st.checkbox(T("hourly_sim"), value=False)
+    shape_keys = [None] + library_profiles()
+    shape_labels = [T("load_shape_split")] + [T(f"lp_{k}") for k in shape_keys[1:]]
+    shape_label = st.selectbox(T("load_shape"), shape_labels, index=0)
+    load_shape = shape_keys[shape_labels.index(shape_label)]
 
-    # PV & yield
-    dc_kw = (total_modules * module_wp) / 1000.0
-    tfac = tilt_factor(tilt)
-    specific_yield = estimate_yearly_pv_yield_kwp(region_yield, orient_fac, tfac)
+    # Economics (optional)
+    with st.expander(T("economics")):
+        econ_enabled = st.checkbox(T("econ_enable"), value=False)
+        col7, col8 = st.columns(2)
+        tariff = col7.number_input(T("tariff"), min_value=0.0, max_value=2.0, value=0.30, step=0.01)
+        feed_in = col8.number_input(T("feed_in"), min_value=0.0, max_value=1.0, value=0.08, step=0.01)
+        battery_price = col7.number_input(T("battery_price"), min_value=0.0, max_value=3000.0, value=500.0, step=10.0)
+        fixed_cost = col8.number_input(T("fixed_cost"), min_value=0.0, max_value=20000.0, value=1500.0, step=100.0)
+        horizon = col7.slider(T("horizon_years"), min_value=10, max_value=20, value=15, step=1)
+        discount_pct = col8.number_input(T("discount_rate"), min_value=0.0, max_value=15.0, value=3.0, step=0.5)
 
-    # Inverter
-    inv_choice = pick_inverter(dc_kw, SYS["inverter_ac_sizes"], SYS["models"], SYS["max_dc_ac_ratio"])
+    submitted = st.form_submit_button(T("calculate"))
+laps.lap("input_parsing")
 
-    # Battery components and sizing
-    comp = estimate_battery_need_components(annual_kwh, dc_kw, specific_yield, day_fraction, backup_kw, backup_hours)
-    usable_needed, nominal_needed = apply_system_factors(comp["shiftable"], comp["backup_energy"], rte, dod)
-    rec_kwh, rec_label = pick_battery_model(usable_needed, SYS["battery_options_kwh"], SYS["battery_labels"])
+if submitted:
+    # Smart-meter data replaces the consumption and day-fraction inputs
+    meter = None
+    if meter_file is not None:
+        try:
+            meter = cached_meter_import(meter_file.getvalue())
+            annual_kwh, day_fraction = meter["annual_kwh"], meter["day_fraction"]
+        except ValueError as e:
+            st.warning(T("meter_error").format(error=e))
+    graph = session_graph(split_roof)
+    values = graph.run(system_key=system_key, total_modules=total_modules, module_wp=module_wp,
+                       annual_kwh=annual_kwh, orientation=orientation_single, tilt=tilt, planes=planes,
+                       day_fraction=day_fraction, backup_kw=backup_kw, backup_hours=backup_hours,
+                       degradation=degradation, warranty_years=warranty_years, module=module,
+                       uncertainty=uncertainty, meter=meter,
+                       hourly_sim=hourly_sim, load_shape=load_shape, econ_enabled=econ_enabled,
+                       tariff=tariff, feed_in=feed_in, battery_price=battery_price, fixed_cost=fixed_cost,
+                       horizon=horizon, discount_pct=discount_pct)
+    res = sizing_result(values)
+    dc_kw, specific_yield = res["dc_kw"], res["specific_yield"]
+    inv_choice, comp = res["inverter"], res["components"]
+    usable_needed, rec_kwh, rec_label = res["usable_needed"], res["battery_kwh"], res["battery_label"]
+    life = values["lifetime"]
+    if life:
+        rec_kwh, rec_label = life["battery_kwh"], life["battery_label"]
+    laps.lap("sizing")
 
     # Inverter recommendation
     st.subheader(T("inv_reco"))
@@ -166,6 +203,12 @@ if submitted:
     with colr2:
         st.metric(T("suggested_inverter"), inv_choice["model"],
                  help=T("dcac_help").format(ratio=f"{inv_choice['dc_ac_ratio']:.2f}", cap=SYS["max_dc_ac_ratio"]))
+    layout = inv_choice.get("layout")
+    if layout:
+        st.write(T("string_layout").format(layout=", ".join(
+            T("string_layout_mppt").format(mppt=m + 1, strings=p, modules=n) for m, p, n in layout)))
+    elif "layout" in inv_choice:
+        st.warning(T("no_string_layout"))
     if not inv_choice["within_cap"]:
         st.warning(T("dcac_warn").format(cap=SYS['max_dc_ac_ratio']))
     if backup_kw > 0 and inv_choice["ac_kw"] < backup_kw:
@@ -175,8 +218,14 @@ if submitted:
     st.markdown("---")
     st.subheader(T("battery_inputs"))
     st.write(T("orientation_tilt_line").format(orientation=orientation_text, tilt=tilt))
+    if split_roof:
+        st.caption(T("two_side_caption"))
     day_pct = int(round(day_fraction * 100))
-    st.write(T("profile_line").format(profile=T(profile_choice), day=day_pct, night=100 - day_pct))
+    if meter:
+        st.write(T("meter_line").format(annual=annual_kwh, day=day_pct, coverage=meter["coverage"] * 100,
+                                        readings=meter["readings"], step=meter["step_minutes"]))
+    else:
+        st.write(T("profile_line").format(profile=T(profile_choice), day=day_pct, night=100 - day_pct))
     st.write(T("daily_load_line").format(daily_load=comp['daily_load'], daily_pv=comp['daily_pv'],
                                          dc_kw=dc_kw, specific_yield=specific_yield))
     st.write(T("day_night_line").format(day_load=comp['day_load'], night_load=comp['night_load']))
@@ -196,9 +245,63 @@ if submitted:
         st.caption(T("rounded_caption").format(battery_type=SYS['battery_type'],
                                                battery_step_display=SYS['battery_step_display']))
         st.write(T("breakdown_line").format(self=comp['shiftable'], backup=comp['backup_energy'], total=usable_needed))
+        if life and life["covers_need"]:
+            st.write(T("lifetime_line").format(years=warranty_years, eol=life["eol_usable_kwh"],
+                                               reserve=life["reserve_kwh"]))
+        elif life:
+            st.warning(T("lifetime_short").format(years=warranty_years))
     else:
         st.info(T("small_benefit"))
 
+    # Uncertainty (optional)
+    mc = values["monte_carlo"]
+    if mc:
+        st.markdown("---")
+        st.subheader(T("mc_title"))
+        st.dataframe({
+            "": [T("mc_shiftable"), T("mc_usable")],
+            **{f"P{p}": [f"{mc['shiftable'][i]:.1f}", f"{mc['usable_needed'][i]:.1f}"]
+               for i, p in enumerate(mc["percentiles"])},
+        }, hide_index=True)
+        st.dataframe({
+            T("sim_option"): [label or T("no_battery") for label, _, _ in mc["battery_share"]],
+            T("mc_share"): [f"{share:.0%}" for _, _, share in mc["battery_share"]],
+        }, hide_index=True)
+        st.caption(T("mc_caption").format(n=mc["samples"], y=YIELD_SIGMA * 100, c=CONSUMPTION_SIGMA * 100,
+                                          d=DAY_FRACTION_SIGMA * 100))
+
+    # Hourly simulation (optional)
+    sim = values["simulation"]
+    if sim:
+        st.markdown("---")
+        st.subheader(T("hourly_sim_title"))
+        st.dataframe({
+            T("sim_option"): [lbl or "—" for lbl in sim["label"]],
+            T("sim_usable"): [f"{c:.1f}" for c in sim["capacity_kwh"]],
+            T("sim_self_consumption"): [f"{v:.0%}" for v in sim["self_consumption"]],
+            T("sim_autarky"): [f"{v:.0%}" for v in sim["autarky"]],
+            T("sim_cycles"): [f"{v:.0f}" for v in sim["cycles"]],
+        }, hide_index=True)
+        st.caption(T("sim_caption"))
+
+    # Economics (optional)
+    econ = values["economics"]
+    if econ:
+        st.markdown("---")
+        st.subheader(T("econ_title"))
+        st.dataframe({
+            T("sim_option"): econ["label"],
+            T("econ_npv"): [f"{v:,.0f} €" for v in econ["npv"]],
+            T("econ_payback"): ["—" if v == float("inf") else f"{v:.1f}" for v in econ["payback_years"]],
+            T("econ_lcos"): [f"{v:.3f} €/kWh" for v in econ["lcos"]],
+        }, hide_index=True)
+        best = econ["best_index"]
+        if econ["best_profitable"]:
+            st.write(T("econ_best_line").format(best=econ["label"][best], npv=econ["npv"][best],
+                                                energy=rec_label or T("no_battery")))
+        else:
+            st.info(T("econ_none_profitable"))
+
     # Notes
 if submitted:
     st.markdown("---")
@@ -211,13 +314,27 @@ if submitted:
 
     # Additional assumptions
     st.write(T("assumption_self_consumption"))
-    st.write(T("assumption_single_orientation"))
+    if not split_roof:
+        st.write(T("assumption_single_orientation"))
     st.write(T("assumption_average_yield"))
     st.write(T("assumption_profile_simplified"))
-    st.write(T("assumption_no_tariffs"))
-    st.write(T("assumption_no_string_limits"))
+    if not econ_enabled:
+        st.write(T("assumption_no_tariffs"))
+    if "layout" not in inv_choice:
+        st.write(T("assumption_no_string_limits"))
     st.write(T("assumption_fixed_efficiencies"))
     st.write(T("assumption_backup_additive"))
 
 else:
-    st.info(T("landing_hint"))
\ No newline at end of file
+    st.info(T("landing_hint"))
+laps.lap("rendering")
+
+# Debug panel (SIZER_TRACE=1)
+if timing.is_enabled():
+    with st.expander("⏱ Timings"):
+        st.dataframe([{"span": name, **vals} for name, vals in timing.stats().items()], hide_index=True)
+        if submitted:
+            st.caption("Recomputed stages: " + (", ".join(graph.recomputed) or "none"))
+        st.json(default_cache().stats())
+    timing.flush()
+timing.stop_profile(profiler, "app")
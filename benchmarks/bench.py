@@ -0,0 +1,225 @@
+# bench.py
+import argparse
+import ast
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sizer import SYSTEMS, LANG_CHOICES, get_text   # noqa: E402
+from sizer.batch import size_batch   # noqa: E402
+from sizer.sizing import pick_inverter, pick_battery_model, estimate_battery_need_components   # noqa: E402
+from sizer.systems import CATALOG   # noqa: E402
+from sizer.translations import TRANSLATIONS   # noqa: E402
+
+# Timings of the sizing hot paths against a stored baseline. Every result is
+# "lower is better" (seconds per call, per site or per import) and is the best
+# of several repeats, which is the figure least disturbed by other load on the
+# machine. A run fails (exit 1) when any benchmark is slower than its baseline
+# by more than its threshold: the benchmark's own "threshold" in baseline.json,
+# else the file's default; --threshold overrides both. Baselines are
+# machine-specific; refresh them with --update on the machine that runs the
+# check (per-benchmark thresholds survive an update). Cold imports are the
+# exception: they are compared relative to a reference set of stdlib imports
+# timed in the same run (RELATIVE_TO), so disk and CPU speed cancel out and the
+# stored baseline holds on other machines too.
+#
+#   python -m benchmarks.bench                 # compare with baseline.json
+#   python -m benchmarks.bench --update        # write baseline.json
+#   python -m benchmarks.bench --only batch_1k --only cold_import_app
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+BATCH_SIZES = {"batch_1k": 1_000, "batch_100k": 100_000, "batch_1m": 1_000_000}
+SYSTEM_KEY = next(iter(SYSTEMS))
+INPUTS = 100   # distinct inputs cycled through by the scalar benchmarks
+REFERENCE_IMPORTS = "import decimal, json, argparse, logging, email.parser, http.client"
+
+# ---- Scalar paths ----
+def _per_call(fn, repeat: int = 5) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / (number * INPUTS)
+
+def bench_pick_inverter() -> float:
+    SYS = SYSTEMS[SYSTEM_KEY]
+    args = (SYS["inverter_ac_sizes"], SYS["models"], SYS["max_dc_ac_ratio"])
+    dc = np.linspace(2.0, 30.0, INPUTS).tolist()
+    return _per_call(lambda: [pick_inverter(x, *args) for x in dc])
+
+def bench_catalog_pick_inverter() -> float:
+    index = CATALOG[SYSTEM_KEY]
+    dc = np.linspace(2.0, 30.0, INPUTS).tolist()
+    return _per_call(lambda: [index.pick_inverter(x) for x in dc])
+
+def bench_pick_battery_model() -> float:
+    SYS = SYSTEMS[SYSTEM_KEY]
+    options, labels = SYS["battery_options_kwh"], SYS["battery_labels"]
+    need = np.linspace(0.0, 30.0, INPUTS).tolist()
+    return _per_call(lambda: [pick_battery_model(x, options, labels) for x in need])
+
+def bench_battery_need_components() -> float:
+    annual = np.linspace(2000.0, 9000.0, INPUTS).tolist()
+    return _per_call(lambda: [estimate_battery_need_components(a, 8.0, 1000.0, 0.4, 2.0, 3.0) for a in annual])
+
+def bench_get_text() -> float:
+    langs = [code for code, _ in LANG_CHOICES]
+    keys = list(TRANSLATIONS["en"])
+    pairs = [(langs[i % len(langs)], keys[i * 7 % len(keys)]) for i in range(INPUTS)]
+    return _per_call(lambda: [get_text(lang, key) for lang, key in pairs])
+
+# ---- Full pipeline ----
+def synthetic_inputs(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "total_modules": rng.integers(6, 40, n), "module_wp": rng.choice([400, 430, 450], n),
+        "annual_kwh": rng.uniform(2000.0, 9000.0, n), "tilt": rng.integers(10, 45, n),
+        "orientation": rng.choice(["south", "southeast", "southwest", "east", "west"], n),
+        "day_fraction": rng.uniform(0.25, 0.6, n), "backup_kw": rng.choice([0.0, 2.0], n),
+        "backup_hours": rng.choice([0.0, 3.0], n),
+    }
+
+def bench_batch(n: int) -> float:
+    # Seconds per site through size_batch, inputs built outside the timing
+    inputs = synthetic_inputs(n)
+    size_batch(**{k: v[:100] for k, v in inputs.items()}, system_key=SYSTEM_KEY)   # warm lazy imports
+    best = float("inf")
+    for _ in range(1 if n >= 1_000_000 else 3):
+        started = time.perf_counter()
+        size_batch(**inputs, system_key=SYSTEM_KEY)
+        best = min(best, time.perf_counter() - started)
+    return best / n
+
+# ---- Cold start ----
+def app_imports() -> str:
+    # The module-level imports of app.py, i.e. what a fresh Streamlit session loads
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def bench_cold_import(code: str, repeat: int = 5) -> float:
+    probe = ("import time\nstarted = time.perf_counter()\n" + code +
+             "\nprint(time.perf_counter() - started)")
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+BENCHMARKS = {
+    "pick_inverter": ("call", bench_pick_inverter),
+    "catalog_pick_inverter": ("call", bench_catalog_pick_inverter),
+    "pick_battery_model": ("call", bench_pick_battery_model),
+    "estimate_battery_need_components": ("call", bench_battery_need_components),
+    "get_text": ("call", bench_get_text),
+    **{name: ("site", lambda n=n: bench_batch(n)) for name, n in BATCH_SIZES.items()},
+    "cold_import_reference": ("run", lambda: bench_cold_import(REFERENCE_IMPORTS)),
+    "cold_import_sizer": ("run", lambda: bench_cold_import("import sizer")),
+    "cold_import_app": ("run", lambda: bench_cold_import(app_imports())),
+}
+# Benchmarks compared after scaling their baseline by the reference's change
+RELATIVE_TO = {"cold_import_sizer": "cold_import_reference", "cold_import_app": "cold_import_reference"}
+
+# ---- Baseline ----
+def load_baseline(path: str = BASELINE_FILE) -> dict:
+    if not os.path.exists(path):
+        return {"threshold": DEFAULT_THRESHOLD, "results": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results: dict, baseline: dict, threshold: float = None) -> list:
+    # Rows of (name, value, baseline value or None, change, limit or None, regressed);
+    # references get no limit, benchmarks relative to one are judged on the scaled baseline
+    rows = []
+    stored = baseline.get("results", {})
+    default = threshold if threshold is not None else baseline.get("threshold", DEFAULT_THRESHOLD)
+    references = set(RELATIVE_TO.values())
+    for name, value in results.items():
+        base = stored.get(name)
+        if base is None:
+            rows.append((name, value, None, None, None, False))
+            continue
+        expected = base["value"]
+        ref = RELATIVE_TO.get(name)
+        if ref in results and ref in stored:
+            expected *= results[ref] / stored[ref]["value"]
+        change = value / expected - 1.0
+        if name in references:
+            rows.append((name, value, base["value"], change, None, False))
+            continue
+        limit = base.get("threshold", default) if threshold is None else threshold
+        rows.append((name, value, expected, change, limit, change > limit))
+    return rows
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6), ("ns", 1e-9)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the sizing benchmarks and compare with the stored baseline")
+    ap.add_argument("--only", action="append", choices=list(BENCHMARKS), help="run just these (repeatable)")
+    ap.add_argument("--skip", action="append", choices=list(BENCHMARKS), default=[], help="leave these out")
+    ap.add_argument("--threshold", type=float, default=None,
+                    help="allowed slowdown as a fraction, overriding baseline.json (e.g. 0.25)")
+    ap.add_argument("--baseline", default=BASELINE_FILE)
+    ap.add_argument("--update", action="store_true", help="store this run as the baseline")
+    ap.add_argument("--out", help="also write this run's results as JSON")
+    args = ap.parse_args(argv)
+
+    names = [n for n in (args.only or BENCHMARKS) if n not in args.skip]
+    # A relative benchmark needs its reference timed in the same run
+    names = list(dict.fromkeys([RELATIVE_TO[n] for n in names if n in RELATIVE_TO] + names))
+    results = {}
+    for name in names:
+        unit, fn = BENCHMARKS[name]
+        results[name] = fn()
+        print(f"{name:34} {_fmt(results[name]):>10}/{unit}", file=sys.stderr, flush=True)
+
+    env = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+           "system": platform.system(), "cpus": os.cpu_count()}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"env": env, "results": results}, f, indent=2)
+
+    baseline = load_baseline(args.baseline)
+    if args.update:
+        stored = baseline.get("results", {})
+        for name, value in results.items():
+            stored[name] = {**stored.get(name, {}), "value": value, "unit": f"s/{BENCHMARKS[name][0]}"}
+        baseline = {"threshold": baseline.get("threshold", DEFAULT_THRESHOLD), "env": env, "results": stored}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    failed = []
+    print(f"\n{'benchmark':34} {'now':>10} {'baseline':>10} {'change':>8} {'limit':>7}")
+    for name, value, base, change, limit, regressed in compare(results, baseline, args.threshold):
+        if base is None:
+            print(f"{name:34} {_fmt(value):>10} {'-':>10} {'new':>8}")
+            continue
+        if limit is None:
+            print(f"{name:34} {_fmt(value):>10} {_fmt(base):>10} {change:>+8.0%} {'ref':>7}")
+            continue
+        print(f"{name:34} {_fmt(value):>10} {_fmt(base):>10} {change:>+8.0%} {limit:>+7.0%}"
+              + ("  REGRESSION" if regressed else ""))
+        if regressed:
+            failed.append(name)
+    if failed:
+        print(f"\n{len(failed)} regression(s): {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
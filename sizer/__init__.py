@@ -0,0 +1,9 @@
+# Headless core of the battery sizer. Importing the package only pulls in the
+# pure-Python pieces; the NumPy engines (batch, simulation, roof, sweep, ...)
+# are submodules that callers import explicitly.
+from .systems import SYSTEMS, CATALOG
+from .translations import TRANSLATIONS, LANG_CHOICES, get_text
+from .sizing import (DEFAULT_YIELD_PER_KWP_YR, DEFAULT_RTE, DEFAULT_DOD, LOAD_PROFILES, ORIENT_AZIMUTH,
+                     orientation_azimuth, orientation_known, orientation_tilt_factor,
+                     pick_inverter, estimate_battery_need_components,
+                     apply_system_factors, pick_battery_model, size_system)
@@ -0,0 +1,162 @@
+# batch.py
+import numpy as np
+from .systems import CATALOG, SYSTEMS
+from .sizing import DEFAULT_YIELD_PER_KWP_YR, DEFAULT_RTE, DEFAULT_DOD, orientation_azimuth
+from .transposition import yield_factors
+from .degradation import pick_lifetime_batteries
+from .layout import solve_layout
+
+# Columnar counterparts of the scalar helpers in sizing.py. Every function takes
+# NumPy arrays (or anything broadcastable) and returns results that are equal,
+# row by row, to calling the scalar function on each element.
+
+# ---- Vectorized helpers ----
+def orientation_azimuths(orientations) -> np.ndarray:
+    o = np.asarray(orientations)
+    if o.dtype.kind in "iuf":
+        return o.astype(float)
+    uniq, inv = np.unique(o.astype(str), return_inverse=True)
+    table = np.array([orientation_azimuth(str(u)) for u in uniq], dtype=float)
+    return table[inv].reshape(o.shape)
+
+def pick_inverters(dc_kw, ac_sizes: list, models_map: dict, max_ratio: float, feasible=None) -> dict:
+    # feasible: optional (rows × inverters) mask of inverters with a valid string
+    # layout; rows where no inverter has one are picked without the mask.
+    dc = np.asarray(dc_kw, dtype=float).reshape(-1)
+    # Sort sizes ascending so argmin's first-hit rule reproduces the (score, ac) tie-break
+    order = np.argsort(np.asarray(ac_sizes, dtype=float), kind="stable")
+    sizes = [ac_sizes[i] for i in order]
+    ac = np.asarray(sizes, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(ac > 0, dc[:, None] / np.where(ac > 0, ac, 1.0), np.inf)
+    ok = ratio <= max_ratio
+    if feasible is None:
+        fallback = np.full(len(dc), len(sizes) - 1)
+    else:
+        mask = np.broadcast_to(np.asarray(feasible, dtype=bool), ok.shape)[:, order]
+        mask = mask | ~mask.any(axis=1, keepdims=True)
+        ok &= mask
+        fallback = len(sizes) - 1 - np.argmax(mask[:, ::-1], axis=1)   # largest allowed size
+    score = np.where(ok, np.abs(1.25 - ratio), np.inf)
+    within_cap = ok.any(axis=1)
+    best = np.where(within_cap, np.argmin(score, axis=1), fallback)
+    names = np.array([models_map.get(a, f"{a:.1f} kW") for a in sizes], dtype=object)
+    return {
+        "ac_kw": ac[best], "model": names[best],
+        "dc_ac_ratio": np.take_along_axis(ratio, best[:, None], axis=1)[:, 0],
+        "within_cap": within_cap,
+    }
+
+def estimate_battery_need_components_batch(annual_kwh, pv_kw, specific_yield_kwh_per_kwp_yr,
+                                           day_fraction, backup_kw, backup_hours) -> dict:
+    daily_load = np.asarray(annual_kwh, dtype=float) / 365.0
+    daily_pv = (np.asarray(pv_kw, dtype=float) * specific_yield_kwh_per_kwp_yr) / 365.0
+    day_load = daily_load * day_fraction
+    night_load = daily_load - day_load
+    surplus_day = np.maximum(0.0, daily_pv - day_load)
+    shiftable = np.minimum(surplus_day, night_load)
+    backup_energy = np.maximum(0.0, backup_kw) * np.maximum(0.0, backup_hours)
+    return {
+        "daily_load": daily_load, "daily_pv": daily_pv,
+        "day_load": day_load, "night_load": night_load,
+        "surplus_day": surplus_day, "shiftable": shiftable,
+        "backup_energy": backup_energy,
+    }
+
+def apply_system_factors_batch(usable_self_kwh, usable_backup_kwh, rte: float, dod: float):
+    usable_needed = np.asarray(usable_self_kwh, dtype=float) + usable_backup_kwh
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nominal_needed = np.where(usable_needed <= 0, 0.0, usable_needed / (dod * rte))
+    return usable_needed, nominal_needed
+
+def pick_battery_models(usable_kwh_needed, options: list, labels: list):
+    need = np.asarray(usable_kwh_needed, dtype=float).reshape(-1)
+    if not options:
+        return np.zeros(need.shape), np.full(need.shape, "", dtype=object)
+    # Nearest option via searchsorted on the distinct values; ties go to the
+    # option listed first, like min(range(...)) in the scalar version.
+    values, first = np.unique(np.asarray(options, dtype=float), return_index=True)
+    hi = np.clip(np.searchsorted(values, need), 0, len(values) - 1)
+    lo = np.clip(hi - 1, 0, len(values) - 1)
+    d_lo, d_hi = np.abs(values[lo] - need), np.abs(values[hi] - need)
+    take_hi = (d_hi < d_lo) | ((d_hi == d_lo) & (first[hi] < first[lo]))
+    idx = first[np.where(take_hi, hi, lo)]
+    names = [labels[i] if i < len(labels) else f"{options[i]:.1f} kWh" for i in range(len(options))]
+    names = np.array(names + [""], dtype=object)
+    none = need <= 0
+    return np.where(none, 0.0, np.asarray(options, dtype=float)[idx]), names[np.where(none, len(options), idx)]
+
+# ---- Full chain ----
+def layout_feasibility(total_modules, limits: tuple, module: dict = None) -> np.ndarray:
+    # (rows × inverters) mask of inverters whose string layout can take each row's
+    # module count; solved once per distinct count (the solver memoizes too).
+    counts, inv = np.unique(np.asarray(total_modules, dtype=float).reshape(-1).astype(np.int64), return_inverse=True)
+    table = np.array([[solve_layout(int(c), module, lim) is not None for lim in limits] for c in counts],
+                     dtype=bool).reshape(len(counts), len(limits))
+    return table[inv]
+
+def _size_one_system(SYS: dict, dc_kw, specific_yield, annual_kwh, day_fraction,
+                     backup_kw, backup_hours, rte: float, dod: float, warranty_years: int = None,
+                     modules=None, limits: tuple = None, module: dict = None) -> dict:
+    feasible = None
+    if modules is not None and limits and any(lim is not None for lim in limits):
+        feasible = layout_feasibility(modules, limits, module)
+    inv = pick_inverters(dc_kw, SYS["inverter_ac_sizes"], SYS["models"], SYS["max_dc_ac_ratio"], feasible)
+    comp = estimate_battery_need_components_batch(annual_kwh, dc_kw, specific_yield,
+                                                  day_fraction, backup_kw, backup_hours)
+    usable_needed, nominal_needed = apply_system_factors_batch(comp["shiftable"], comp["backup_energy"], rte, dod)
+    rec_kwh, rec_label = pick_battery_models(usable_needed, SYS["battery_options_kwh"], SYS["battery_labels"])
+    res = {
+        "inverter_ac_kw": inv["ac_kw"], "inverter_model": inv["model"],
+        "dc_ac_ratio": inv["dc_ac_ratio"], "within_cap": inv["within_cap"],
+        "layout_ok": np.ones(len(inv["ac_kw"]), dtype=bool) if feasible is None else
+                      feasible[np.arange(len(inv["ac_kw"])), np.searchsorted(SYS["inverter_ac_sizes"], inv["ac_kw"])],
+        **comp,
+        "usable_needed": usable_needed, "nominal_needed": nominal_needed,
+        "battery_kwh": rec_kwh, "battery_label": rec_label,
+    }
+    if warranty_years:
+        life = pick_lifetime_batteries(comp["shiftable"], comp["backup_energy"], SYS["battery_options_kwh"],
+                                       SYS["battery_labels"], warranty_years)
+        res.update({"lifetime_battery_kwh": life["battery_kwh"], "lifetime_battery_label": life["battery_label"],
+                    "eol_usable_kwh": life["eol_usable_kwh"]})
+    return res
+
+def size_batch(total_modules, module_wp, annual_kwh, tilt, orientation, day_fraction,
+               backup_kw=0.0, backup_hours=0.0, system_key=None,
+               region_yield: float = DEFAULT_YIELD_PER_KWP_YR,
+               rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD, warranty_years: int = None,
+               module: dict = None) -> dict:
+    # warranty_years adds lifetime_battery_kwh/_label and eol_usable_kwh columns (see degradation.py);
+    # module is the electrical spec used for the string-layout check (layout.DEFAULT_MODULE if None)
+    if system_key is None:
+        system_key = next(iter(SYSTEMS))
+    # Categorical columns are resolved on their unique values before broadcasting
+    azimuth = orientation_azimuths(orientation)
+    keys = np.asarray(system_key, dtype=str)
+    uniq, codes = np.unique(keys, return_inverse=True)
+    cols = np.broadcast_arrays(np.asarray(total_modules, dtype=float), np.asarray(module_wp, dtype=float),
+                               np.asarray(annual_kwh, dtype=float), np.asarray(tilt, dtype=float), azimuth,
+                               np.asarray(day_fraction, dtype=float), np.asarray(backup_kw, dtype=float),
+                               np.asarray(backup_hours, dtype=float), codes.reshape(keys.shape))
+    modules, wp, annual, tilt, azimuth, day_frac, b_kw, b_h, inv = (np.ravel(c) for c in cols)
+
+    dc_kw = (modules * wp) / 1000.0
+    specific_yield = region_yield * yield_factors(azimuth, tilt)
+
+    if len(uniq) == 1:
+        key = str(uniq[0])
+        res = _size_one_system(SYSTEMS[key], dc_kw, specific_yield, annual, day_frac, b_kw, b_h, rte, dod,
+                               warranty_years, modules, CATALOG[key].string_limits, module)
+    else:
+        res = {}
+        for k, key in enumerate(uniq):
+            rows = np.flatnonzero(inv == k)
+            part = _size_one_system(SYSTEMS[str(key)], dc_kw[rows], specific_yield[rows], annual[rows],
+                                    day_frac[rows], b_kw[rows], b_h[rows], rte, dod, warranty_years,
+                                    modules[rows], CATALOG[str(key)].string_limits, module)
+            for name, values in part.items():
+                if name not in res:
+                    res[name] = np.empty(len(inv), dtype=values.dtype)
+                res[name][rows] = values
+    return {"dc_kw": dc_kw, "specific_yield": specific_yield, **res}
@@ -0,0 +1,220 @@
+# cache.py
+import hashlib
+import json
+import numbers
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from .systems import CATALOG, SYSTEMS
+
+# Results are keyed on a hash of the normalized inputs plus the catalog
+# version and the model version (a hash of the package's source), so neither
+# a catalog update nor a model change ever serves stale recommendations. The
+# in-memory LRU is shared by every session in the process; the optional SQLite
+# file is shared between processes. Cached values must be JSON-serializable,
+# and callers get their own copy, so mutating a result never alters the cache.
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ---- Keys ----
+def _normalize(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, numbers.Real):
+        return repr(round(float(value), 9))   # 16, 16.0 and numpy scalars hash alike
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return str(value)
+
+@lru_cache(maxsize=1)
+def model_version() -> str:
+    # Fingerprint of the sizer sources; any code change starts a fresh key space
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(PACKAGE_DIR)):
+        if name.endswith(".py"):
+            with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+                h.update(name.encode() + b"\0" + f.read())
+    return h.hexdigest()[:16]
+
+def input_key(namespace: str, inputs: dict, version: str = None) -> str:
+    canonical = json.dumps(_normalize(inputs), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    payload = f"{namespace}|{version or CATALOG.version}|{model_version()}|{canonical}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# ---- Cache ----
+def _copy(value):
+    # Copy of a JSON-style value (cheaper than copy.deepcopy for dicts and lists of scalars)
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+class ResultCache:
+    def __init__(self, max_entries: int = 1024, path: str = None, max_disk_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.path = path
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._puts_since_trim = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if path:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results "
+                             "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+
+    def _remember(self, key: str, value):
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return _copy(self._mem[key])
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return _copy(value)
+            self.misses += 1
+            return default
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._remember(key, _copy(value))
+            if self._db is None:
+                return
+            self._db.execute("INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+                             (key, json.dumps(value), time.time()))
+            # COUNT(*) is a table scan, so trim in batches rather than on every write
+            self._puts_since_trim += 1
+            if self._puts_since_trim >= 64:
+                self._puts_since_trim = 0
+                self._trim_disk()
+
+    def _trim_disk(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+        extra = count - self.max_disk_entries
+        if extra > 0:
+            self._db.execute("DELETE FROM results WHERE key IN "
+                             "(SELECT key FROM results ORDER BY last_used LIMIT ?)", (extra,))
+            self.evictions += extra
+
+    def get_or_compute(self, namespace: str, inputs: dict, compute):
+        key = input_key(namespace, inputs)
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions, "entries": len(self._mem),
+            "max_entries": self.max_entries, "path": self.path,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+
+# ---- Shared instance ----
+_default = None
+_default_lock = threading.Lock()
+
+def default_cache() -> ResultCache:
+    # SIZER_CACHE_SIZE bounds the in-memory LRU; SIZER_CACHE_DB enables the SQLite backing
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ResultCache(int(os.environ.get("SIZER_CACHE_SIZE", "1024")),
+                                   os.environ.get("SIZER_CACHE_DB") or None)
+        return _default
+
+# ---- Cached entry points ----
+def cached_meter_import(data: bytes) -> dict:
+    def compute():
+        from .meter import import_meter
+        res = import_meter(data)
+        return {**res, "hourly_kwh": res["hourly_kwh"].tolist()}
+    return default_cache().get_or_compute("meter_import", {"sha256": hashlib.sha256(data).hexdigest()}, compute)
+
+def cached_roof_profile(planes: list, module_wp: float, region_yield: float) -> list:
+    # Hourly PV of the roof planes (8760 kWh values); the typical-year irradiance behind it is the slow part
+    def compute():
+        from .roof import combined_profile
+        return combined_profile(planes, module_wp, region_yield).tolist()
+    inputs = {"planes": planes, "module_wp": module_wp, "region_yield": region_yield}
+    return default_cache().get_or_compute("roof_profile", inputs, compute)
+
+def cached_monte_carlo(**inputs) -> dict:
+    def compute():
+        from .uncertainty import monte_carlo
+        return monte_carlo(**inputs)
+    return default_cache().get_or_compute("monte_carlo", inputs, compute)
+
+def cached_size_roof(**inputs) -> dict:
+    def compute():
+        from .roof import size_roof
+        return size_roof(**inputs)
+    return default_cache().get_or_compute("size_roof", inputs, compute)
+
+def cached_hourly_simulation(system_key: str, dc_kw: float, specific_yield: float, annual_kwh: float,
+                             day_fraction: float, rte: float, dod: float,
+                             planes: list = None, module_wp: float = None, load_profile: str = None,
+                             load_kwh: list = None) -> dict:
+    # With planes given, PV comes from the multi-plane model instead of the single-plane curve;
+    # with load_profile given, load comes from the standard-profile library instead of the day/night split;
+    # load_kwh (8760 values, e.g. from meter.py) is used as the load as-is. Otherwise the
+    # precomputed response surface answers when it covers the inputs (see surface.py).
+    def compute():
+        from .simulation import hourly_pv_profile, hourly_load_profile, simulate_system
+        sim = None
+        if not planes and load_kwh is None and not load_profile:
+            from .surface import lookup
+            sim = lookup(SYSTEMS[system_key], dc_kw, specific_yield, annual_kwh, day_fraction, rte, dod)
+        if sim is not None:
+            return {k: [v.item() if hasattr(v, "item") else v for v in vals] for k, vals in sim.items()}
+        if planes:
+            from .roof import combined_profile
+            pv = combined_profile(planes, module_wp)
+        else:
+            pv = hourly_pv_profile(dc_kw, specific_yield)
+        if load_kwh is not None:
+            load = load_kwh
+        elif load_profile:
+            from .profiles import hourly
+            load = hourly(load_profile, annual_kwh)
+        else:
+            load = hourly_load_profile(annual_kwh, day_fraction)
+        sim = simulate_system(SYSTEMS[system_key], pv, load, rte, dod)
+        return {k: [v.item() if hasattr(v, "item") else v for v in vals] for k, vals in sim.items()}
+    inputs = {"system_key": system_key, "dc_kw": dc_kw, "specific_yield": specific_yield,
+              "annual_kwh": annual_kwh, "day_fraction": day_fraction, "rte": rte, "dod": dod,
+              "planes": planes, "module_wp": module_wp, "load_profile": load_profile,
+              "load_kwh": None if load_kwh is None else hashlib.sha256(json.dumps(list(load_kwh)).encode()).hexdigest()}
+    return default_cache().get_or_compute("hourly_simulation", inputs, compute)
@@ -0,0 +1,207 @@
+# catalog.py
+import hashlib
+import json
+import os
+from bisect import bisect_left
+
+from .layout import LIMIT_FIELDS, solve_layout, string_limits
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "data", "systems.json")
+TARGET_DC_AC_RATIO = 1.25
+
+# Catalog files (JSON or TOML) look like:
+#   version = "2025.1"
+#   [systems."<name>"]  battery_type, battery_step_display, max_dc_ac_ratio, mppts,
+#                       max_strings_total, max_string_current_a,
+#                       max_dc_voltage_v?, mppt_min_v?, mppt_max_v?, strings_per_mppt?,
+#                       inverters = [{model, ac_kw, regions?, <voltage fields>?}],
+#                       batteries = [{label, usable_kwh, regions?}]
+# Systems and SKUs may carry an optional "regions" list; entries without one
+# are available everywhere. The voltage fields enable string-layout checks
+# (layout.py); an inverter's own values override the system's.
+SYSTEM_FIELDS = ("battery_type", "battery_step_display", "max_dc_ac_ratio", "mppts",
+                 "max_strings_total", "max_string_current_a", "inverters", "batteries")
+
+# ---- Compiled per-system index ----
+class SystemIndex:
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.spec = spec
+        self.max_ratio = spec["max_dc_ac_ratio"]
+        inverters = sorted(spec["inverters"], key=lambda inv: inv["ac_kw"])
+        self.ac_sizes = tuple(inv["ac_kw"] for inv in inverters)
+        self.models = tuple(inv["model"] for inv in inverters)
+        self.string_limits = tuple(string_limits(spec, inv) for inv in inverters)
+        # DC/AC bands: the DC size each inverter hits at the target ratio and at the cap
+        self.ideal_dc_kw = tuple(ac * TARGET_DC_AC_RATIO for ac in self.ac_sizes)
+        self.max_dc_kw = tuple(ac * self.max_ratio for ac in self.ac_sizes)
+        # Batteries keep their listed order for labels; lookups bisect the
+        # distinct sorted values and break ties towards the first-listed option.
+        self.battery_options = tuple(b["usable_kwh"] for b in spec["batteries"])
+        self.battery_labels = tuple(b["label"] for b in spec["batteries"])
+        first = {}
+        for i, kwh in enumerate(self.battery_options):
+            first.setdefault(kwh, i)
+        self.battery_values = tuple(sorted(first))
+        self.battery_first = tuple(first[v] for v in self.battery_values)
+
+    def _first_true(self, pred, guess: int) -> int:
+        # Smallest index where a monotone predicate holds. The float bands give
+        # the bisect guess; the exact division check only moves it at the edges.
+        n = len(self.ac_sizes)
+        i = min(max(guess, 0), n)
+        while i > 0 and pred(i - 1):
+            i -= 1
+        while i < n and not pred(i):
+            i += 1
+        return i
+
+    def pick_inverter(self, dc_kw: float, module_groups=None, module: dict = None) -> dict:
+        # With module_groups (a module count, or one count per roof plane) only
+        # inverters with a valid string layout are considered, and the result
+        # carries the layout; it is None when no inverter can take the modules.
+        if module_groups is None or all(lim is None for lim in self.string_limits):
+            return self._pick_inverter(dc_kw)
+        layouts = [solve_layout(module_groups, module, lim) for lim in self.string_limits]
+        feasible = [i for i, layout in enumerate(layouts) if layout is not None]
+        if len(feasible) in (0, len(layouts)):
+            choice = self._pick_inverter(dc_kw)
+        else:
+            from .sizing import pick_inverter
+            acs = [self.ac_sizes[i] for i in feasible]
+            choice = pick_inverter(dc_kw, acs, dict(zip(acs, (self.models[i] for i in feasible))), self.max_ratio)
+        choice["layout"] = layouts[self.ac_sizes.index(choice["ac_kw"])]
+        return choice
+
+    def _pick_inverter(self, dc_kw: float) -> dict:
+        acs = self.ac_sizes
+        lo = self._first_true(lambda i: dc_kw / acs[i] <= self.max_ratio, bisect_left(self.max_dc_kw, dc_kw))
+        if lo == len(acs):
+            ac = acs[-1]
+            return {"ac_kw": ac, "model": self.models[-1], "dc_ac_ratio": dc_kw / ac, "within_cap": False}
+        # The score |1.25 - ratio| falls until the ratio crosses 1.25 and rises
+        # after it, so the best inverter is one of the two sizes around the crossing.
+        # With a cap below 1.25 the crossing can lie below lo: then lo, the smallest
+        # inverter within the cap, has the ratio closest to 1.25.
+        j = self._first_true(lambda i: dc_kw / acs[i] <= TARGET_DC_AC_RATIO, bisect_left(self.ideal_dc_kw, dc_kw))
+        cands = [i for i in (j - 1, j) if lo <= i < len(acs)] or [lo]
+        best = min(cands, key=lambda i: (abs(TARGET_DC_AC_RATIO - dc_kw / acs[i]), acs[i]))
+        return {"ac_kw": acs[best], "model": self.models[best], "dc_ac_ratio": dc_kw / acs[best], "within_cap": True}
+
+    def pick_battery(self, usable_kwh_needed: float) -> tuple:
+        if usable_kwh_needed <= 0 or not self.battery_options: return 0.0, ""
+        values = self.battery_values
+        hi = bisect_left(values, usable_kwh_needed)
+        cands = [k for k in (hi - 1, hi) if 0 <= k < len(values)]
+        k = min(cands, key=lambda k: (abs(values[k] - usable_kwh_needed), self.battery_first[k]))
+        idx = self.battery_first[k]
+        return self.battery_options[idx], self.battery_labels[idx]
+
+    def legacy(self) -> dict:
+        # Same shape as the original hand-written SYSTEMS entries
+        s = self.spec
+        return {
+            "models": dict(zip(self.ac_sizes, self.models)),
+            "inverter_ac_sizes": list(self.ac_sizes),
+            "max_dc_ac_ratio": s["max_dc_ac_ratio"],
+            "mppts": s["mppts"],
+            "max_strings_total": s["max_strings_total"],
+            "max_string_current_a": s["max_string_current_a"],
+            "battery_type": s["battery_type"],
+            "battery_options_kwh": list(self.battery_options),
+            "battery_labels": list(self.battery_labels),
+            "battery_step_display": s["battery_step_display"],
+        }
+
+class Catalog:
+    def __init__(self, systems: dict, version: str):
+        self.systems = systems
+        self.version = version
+
+    def __getitem__(self, key: str) -> SystemIndex:
+        return self.systems[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.systems
+
+    def keys(self):
+        return self.systems.keys()
+
+    def legacy(self) -> dict:
+        return {k: idx.legacy() for k, idx in self.systems.items()}
+
+# ---- Loading & validation ----
+def _read(path: str) -> dict:
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _in_region(entry: dict, region: str) -> bool:
+    return region is None or "regions" not in entry or region in entry["regions"]
+
+def _validate(name: str, spec: dict) -> list:
+    errors = [f"{name}: missing field '{f}'" for f in SYSTEM_FIELDS if f not in spec]
+    if errors:
+        return errors
+    if not spec["max_dc_ac_ratio"] > 0:
+        errors.append(f"{name}: max_dc_ac_ratio must be positive")
+    if not spec["inverters"]:
+        errors.append(f"{name}: no inverters")
+    sizes = [inv.get("ac_kw") for inv in spec["inverters"]]
+    if any(not isinstance(ac, (int, float)) or ac <= 0 for ac in sizes):
+        errors.append(f"{name}: inverter ac_kw must be positive numbers, got {sizes}")
+    elif len(set(sizes)) != len(sizes):
+        errors.append(f"{name}: duplicate inverter AC sizes {sizes}")
+    if any(not inv.get("model") for inv in spec["inverters"]):
+        errors.append(f"{name}: every inverter needs a model name")
+    options = [b.get("usable_kwh") for b in spec["batteries"]]
+    if any(not isinstance(kwh, (int, float)) or kwh <= 0 for kwh in options):
+        errors.append(f"{name}: battery usable_kwh must be positive numbers, got {options}")
+    spm = spec.get("strings_per_mppt")
+    if spm is not None and (len(spm) != spec["mppts"] or sum(spm) < spec["max_strings_total"]):
+        errors.append(f"{name}: strings_per_mppt {spm} does not match mppts/max_strings_total")
+    for inv in spec["inverters"]:
+        limits = {f: inv.get(f, spec.get(f)) for f in LIMIT_FIELDS[:3]}
+        if None not in limits.values() and not 0 <= limits["mppt_min_v"] < limits["mppt_max_v"] <= limits["max_dc_voltage_v"]:
+            errors.append(f"{name}: {inv.get('model')} needs mppt_min_v < mppt_max_v <= max_dc_voltage_v")
+    if any(not b.get("label") for b in spec["batteries"]):
+        errors.append(f"{name}: every battery needs a label")
+    return errors
+
+def _catalog_files(paths) -> list:
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(os.path.join(p, f) for f in os.listdir(p) if f.endswith((".json", ".toml")))
+        else:
+            files.append(p)
+    return files
+
+def load_catalog(paths=None, region: str = None) -> Catalog:
+    files = _catalog_files(paths or [DEFAULT_CATALOG_PATH])
+    systems, versions, errors = {}, [], []
+    digest = hashlib.sha256()
+    for path in files:
+        data = _read(path)
+        digest.update(json.dumps(data, sort_keys=True).encode())
+        versions.append(str(data.get("version", "0")))
+        for name, spec in data.get("systems", {}).items():
+            if not _in_region(spec, region):
+                continue
+            if name in systems:
+                errors.append(f"{name}: defined in more than one catalog file")
+                continue
+            spec = dict(spec,
+                        inverters=[i for i in spec.get("inverters", []) if _in_region(i, region)],
+                        batteries=[b for b in spec.get("batteries", []) if _in_region(b, region)])
+            problems = _validate(name, spec)
+            errors += problems
+            if not problems:
+                systems[name] = SystemIndex(name, spec)
+    if errors:
+        raise ValueError("Invalid product catalog:\n" + "\n".join(f" - {e}" for e in errors))
+    version = "+".join(versions) + f"+{digest.hexdigest()[:8]}" + (f"@{region}" if region else "")
+    return Catalog(systems, version)
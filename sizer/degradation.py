@@ -0,0 +1,61 @@
+# degradation.py
+import numpy as np
+
+# Lifetime capacity of every battery option at every site. Usable capacity
+# falls linearly with calendar time and with equivalent full cycles; the
+# cycles of a year follow from the daily shiftable energy that the already
+# faded battery can still take, so each year starts from the previous one.
+# The year loop is the only Python loop: every step works on a
+# (sites × options) array, and trajectories are (sites × options × years).
+CALENDAR_FADE = 0.01           # share of capacity lost per year regardless of use
+CYCLE_FADE = 0.2 / 6000        # per equivalent full cycle (LFP: 80 % left after 6000 cycles)
+WARRANTY_YEARS = 10
+
+def _fade(options_kwh, shiftable_kwh_day, years: int, calendar_fade: float, cycle_fade: float, record: bool):
+    cap = np.asarray(options_kwh, dtype=float).reshape(1, -1)
+    shift = np.asarray(shiftable_kwh_day, dtype=float).reshape(-1, 1)
+    current = np.ones((shift.shape[0], cap.shape[1]))
+    retention = np.empty(current.shape + (years,)) if record else None
+    cycles = np.empty(current.shape + (years,)) if record else None
+    safe_cap = np.where(cap > 0, cap, 1.0)
+    for y in range(years):
+        year_cycles = np.where(cap > 0, 365.0 * np.minimum(shift, cap * current) / safe_cap, 0.0)
+        current = np.maximum(current - calendar_fade - cycle_fade * year_cycles, 0.0)
+        if record:
+            retention[:, :, y], cycles[:, :, y] = current, year_cycles
+    return current, retention, cycles
+
+def capacity_trajectory(options_kwh, shiftable_kwh_day, years: int = WARRANTY_YEARS,
+                        calendar_fade: float = CALENDAR_FADE, cycle_fade: float = CYCLE_FADE) -> dict:
+    # End-of-year retention, cycles and usable kWh, each (sites × options × years)
+    _, retention, cycles = _fade(options_kwh, shiftable_kwh_day, years, calendar_fade, cycle_fade, True)
+    cap = np.asarray(options_kwh, dtype=float).reshape(1, -1, 1)
+    return {"retention": retention, "cycles": cycles, "usable_kwh": cap * retention}
+
+def pick_lifetime_batteries(shiftable_kwh_day, backup_energy_kwh, options: list, labels: list,
+                            years: int = WARRANTY_YEARS, calendar_fade: float = CALENDAR_FADE,
+                            cycle_fade: float = CYCLE_FADE) -> dict:
+    # Smallest option whose usable capacity after `years` still covers
+    # shiftable + backup energy; the largest option when none does.
+    shift = np.asarray(shiftable_kwh_day, dtype=float).reshape(-1)
+    need = shift + np.broadcast_to(np.asarray(backup_energy_kwh, dtype=float), shift.shape)
+    if not options:
+        zeros = np.zeros(need.shape)
+        return {"battery_kwh": zeros, "battery_label": np.full(need.shape, "", dtype=object),
+                "eol_usable_kwh": zeros, "reserve_kwh": zeros, "covers_need": need <= 0}
+    cap = np.asarray(options, dtype=float)
+    end, _, _ = _fade(cap, shift, years, calendar_fade, cycle_fade, False)
+    eol = cap[None, :] * end
+    covers = eol >= need[:, None]
+    idx = np.where(covers.any(axis=1), np.argmin(np.where(covers, cap[None, :], np.inf), axis=1), np.argmax(cap))
+    rows = np.arange(len(need))
+    names = np.array([labels[i] if i < len(labels) else f"{options[i]:.1f} kWh" for i in range(len(options))] + [""],
+                     dtype=object)
+    none = need <= 0
+    battery_kwh = np.where(none, 0.0, cap[idx])
+    return {
+        "battery_kwh": battery_kwh, "battery_label": names[np.where(none, len(options), idx)],
+        "eol_usable_kwh": np.where(none, 0.0, eol[rows, idx]),
+        "reserve_kwh": np.where(none, 0.0, battery_kwh - need),
+        "covers_need": none | covers[rows, idx],
+    }
@@ -0,0 +1,48 @@
+# economics.py
+import numpy as np
+from .sizing import DEFAULT_RTE
+
+# Multi-year cash flows for every battery option of a system at once: arrays
+# are (options × years). Each kWh delivered by the battery avoids one kWh of
+# grid import at the (escalating) tariff and costs 1/RTE kWh of feed-in.
+# Capacity fades geometrically per year.
+
+def evaluate_options(SYS: dict, shiftable_kwh_day: float, tariff: float, feed_in: float,
+                     price_per_kwh: float, fixed_cost: float = 0.0, years: int = 15,
+                     discount_rate: float = 0.03, tariff_escalation: float = 0.02,
+                     capacity_fade: float = 0.02, rte: float = DEFAULT_RTE,
+                     annual_discharge_kwh=None) -> dict:
+    options = np.asarray(SYS["battery_options_kwh"], dtype=float)
+    y = np.arange(1, years + 1, dtype=float)
+    fade = (1.0 - capacity_fade) ** (y - 1)
+    if annual_discharge_kwh is None:
+        # Daily model: the battery delivers the shiftable energy up to its faded capacity
+        delivered = 365.0 * np.minimum(shiftable_kwh_day, options[:, None] * fade[None, :])
+    else:
+        # Hourly simulation result for year one, scaled by the capacity fade
+        delivered = np.asarray(annual_discharge_kwh, dtype=float)[:, None] * fade[None, :]
+    tariff_y = tariff * (1.0 + tariff_escalation) ** (y - 1)
+    charge_cost = delivered / rte * feed_in
+    cash = delivered * tariff_y[None, :] - charge_cost
+    discount = (1.0 + discount_rate) ** -y
+
+    capex = fixed_cost + price_per_kwh * options
+    npv = (cash * discount).sum(axis=1) - capex
+    cumulative = np.cumsum(cash, axis=1)
+    paid = cumulative >= capex[:, None]
+    first = np.argmax(paid, axis=1)
+    prev = np.where(first > 0, cumulative[np.arange(len(options)), first - 1], 0.0)
+    step = cash[np.arange(len(options)), first]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback = np.where(paid.any(axis=1), first + (capex - prev) / step, np.inf)
+        lcos = (capex + (charge_cost * discount).sum(axis=1)) / (delivered * discount).sum(axis=1)
+
+    best = int(np.argmax(npv))
+    labels = SYS["battery_labels"]
+    return {
+        "capacity_kwh": options, "label": [labels[i] if i < len(labels) else f"{o:.1f} kWh"
+                                           for i, o in enumerate(SYS["battery_options_kwh"])],
+        "capex": capex, "npv": npv, "payback_years": payback, "lcos": lcos,
+        "annual_delivered_kwh": delivered[:, 0],
+        "best_index": best, "best_profitable": bool(npv[best] > 0),
+    }
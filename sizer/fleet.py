@@ -0,0 +1,189 @@
+# fleet.py
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from .batch import size_batch, orientation_azimuths
+from .systems import CATALOG, SYSTEMS
+
+# Portfolio aggregates over existing sites. Sites are held column by column in
+# compact NumPy arrays (27 bytes per site in total) and saved as a directory of
+# .npy files plus meta.json, so pool workers memory-map their shard instead of
+# receiving pickled rows. Each worker sizes its shard with size_batch and
+# returns only partial aggregates (counts, sums, histograms) that the driver
+# merges; per-site results never leave the worker.
+SITE_DTYPES = {
+    "total_modules": np.uint16, "module_wp": np.uint16, "annual_kwh": np.float32, "tilt": np.float32,
+    "azimuth": np.int16, "day_fraction": np.float32, "backup_kw": np.float32, "backup_hours": np.float32,
+    "system": np.uint8,
+}
+BATTERY_HIST_EDGES = tuple(np.arange(0.0, 42.5, 2.5))   # kWh; the last bin also takes everything above
+
+# ---- Site table ----
+class SiteTable:
+    def __init__(self, columns: dict, systems: list):
+        self.columns = columns
+        self.systems = list(systems)
+
+    def __len__(self) -> int:
+        return len(self.columns["system"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.columns.values())
+
+    def slice(self, start: int, stop: int) -> "SiteTable":
+        return SiteTable({k: c[start:stop] for k, c in self.columns.items()}, self.systems)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name, col in self.columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), col)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"rows": len(self), "systems": self.systems}, f)
+
+def open_table(path: str) -> SiteTable:
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in SITE_DTYPES}
+    return SiteTable(columns, meta["systems"])
+
+def site_table(total_modules, annual_kwh, module_wp=430, tilt=30, orientation="south", day_fraction=0.4,
+               backup_kw=0.0, backup_hours=0.0, system_key=None) -> SiteTable:
+    keys = np.asarray(next(iter(SYSTEMS)) if system_key is None else system_key, dtype=str)
+    systems, codes = np.unique(keys, return_inverse=True)
+    unknown = [s for s in systems if s not in SYSTEMS]
+    if unknown:
+        raise ValueError(f"Unknown systems: {unknown}")
+    cols = np.broadcast_arrays(np.asarray(total_modules), np.asarray(module_wp), np.asarray(annual_kwh),
+                               np.asarray(tilt), orientation_azimuths(orientation), np.asarray(day_fraction),
+                               np.asarray(backup_kw), np.asarray(backup_hours), codes.reshape(keys.shape))
+    columns = {name: np.round(np.ravel(c)).astype(dtype) if np.dtype(dtype).kind in "iu" else
+               np.ravel(c).astype(dtype) for (name, dtype), c in zip(SITE_DTYPES.items(), cols)}
+    return SiteTable(columns, systems.tolist())
+
+def read_sites(path: str, chunk_rows: int = 200_000, system_key: str = None) -> SiteTable:
+    # Sites from a CSV/Parquet file with the pipeline's input columns
+    from .pipeline import _chunks, row_errors, table_inputs
+    parts, row = [], 0
+    for table in _chunks(path, chunk_rows):
+        inputs = table_inputs(table, system_key)
+        errors = row_errors(inputs, table)
+        bad = np.flatnonzero(errors != "")
+        if len(bad):
+            raise ValueError(f"Row {row + bad[0] + 1}: {errors[bad[0]]}")
+        row += table.num_rows
+        parts.append(site_table(inputs["total_modules"], inputs["annual_kwh"], inputs["module_wp"], inputs["tilt"],
+                                inputs["orientation"], inputs["day_fraction"], inputs["backup_kw"],
+                                inputs["backup_hours"], inputs["system_key"]))
+    systems = sorted({s for p in parts for s in p.systems})
+    columns = {}
+    for name in SITE_DTYPES:
+        if name == "system":
+            col = [np.asarray([systems.index(s) for s in p.systems], dtype=np.uint8)[p.columns[name]] for p in parts]
+        else:
+            col = [p.columns[name] for p in parts]
+        columns[name] = np.concatenate(col) if col else np.empty(0, SITE_DTYPES[name])
+    return SiteTable(columns, systems)
+
+# ---- Aggregates ----
+def _counts(values) -> dict:
+    uniq, n = np.unique(values, return_counts=True)
+    return {str(u): int(c) for u, c in zip(uniq, n)}
+
+def aggregate(table: SiteTable) -> dict:
+    out = {"sites": len(table), "systems": {}}
+    c = table.columns
+    edges = np.asarray(BATTERY_HIST_EDGES)
+    for code, key in enumerate(table.systems):
+        rows = np.flatnonzero(np.asarray(c["system"]) == code)
+        if not len(rows):
+            continue
+        res = size_batch(c["total_modules"][rows], c["module_wp"][rows], c["annual_kwh"][rows], c["tilt"][rows],
+                         c["azimuth"][rows], c["day_fraction"][rows], c["backup_kw"][rows], c["backup_hours"][rows],
+                         key)
+        hist = np.bincount(np.minimum(np.searchsorted(edges, res["battery_kwh"], side="right") - 1, len(edges) - 1),
+                           minlength=len(edges))
+        out["systems"][key] = {
+            "sites": int(len(rows)),
+            "dc_kw": float(res["dc_kw"].sum()),
+            "battery_kwh": float(res["battery_kwh"].sum()),
+            "usable_needed_kwh": float(res["usable_needed"].sum()),
+            "within_cap": int(res["within_cap"].sum()),
+            "layout_ok": int(res["layout_ok"].sum()),
+            "inverters": _counts(res["inverter_model"].astype(str)),
+            "batteries": _counts(np.where(res["battery_label"] == "", "none", res["battery_label"]).astype(str)),
+            "battery_hist": hist.tolist(),
+        }
+    return out
+
+def merge_aggregates(a: dict, b: dict) -> dict:
+    # Counts and sums add up; dicts merge key by key; histograms add bin by bin
+    out = dict(a)
+    for key, value in b.items():
+        if key not in out:
+            out[key] = value
+        elif isinstance(value, dict):
+            out[key] = merge_aggregates(out[key], value)
+        elif isinstance(value, list):
+            out[key] = [x + y for x, y in zip(out[key], value)]
+        else:
+            out[key] = out[key] + value
+    return out
+
+# ---- Worker side ----
+_TABLE = None
+
+def _init_worker(path: str):
+    global _TABLE
+    _TABLE = open_table(path)
+
+def _run_shard(start: int, stop: int) -> dict:
+    return aggregate(_TABLE.slice(start, stop))
+
+# ---- Driver ----
+def run_portfolio(path: str, workers: int = None, shard_rows: int = 250_000, progress=None) -> dict:
+    table = open_table(path)
+    total = len(table)
+    workers = workers or os.cpu_count() or 1
+    shards = [(s, min(s + shard_rows, total)) for s in range(0, total, shard_rows)]
+    result, done = {"sites": 0, "systems": {}}, 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+        futures = [(stop - start, pool.submit(_run_shard, start, stop)) for start, stop in shards]
+        for n, fut in futures:
+            result = merge_aggregates(result, fut.result())
+            done += n
+            if progress: progress(done, total)
+    result["battery_hist_edges_kwh"] = list(BATTERY_HIST_EDGES)
+    result["catalog_version"] = CATALOG.version
+    return result
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Aggregate battery/inverter sizing across a fleet of sites")
+    sub = ap.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="convert a CSV/Parquet site list into a columnar table directory")
+    build.add_argument("input")
+    build.add_argument("table")
+    build.add_argument("--system", choices=list(SYSTEMS.keys()), default=None,
+                       help="system for rows without a 'system' column")
+    run = sub.add_parser("run", help="size every site and print merged aggregates as JSON")
+    run.add_argument("table")
+    run.add_argument("--workers", type=int, default=None)
+    run.add_argument("--shard-rows", type=int, default=250_000)
+    args = ap.parse_args(argv)
+    if args.command == "build":
+        table = read_sites(args.input, system_key=args.system)
+        table.save(args.table)
+        print(f"{len(table):,} sites, {table.nbytes / max(len(table), 1):.0f} bytes/site", file=sys.stderr)
+        return
+    started = time.perf_counter()
+    result = run_portfolio(args.table, args.workers, args.shard_rows)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"{result['sites']:,} sites in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# i18n.py
+import argparse
+import os
+import re
+import string
+import sys
+
+from .translations import DEFAULT_LANG, LANG_CHOICES, TRANSLATIONS
+
+# Build-time check of the translation catalogs, so lookups never have to:
+# fields a translation uses that the default language's template does not get
+# (a KeyError at runtime) and T("key") calls in the sources whose key does not
+# exist are errors; untranslated keys, which fall back, are warnings.
+#   python -m sizer.i18n check [app.py ...] [--strict]
+_USES = re.compile(r"""\bT\(\s*["'](\w+)["']\s*\)|get_text\([^,()]+,\s*["'](\w+)["']\s*\)""")
+
+def _fields(text: str) -> set:
+    try:
+        return {name for _, name, _, _ in string.Formatter().parse(text) if name}
+    except ValueError:
+        return {"<invalid template>"}
+
+def check(sources: list = None) -> tuple:
+    # (errors, warnings): errors break a page at runtime, warnings fall back to DEFAULT_LANG
+    errors, warnings = [], []
+    base = TRANSLATIONS[DEFAULT_LANG]
+    errors += [f"{code}: offered in LANG_CHOICES but has no catalog" for code, _ in LANG_CHOICES
+               if code not in TRANSLATIONS]
+    for lang in TRANSLATIONS:
+        own = TRANSLATIONS[lang]
+        for key, text in own.items():
+            if key not in base:
+                warnings.append(f"{lang}: '{key}' is not in {DEFAULT_LANG}")
+            elif _fields(text) - _fields(base[key]):
+                errors.append(f"{lang}: '{key}' uses fields {sorted(_fields(text) - _fields(base[key]))} "
+                              f"that {DEFAULT_LANG} does not pass")
+        missing = [k for k in base if k not in own and lang != DEFAULT_LANG]
+        if missing:
+            warnings.append(f"{lang}: {len(missing)} keys fall back to {DEFAULT_LANG}: {', '.join(missing)}")
+    for path in sources or []:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        for m in _USES.finditer(text):
+            key = m.group(1) or m.group(2)
+            if key not in base:
+                line = text.count("\n", 0, m.start()) + 1
+                errors.append(f"{os.path.relpath(path)}:{line}: key '{key}' is not in {DEFAULT_LANG}")
+    return errors, warnings
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check the translation catalogs")
+    ap.add_argument("command", choices=["check"])
+    ap.add_argument("sources", nargs="*", help="files whose T(\"key\") calls must resolve (default: app.py)")
+    ap.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = ap.parse_args(argv)
+    sources = args.sources or [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")]
+    errors, warnings = check([p for p in sources if os.path.exists(p)])
+    for line in warnings:
+        print(f"warning: {line}", file=sys.stderr)
+    for line in errors:
+        print(f"error: {line}", file=sys.stderr)
+    print(f"{len(errors)} errors, {len(warnings)} warnings", file=sys.stderr)
+    return 1 if errors or (args.strict and warnings) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# layout.py
+import math
+from functools import lru_cache
+from itertools import permutations
+
+# String/MPPT layout. A module spec is a dict of STC values plus temperature
+# coefficients; inverter limits come from the catalog. Every MPPT carries
+# zero or more parallel strings of equal length, strings never exceed the
+# voltage window at design temperatures, and every module is wired. Module
+# groups (roof planes) each get their own MPPTs. Among valid layouts the
+# solver prefers the fewest strings, then the most even string lengths.
+DESIGN_MIN_TEMP_C = -10.0      # coldest ambient: highest open-circuit voltage
+DESIGN_MAX_CELL_TEMP_C = 70.0  # hottest cell: lowest MPP voltage
+DEFAULT_MODULE = {"voc_v": 38.5, "vmp_v": 32.2, "imp_a": 13.4,
+                  "temp_coeff_voc": -0.0027, "temp_coeff_vmp": -0.0035}
+LIMIT_FIELDS = ("max_dc_voltage_v", "mppt_min_v", "mppt_max_v", "strings_per_mppt")
+
+def string_limits(spec: dict, inverter: dict):
+    # Electrical limits of one inverter (inverter fields override the system's),
+    # as a hashable tuple; None when the catalog has no string data for it.
+    merged = {f: inverter.get(f, spec.get(f)) for f in LIMIT_FIELDS}
+    if any(v is None for v in merged.values()):
+        return None
+    return (float(merged["max_dc_voltage_v"]), float(merged["mppt_min_v"]), float(merged["mppt_max_v"]),
+            tuple(int(n) for n in merged["strings_per_mppt"]), int(spec["max_strings_total"]),
+            float(inverter.get("max_string_current_a", spec["max_string_current_a"])))
+
+def series_range(module: tuple, limits: tuple) -> tuple:
+    # Shortest and longest valid string; (1, 0) when no length fits
+    voc, vmp, imp, tc_voc, tc_vmp = module
+    max_v, mppt_min, mppt_max, _, _, max_current = limits
+    if imp > max_current:
+        return 1, 0
+    voc_cold = voc * (1 + tc_voc * (DESIGN_MIN_TEMP_C - 25.0))
+    vmp_cold = vmp * (1 + tc_vmp * (DESIGN_MIN_TEMP_C - 25.0))
+    vmp_hot = vmp * (1 + tc_vmp * (DESIGN_MAX_CELL_TEMP_C - 25.0))
+    return max(1, math.ceil(mppt_min / vmp_hot)), min(math.floor(max_v / voc_cold), math.floor(mppt_max / vmp_cold))
+
+def _module_key(module: dict) -> tuple:
+    m = {**DEFAULT_MODULE, **(module or {})}
+    return (float(m["voc_v"]), float(m["vmp_v"]), float(m["imp_a"]),
+            float(m["temp_coeff_voc"]), float(m["temp_coeff_vmp"]))
+
+@lru_cache(maxsize=4096)
+def _solve(groups: tuple, module: tuple, limits: tuple):
+    s_min, s_max = series_range(module, limits)
+    per_mppt, max_total = limits[3], limits[4]
+    n = len(per_mppt)
+    if s_min > s_max or sum(groups) > min(sum(per_mppt), max_total) * s_max:
+        return None
+    # Strings the MPPTs from i onwards can still take, for the capacity bound
+    tail = [sum(per_mppt[i:]) for i in range(n + 1)]
+
+    @lru_cache(maxsize=None)
+    def best(i: int, g: int, rem: int, strings_left: int):
+        # Cheapest wiring of `rem` modules of group g and all later groups onto MPPTs i..n-1
+        if rem == 0:
+            g += 1
+            if g == len(groups):
+                return (0, 0), ()
+            rem = groups[g]
+            if rem == 0:
+                return best(i, g, 0, strings_left)
+        left = rem + sum(groups[g + 1:])
+        if i == n or left > min(tail[i], strings_left) * s_max:
+            return None
+        found = None
+        for p in range(1, min(per_mppt[i], strings_left) + 1):
+            for s in range(min(s_max, rem // p), s_min - 1, -1):
+                if p * s != rem and rem - p * s < s_min:
+                    continue
+                nxt = best(i + 1, g, rem - p * s, strings_left - p)
+                if nxt is None:
+                    continue
+                # (strings, sum of squared lengths): for a fixed module count the square sum is lowest when even
+                cost = (nxt[0][0] + p, nxt[0][1] + p * s * s)
+                if found is None or cost < found[0]:
+                    found = (cost, ((i, p, s),) + nxt[1])
+        skip = best(i + 1, g, rem, strings_left)   # leave MPPT i unused
+        if skip is not None and (found is None or skip[0] < found[0]):
+            found = skip
+        return found
+
+    return best(0, 0, groups[0], max_total)
+
+def solve_layout(module_groups, module: dict = None, limits: tuple = None):
+    # Layout as a list of (mppt_index, parallel_strings, modules_per_string), or
+    # None when the modules cannot be wired to this inverter. Groups are tried
+    # in every order, since MPPTs may differ in how many strings they accept.
+    if limits is None:
+        return None
+    groups = tuple(int(g) for g in module_groups) if isinstance(module_groups, (list, tuple)) else (int(module_groups),)
+    key = _module_key(module)
+    results = [_solve(order, key, limits) for order in set(permutations(groups))]
+    results = [r for r in results if r is not None]
+    if not results:
+        return None
+    return [list(step) for step in min(results)[1]]
@@ -0,0 +1,234 @@
+# meter.py
+import argparse
+import json
+import re
+
+import numpy as np
+from .simulation import DAY_HOURS, HOURS_PER_YEAR
+
+# Smart-meter exports (one interval reading per line) to a typical-year hourly
+# load series. Handles ';' ',' '\t' '|' delimiters, decimal commas, preamble
+# lines, ISO or dd.mm.yyyy timestamps (optionally with a separate time column
+# or a UTC offset), interval-start or interval-end labels, and kWh or kW
+# readings. Timestamps are decoded column-wise from fixed character positions,
+# so a year of 15-minute data parses without a per-row Python loop (unpadded
+# "1.2.2023 9:15" is zero-padded first); only stray rows go one by one. Rows
+# whose timestamp does not parse (footers such as "Summe;1234,5") are dropped;
+# when more than MAX_UNPARSED of them do not, the file is rejected.
+#
+# Hours are binned by (month, day, hour) of a non-leap year: repeated hours
+# (DST end, several years) are averaged, partly covered hours are scaled up
+# from the intervals present, and hours without data (DST start, gaps) are
+# interpolated from their neighbours. With a UTC offset in the timestamps all
+# readings are shifted to standard time first, so DST leaves no gaps.
+DELIMITERS = (";", "\t", "|", ",")
+MAX_UNPARSED = 0.05
+DAYS_BEFORE_MONTH = np.array([0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365])
+_TS = [
+    # (regex, field names in order of the groups)
+    (re.compile(r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::\d{2}(?:\.\d+)?)?\s*(Z|[+-]\d{2}:?\d{2})?"),
+     ("year", "month", "day", "hour", "minute", "offset")),
+    (re.compile(r"(\d{1,2})[./](\d{1,2})[./](\d{4})[ T,;\t|]+(\d{1,2}):(\d{2})(?::\d{2})?"),
+     ("day", "month", "year", "hour", "minute")),
+]
+_UNPADDED = re.compile(r"(?<!\d)(\d)(?=[./:])")
+_VALUE_NAMES = ("kwh", "wert", "value", "verbrauch", "energy", "consumption", "bezug", "kw")
+
+# ---- Parsing ----
+def _decode(data) -> str:
+    if isinstance(data, str):
+        return data
+    for encoding in ("utf-8-sig", "cp1252"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1")
+
+def _match_timestamp(line: str):
+    for regex, fields in _TS:
+        m = regex.match(line)
+        if m:
+            return regex, fields, m
+    return None, None, None
+
+def _fields(ts: np.ndarray, m, fields: tuple):
+    # Digit fields at the character positions of the first match, for every row at
+    # once, and a mask of the rows laid out like the first (digits where it has
+    # digits, the same separators elsewhere); other rows get the first row's fields
+    n, width = len(ts), max(m.end(), 1)
+    codes = np.char.ljust(ts, width).astype(f"U{width}").view(np.uint32).reshape(n, width).astype(np.int64) - 48
+    fixed = max(m.end(g) for g, name in enumerate(fields, start=1) if name != "offset")
+    digit, ref = (codes[:, :fixed] >= 0) & (codes[:, :fixed] <= 9), codes[0, :fixed]
+    valid = np.where(digit[0], digit, codes[:, :fixed] == ref).all(axis=1)
+    out = {}
+    for g, name in enumerate(fields, start=1):
+        start, end = m.span(g)
+        if start < 0:
+            continue
+        if name == "offset":   # "Z", "+01:00" or "+0100"
+            sign = np.where(codes[:, start] == ord("-") - 48, -1, 1)
+            zulu = codes[:, start] == ord("Z") - 48
+            hh = codes[:, start + 1] * 10 + codes[:, start + 2] if end - start > 1 else 0
+            mm = codes[:, end - 2] * 10 + codes[:, end - 1] if end - start > 1 else 0
+            out[name] = np.where(zulu | ~valid, 0, sign * (hh * 60 + mm))
+            continue
+        value = np.zeros(n, dtype=np.int64)
+        for j in range(start, end):
+            value = value * 10 + codes[:, j]
+        out[name] = np.where(valid, value, value[0])
+    return out, valid
+
+def parse_meter(data, unit: str = "auto", label: str = "auto") -> dict:
+    # data: bytes or str of the whole file. unit: "kWh", "kW" or "auto" (from the
+    # header). label: "start", "end" or "auto" (end when the first reading is at :15).
+    lines = _decode(data).splitlines()
+    first = next((i for i, line in enumerate(lines) if _match_timestamp(line.strip().strip('"'))[0]), None)
+    if first is None:
+        raise ValueError("No timestamped readings found")
+    header = lines[first - 1].lower() if first > 0 else ""
+    sample = lines[first]
+    delim = next((d for d in DELIMITERS if d in sample), ",")   # ';' first: it is the one used with decimal commas
+    body = list(filter(None, lines[first:]))
+    width = sample.count(delim) + 1
+    block = delim.join(body)
+    if block.count(delim) != len(body) * width - 1:
+        # Lines with fewer columns (footers, trailing fields left out) are padded with
+        # empty fields, so the file still splits in one go
+        counts = [line.count(delim) for line in body]
+        width = max(counts) + 1
+        body = [line + delim * (width - 1 - c) if c < width - 1 else line for line, c in zip(body, counts)]
+        block = delim.join(body)
+    # One split for the whole file, columns by slicing
+    flat = block.split(delim)
+    columns = [flat[j::width] for j in range(width)]
+    padded = '"' in block or f"{delim} " in sample or f" {delim}" in sample or sample != sample.strip()
+
+    def column(j: int) -> np.ndarray:
+        values = np.array(columns[j], dtype=str)
+        return np.char.strip(np.char.strip(values), '"') if padded else values
+
+    # Timestamp: first column, plus the second when it only holds the time of day
+    ts = column(0)
+    value_from = 1
+    if width > 2 and re.fullmatch(r"\d{1,2}:\d{2}(:\d{2})?", columns[1][0].strip().strip('"')):
+        ts = np.char.add(np.char.add(ts, " "), column(1))
+        value_from = 2
+    example = ts[0]
+    regex, fields, m = _match_timestamp(example)
+    f, valid = _fields(ts, m, fields)
+    if (~valid).sum() > MAX_UNPARSED * len(valid):
+        # Mostly unpadded ("1.2.2023 9:15"): zero-pad single digits in one pass over the column
+        ts = np.array(_UNPADDED.sub(r"0\1", "\n".join(ts.tolist())).split("\n"))
+        regex, fields, m = _match_timestamp(ts[0])
+        f, valid = _fields(ts, m, fields)
+    for i in np.flatnonzero(~valid).tolist():
+        # The few rows still laid out unlike the first are parsed one by one;
+        # footers and junk stay invalid
+        row = _parse_row(regex, fields, ts[i])
+        if row is not None:
+            for name, value in row.items():
+                if name in f:
+                    f[name][i] = value
+            valid[i] = True
+    unparsed = int(len(valid) - valid.sum())
+    if unparsed > MAX_UNPARSED * len(valid):
+        raise ValueError(f"{unparsed} of {len(valid)} rows have no timestamp readable like '{example}'")
+
+    # Value: a column named like a reading, else the last column
+    names = [c.strip().strip('"').lower() for c in header.split(delim)] if header else []
+    candidates = [j for j in range(value_from, width) if j < len(names) and any(v in names[j] for v in _VALUE_NAMES)]
+    text = "\n".join(columns[candidates[0] if candidates else width - 1])
+    if delim != "," and "," in text:
+        text = text.replace(".", "").replace(",", ".")   # 1.234,5 -> 1234.5
+    raw = text.split("\n")
+    for i in np.flatnonzero(~valid).tolist():
+        raw[i] = "nan"   # footers and stray rows, dropped below
+    try:
+        values = np.array(list(map(float, raw)))   # float() is the fastest parser for clean columns
+    except ValueError:
+        raw = np.char.strip(np.char.strip(np.array(raw, dtype=str)), '"')
+        values = np.where(raw == "", "nan", raw).astype(float)
+    ok = np.isfinite(values) & valid
+
+    minutes = _minutes(f)
+    if "offset" in f:
+        minutes = minutes - f["offset"] + 60   # to UTC+1 standard time: no DST gaps or repeats
+    step = int(np.median(np.diff(np.sort(minutes[ok])))) if ok.sum() > 1 else 15
+    step = step if step > 0 else 15
+    if label == "end" or (label == "auto" and f["minute"][0] % 60 == step % 60 and step < 60):
+        minutes = minutes - step
+    if unit == "kW" or (unit == "auto" and re.search(r"(?<![a-z])kw(?!h)", header) and "kwh" not in header):
+        values = values * step / 60.0
+    return {"minutes": minutes[ok], "kwh": values[ok], "step_minutes": step}
+
+def _parse_row(regex, fields: tuple, text: str) -> dict:
+    # The fields of one timestamp as ints (offset in minutes), None if it does not match
+    m = regex.match(text)
+    if not m:
+        return None
+    out = {}
+    for g, name in enumerate(fields, start=1):
+        value = m.group(g)
+        if name != "offset":
+            out[name] = int(value)
+        elif value and value != "Z":
+            digits = value[1:].replace(":", "")
+            out[name] = (-1 if value[0] == "-" else 1) * (int(digits[:2]) * 60 + int(digits[2:]))
+        else:
+            out[name] = 0
+    return out
+
+def _minutes(f: dict) -> np.ndarray:
+    # Minutes since 1970-01-01 00:00 of the wall-clock timestamps
+    months = (f["year"] - 1970) * 12 + f["month"] - 1
+    days = np.asarray(months, dtype="datetime64[M]").astype("datetime64[D]").astype(np.int64) + f["day"] - 1
+    return days * 1440 + f["hour"] * 60 + f["minute"]
+
+# ---- Typical-year series ----
+def hourly_series(minutes, kwh, step_minutes: int = 15) -> dict:
+    minutes = np.asarray(minutes, dtype=np.int64)
+    dt = minutes.astype("datetime64[m]")
+    month = dt.astype("datetime64[M]").astype(np.int64) % 12
+    day = (dt.astype("datetime64[D]") - dt.astype("datetime64[M]")).astype(np.int64)
+    day = np.minimum(day, DAYS_BEFORE_MONTH[month + 1] - DAYS_BEFORE_MONTH[month] - 1)   # Feb 29 -> Feb 28
+    hour = (minutes // 60) % 24
+    index = (DAYS_BEFORE_MONTH[month] + day) * 24 + hour
+    total = np.bincount(index, weights=kwh, minlength=HOURS_PER_YEAR)
+    count = np.bincount(index, minlength=HOURS_PER_YEAR)
+    per_hour = max(1, 60 // step_minutes)
+    covered = count > 0
+    hourly = np.zeros(HOURS_PER_YEAR)
+    hourly[covered] = total[covered] / count[covered] * per_hour
+    if covered.any() and not covered.all():
+        hours = np.arange(HOURS_PER_YEAR)
+        hourly[~covered] = np.interp(hours[~covered], hours[covered], hourly[covered], period=HOURS_PER_YEAR)
+    start, end = DAY_HOURS
+    daily = hourly.reshape(365, 24)
+    annual = float(hourly.sum())
+    return {
+        "hourly_kwh": hourly, "annual_kwh": annual,
+        "day_fraction": float(daily[:, start:end].sum() / annual) if annual > 0 else 0.0,
+        "coverage": float(covered.mean()), "readings": int(len(minutes)), "step_minutes": step_minutes,
+    }
+
+def import_meter(data, unit: str = "auto", label: str = "auto") -> dict:
+    parsed = parse_meter(data, unit, label)
+    return hourly_series(parsed["minutes"], parsed["kwh"], parsed["step_minutes"])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Import a smart-meter interval CSV as a typical-year hourly load")
+    ap.add_argument("input", help="meter export (CSV/TXT)")
+    ap.add_argument("--out", help="write the 8760 hourly kWh values to this CSV")
+    ap.add_argument("--unit", choices=["auto", "kWh", "kW"], default="auto")
+    ap.add_argument("--label", choices=["auto", "start", "end"], default="auto",
+                    help="whether timestamps mark the start or the end of each interval")
+    args = ap.parse_args(argv)
+    with open(args.input, "rb") as f:
+        res = import_meter(f.read(), args.unit, args.label)
+    if args.out:
+        np.savetxt(args.out, res["hourly_kwh"], fmt="%.4f", header="kwh", comments="")
+    print(json.dumps({k: v for k, v in res.items() if k != "hourly_kwh"}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# pipeline.py
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from .batch import size_batch
+from .sizing import LOAD_PROFILES, orientation_known
+from .sweep import RESULT_COLUMNS
+from .systems import SYSTEMS
+
+# Streams a CRM export (CSV or Parquet) through the batch sizing chain chunk
+# by chunk. Memory is bounded by the chunk size; after each chunk the output
+# is flushed and a checkpoint records how many input rows are committed, so
+# --resume continues from the last complete chunk after a crash.
+#
+# Input columns: total_modules, annual_kwh (required); module_wp, tilt,
+# orientation, backup_kw, backup_hours, system, and day_fraction or profile
+# (optional, defaults below). Blank optional cells take the default; rows with
+# a blank or invalid value (including an unknown system, profile or
+# orientation) get null results and an 'error' column naming the problem.
+# Other columns are passed through unchanged.
+INPUT_DEFAULTS = {"module_wp": 430.0, "tilt": 30.0, "orientation": "south",
+                  "backup_kw": 0.0, "backup_hours": 0.0, "profile": "p_balanced"}
+NUMERIC_COLUMNS = ("total_modules", "module_wp", "annual_kwh", "tilt", "day_fraction", "backup_kw", "backup_hours")
+TEXT_COLUMNS = ("system", "orientation", "profile")
+POSITIVE_COLUMNS = ("total_modules", "module_wp", "annual_kwh")
+# Stand-ins sized in place of invalid rows, whose results are then dropped
+PLACEHOLDERS = {"total_modules": 1.0, "module_wp": 430.0, "annual_kwh": 1.0, "tilt": 30.0,
+                "day_fraction": 0.4, "backup_kw": 0.0, "backup_hours": 0.0}
+
+# ---- Reading ----
+def _read_batches(path: str, chunk_rows: int):
+    import pyarrow as pa
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_rows)
+        return
+    import pyarrow.csv as pcsv
+    # Pin the types of known columns so type inference cannot change between blocks
+    types = {c: pa.float64() for c in NUMERIC_COLUMNS} | {c: pa.string() for c in TEXT_COLUMNS}
+    yield from pcsv.open_csv(path, convert_options=pcsv.ConvertOptions(column_types=types, strings_can_be_null=True))
+
+def _chunks(path: str, chunk_rows: int, skip_rows: int = 0):
+    # Re-slice reader batches into tables of exactly chunk_rows rows
+    import pyarrow as pa
+    pending, have = [], 0
+    for batch in _read_batches(path, chunk_rows):
+        if skip_rows:
+            drop = min(skip_rows, batch.num_rows)
+            batch, skip_rows = batch.slice(drop), skip_rows - drop
+        pending.append(batch)
+        have += batch.num_rows
+        while have >= chunk_rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunk_rows)
+            rest = table.slice(chunk_rows).to_batches()
+            pending, have = rest, have - chunk_rows
+    if have:
+        yield pa.Table.from_batches(pending)
+
+# ---- Sizing ----
+def _column(table, name: str):
+    if name in table.column_names:
+        col = table.column(name)
+        values = col.to_numpy(zero_copy_only=False)
+        if name in INPUT_DEFAULTS and (col.null_count or values.dtype.kind == "f"):
+            import pyarrow.compute as pc
+            blank = pc.is_null(col, nan_is_null=True).to_numpy(zero_copy_only=False)
+            if blank.any():
+                values = np.where(blank, INPUT_DEFAULTS[name], values)
+        return values
+    if name in INPUT_DEFAULTS:
+        return INPUT_DEFAULTS[name]
+    raise ValueError(f"Input is missing required column '{name}'")
+
+def table_inputs(table, system_key: str = None) -> dict:
+    # size_batch keyword arguments for an Arrow table of sites
+    if "day_fraction" in table.column_names:
+        day_fraction = _column(table, "day_fraction")
+    else:
+        # Profiles without a fixed day fraction give NaN, reported per row by row_errors
+        profiles = np.asarray(_column(table, "profile"), dtype=str)
+        uniq, inv = np.unique(profiles, return_inverse=True)
+        fractions = np.array([np.nan if LOAD_PROFILES.get(p) is None else LOAD_PROFILES[p] for p in uniq])
+        day_fraction = fractions[inv.reshape(profiles.shape)]
+    if "system" in table.column_names:
+        system = _column(table, "system")
+        system = np.where(np.equal(system, None), system_key or next(iter(SYSTEMS)), system)
+    else:
+        system = system_key or next(iter(SYSTEMS))
+    inputs = {name: _column(table, name) for name in ("total_modules", "module_wp", "annual_kwh", "tilt",
+                                                       "orientation", "backup_kw", "backup_hours")}
+    return {**inputs, "day_fraction": day_fraction, "system_key": system}
+
+def _check(errors: np.ndarray, values, known, message: str):
+    # Flags rows whose value fails known(value) with message.format(value), unless already flagged
+    values = np.broadcast_to(np.asarray(values).astype(str), errors.shape)
+    uniq, inv = np.unique(values, return_inverse=True)
+    bad = np.array([not known(u) for u in uniq.tolist()], dtype=bool)[inv.reshape(-1)]
+    rows = np.flatnonzero(bad & (errors == ""))
+    errors[rows] = [message.format(v) for v in values[rows].tolist()]
+
+def row_errors(inputs: dict, table=None) -> np.ndarray:
+    # Per row, why it cannot be sized ("" if it can). With the input table, rows
+    # whose profile has no fixed day fraction are named as such.
+    n = max(np.size(v) for v in inputs.values())
+    errors = np.full(n, "", dtype=object)
+    _check(errors, inputs["system_key"], lambda key: key in SYSTEMS, "unknown system '{}'")
+    if table is not None and "day_fraction" not in table.column_names and "profile" in table.column_names:
+        profiles = _column(table, "profile")
+        _check(errors, profiles, lambda p: p in LOAD_PROFILES, "unknown profile '{}'")
+        _check(errors, profiles, lambda p: LOAD_PROFILES.get(p, 0) is not None,
+               "profile '{}' has no fixed day fraction; provide a day_fraction column")
+    _check(errors, inputs["orientation"], orientation_known, "unknown orientation '{}'")
+    for name in PLACEHOLDERS:
+        values = np.broadcast_to(np.asarray(inputs[name], dtype=float), (n,))
+        if name in POSITIVE_COLUMNS:
+            bad, reason = ~(values > 0), f"{name} is blank or not positive"   # NaN compares False
+        elif name == "day_fraction":
+            bad, reason = ~((values >= 0) & (values <= 1)), "day_fraction is blank or outside 0..1"
+        elif name == "tilt":
+            bad, reason = ~((values >= 0) & (values <= 90)), "tilt is not a number or outside 0..90"
+        else:
+            bad, reason = ~np.isfinite(values), f"{name} is not a number"
+        errors[bad & (errors == "")] = reason
+    return errors
+
+def valid_inputs(inputs: dict, invalid: np.ndarray) -> dict:
+    # inputs with the invalid rows replaced by PLACEHOLDERS (and the default system
+    # and orientation), so they size without NaN warnings or unknown keys
+    out = dict(inputs)
+    for name, value in PLACEHOLDERS.items():
+        if np.ndim(out[name]):
+            out[name] = np.where(invalid, value, np.asarray(out[name], dtype=float))
+    for name, value in (("system_key", next(iter(SYSTEMS))), ("orientation", INPUT_DEFAULTS["orientation"])):
+        if np.ndim(out[name]):
+            values = np.asarray(out[name])
+            out[name] = np.where(invalid, value if values.dtype.kind not in "iuf" else 180.0, values)
+    return out
+
+def size_table(table, system_key: str = None) -> dict:
+    # size_batch results plus an 'error' column; results of rows with an error are meaningless
+    inputs = table_inputs(table, system_key)
+    errors = row_errors(inputs, table)
+    invalid = errors != ""
+    res = size_batch(**(valid_inputs(inputs, invalid) if invalid.any() else inputs))
+    return {**res, "error": errors}
+
+def _with_results(table, res: dict):
+    import pyarrow as pa
+    invalid = res["error"] != ""
+    mask = invalid if invalid.any() else None
+    for name in RESULT_COLUMNS:
+        values = res[name]
+        table = table.append_column(name, pa.array(values.tolist() if values.dtype == object else values, mask=mask))
+    return table.append_column("error", pa.array(res["error"].tolist(), pa.string(), mask=~invalid))
+
+# ---- Checkpointing ----
+def _checkpoint_path(out_path: str) -> str:
+    return out_path.rstrip("/" + os.sep) + ".checkpoint.json"
+
+def _load_checkpoint(out_path: str, in_path: str, chunk_rows: int) -> dict:
+    path = _checkpoint_path(out_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        ckpt = json.load(f)
+    if ckpt["input"] != os.path.abspath(in_path) or ckpt["input_size"] != os.path.getsize(in_path):
+        raise ValueError(f"Checkpoint {path} belongs to a different input file")
+    if ckpt["chunk_rows"] != chunk_rows:
+        raise ValueError(f"Checkpoint {path} was written with --chunk-rows {ckpt['chunk_rows']}")
+    return ckpt
+
+def _save_checkpoint(out_path: str, ckpt: dict):
+    path = _checkpoint_path(out_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ckpt, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+# ---- Driver ----
+def run_pipeline(in_path: str, out_path: str, chunk_rows: int = 200_000, system_key: str = None,
+                 resume: bool = False, progress=None) -> dict:
+    import pyarrow.csv as pcsv
+    import pyarrow.parquet as pq
+    parquet_out = out_path.endswith(".parquet") or out_path.endswith(os.sep)
+    ckpt = _load_checkpoint(out_path, in_path, chunk_rows) if resume else None
+    if ckpt is None:
+        ckpt = {"input": os.path.abspath(in_path), "input_size": os.path.getsize(in_path),
+                "chunk_rows": chunk_rows, "chunks": 0, "rows": 0, "offset": 0}
+    if parquet_out:
+        os.makedirs(out_path, exist_ok=True)
+        sink = None
+    else:
+        # CSV output is truncated back to the last committed byte offset
+        sink = open(out_path, "r+b" if ckpt["offset"] else "wb")
+        sink.truncate(ckpt["offset"])
+        sink.seek(ckpt["offset"])
+
+    started, done = time.perf_counter(), 0
+    try:
+        for table in _chunks(in_path, chunk_rows, ckpt["rows"]):
+            table = _with_results(table, size_table(table, system_key))
+            if parquet_out:
+                pq.write_table(table, os.path.join(out_path, f"part-{ckpt['chunks']:06d}.parquet"))
+            else:
+                pcsv.write_csv(table, sink, pcsv.WriteOptions(include_header=ckpt["offset"] == 0))
+                sink.flush()
+                os.fsync(sink.fileno())
+                ckpt["offset"] = sink.tell()
+            ckpt["chunks"] += 1
+            ckpt["rows"] += table.num_rows
+            _save_checkpoint(out_path, ckpt)
+            done += table.num_rows
+            if progress: progress(ckpt["rows"], done / max(time.perf_counter() - started, 1e-9))
+    finally:
+        if sink is not None:
+            sink.close()
+    elapsed = time.perf_counter() - started
+    return {"rows": ckpt["rows"], "chunks": ckpt["chunks"], "rows_this_run": done,
+            "seconds": elapsed, "rows_per_sec": done / elapsed if elapsed > 0 else 0.0}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Size a CSV/Parquet file of leads in bounded memory")
+    ap.add_argument("input", help="input .csv or .parquet")
+    ap.add_argument("output", help="output .csv file, or a .parquet directory of part files")
+    ap.add_argument("--chunk-rows", type=int, default=200_000)
+    ap.add_argument("--system", choices=list(SYSTEMS.keys()), default=None,
+                    help="system for rows without a 'system' column")
+    ap.add_argument("--resume", action="store_true", help="continue after the last committed chunk")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args(argv)
+
+    def report(rows: int, rate: float):
+        print(f"\r{rows:,} rows committed — {rate:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    stats = run_pipeline(args.input, args.output, args.chunk_rows, args.system, args.resume,
+                         None if args.quiet else report)
+    if not args.quiet:
+        print(f"\n{stats['rows']:,} rows in {stats['chunks']} chunks — {stats['rows_per_sec']:,.0f} rows/s",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
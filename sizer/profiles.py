@@ -0,0 +1,117 @@
+# profiles.py
+import json
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+# Standard load profiles at 15-minute resolution (35,040 values per year),
+# normalized to 1 kWh/year and stored as one float32 .npy matrix plus a JSON
+# index of names. The matrix is memory-mapped read-only, so every process-pool
+# worker and Streamlit session maps the same page-cache pages instead of
+# parsing its own copy. The built-in synthetic set ships in data/; regenerate
+# it with `python -m sizer.profiles`. SIZER_DATA_DIR overrides where the files
+# live; if they are missing there the set is generated on first use, or kept in
+# memory when that directory is not writable.
+STEPS_PER_YEAR = 35040
+STEPS_PER_HOUR = 4
+DATA_DIR = os.environ.get("SIZER_DATA_DIR") or os.path.join(os.path.dirname(__file__), "data")
+LIBRARY_FILE = "load_profiles.npy"
+INDEX_FILE = "load_profiles.json"
+
+# ---- Built-in synthetic set ----
+def _bdew_dynamization(day_of_year: np.ndarray) -> np.ndarray:
+    # Seasonal scaling polynomial used with the BDEW H0 profile
+    t = day_of_year.astype(float)
+    return -3.92e-10 * t**4 + 3.2e-7 * t**3 - 7.02e-5 * t**2 + 2.1e-3 * t + 1.24
+
+def _daily_shape(weekday: bool, kind: str) -> np.ndarray:
+    h = (np.arange(96) + 0.5) / 4.0
+    bump = lambda center, width, height: height * np.exp(-0.5 * ((h - center) / width) ** 2)
+    base = 0.35 + bump(7.0 if weekday else 9.0, 1.0, 0.6) + bump(12.5, 1.5, 0.45 if weekday else 0.7) \
+        + bump(19.0, 2.0, 1.0)
+    if kind == "workday" and weekday:
+        base = 0.35 + bump(6.5, 0.8, 0.7) + bump(19.5, 1.8, 1.3)
+    if kind == "ev":
+        base = base + bump(20.0, 1.5, 1.2)
+    return base
+
+def synthetic_profiles() -> dict:
+    days = np.arange(365)
+    weekday = (days % 7) < 5
+    season = np.repeat(_bdew_dynamization(days + 1), 96)
+    out = {}
+    for kind in ("h0", "workday", "ev", "heatpump"):
+        shape_kind = "h0" if kind == "heatpump" else kind
+        daily = np.where(weekday[:, None], _daily_shape(True, shape_kind), _daily_shape(False, shape_kind))
+        series = daily.ravel() * season
+        if kind == "heatpump":
+            # Heating demand follows outdoor temperature: large in winter, flat over the day
+            heating = np.repeat(np.maximum(0.0, np.cos(2 * np.pi * (days + 10) / 365.0) + 0.2), 96)
+            series = series + 2.0 * heating * series.mean()
+        out[kind] = series / series.sum()
+    return out
+
+# ---- Library file ----
+def build_library(profiles: dict = None, data_dir: str = DATA_DIR):
+    profiles = profiles or synthetic_profiles()
+    names = list(profiles)
+    matrix = np.empty((len(names), STEPS_PER_YEAR), dtype=np.float32)
+    for i, name in enumerate(names):
+        series = np.asarray(profiles[name], dtype=float)
+        if series.shape != (STEPS_PER_YEAR,):
+            raise ValueError(f"Profile '{name}' must have {STEPS_PER_YEAR} values, got {series.shape}")
+        matrix[i] = series / series.sum()
+    os.makedirs(data_dir, exist_ok=True)
+    # Write to temp names and rename so concurrent readers never map a partial file
+    tmp = os.path.join(data_dir, f".{os.getpid()}.tmp")
+    np.save(tmp + ".npy", matrix)
+    with open(tmp + ".json", "w", encoding="utf-8") as f:
+        json.dump({"names": names, "steps_per_hour": STEPS_PER_HOUR}, f)
+    os.replace(tmp + ".npy", os.path.join(data_dir, LIBRARY_FILE))
+    os.replace(tmp + ".json", os.path.join(data_dir, INDEX_FILE))
+
+@lru_cache(maxsize=1)
+def _library():
+    path = os.path.join(DATA_DIR, LIBRARY_FILE)
+    if not os.path.exists(path):
+        try:
+            build_library()
+        except OSError:   # read-only install: serve the built-in set from memory
+            built = synthetic_profiles()
+            return {name: i for i, name in enumerate(built)}, np.array(list(built.values()), dtype=np.float32)
+    with open(os.path.join(DATA_DIR, INDEX_FILE), encoding="utf-8") as f:
+        names = json.load(f)["names"]
+    matrix = np.load(path, mmap_mode="r")
+    return {name: i for i, name in enumerate(names)}, matrix
+
+def names() -> list:
+    return list(_library()[0])
+
+# ---- Access ----
+def profile(name: str, annual_kwh: float = None, out: np.ndarray = None) -> np.ndarray:
+    # Without annual_kwh this is a read-only view into the mapped file. With it,
+    # the scaled series is written into `out` when given, so callers that loop
+    # over many sites can reuse one buffer instead of allocating per site.
+    index, matrix = _library()
+    if name not in index:
+        raise KeyError(f"Unknown load profile '{name}'; available: {list(index)}")
+    view = matrix[index[name]]
+    if annual_kwh is None:
+        return view
+    return np.multiply(view, annual_kwh, out=out)
+
+def hourly(name: str, annual_kwh: float) -> np.ndarray:
+    return profile(name).reshape(-1, STEPS_PER_HOUR).sum(axis=1, dtype=float) * annual_kwh
+
+def day_fraction(name: str, day_hours: tuple = None) -> float:
+    from .simulation import DAY_HOURS
+    start, end = day_hours or DAY_HOURS
+    daily = profile(name).reshape(365, 24 * STEPS_PER_HOUR)
+    return float(daily[:, start * STEPS_PER_HOUR:end * STEPS_PER_HOUR].sum() / daily.sum(dtype=float))
+
+if __name__ == "__main__":
+    built = synthetic_profiles()
+    build_library(built, sys.argv[1] if len(sys.argv) > 1 else DATA_DIR)
+    print(f"{len(built)} profiles: {', '.join(built)}")
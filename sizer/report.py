@@ -0,0 +1,313 @@
+# report.py
+import argparse
+import html
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from .batch import size_batch
+from .sizing import ORIENT_ALIASES, ORIENT_AZIMUTH, orientation_azimuth
+from .systems import CATALOG, SYSTEMS
+from .translations import get_text
+
+# Per-lead HTML reports of the result sections the app renders (inverter
+# recommendation, battery inputs and recommendation, constraints), each in the
+# lead's language. A ReportTemplate is compiled once per language and worker:
+# the page skeleton gets its translated headings and notes baked in and
+# becomes one format template whose fields are the per-lead fragments. Leads are
+# sized shard by shard with size_batch in a process pool, and finished reports
+# are written to a directory or a .zip as the shards come back (a bounded
+# window in flight, as in sweep.py), so memory does not grow with the lead
+# count. PDF output is left to an HTML-to-PDF step downstream.
+#
+# Input: the pipeline's site columns (see pipeline.py), plus optional
+# lead_id (else id, else the row number) and lang (else --lang). Rows the
+# pipeline would flag with an error get no report and are counted as skipped.
+# Lead ids that map to a file name already written in the run (after making
+# them file-system safe, ignoring case) get the input row number appended.
+LEAD_COLUMNS = ("lead_id", "id")
+ASSUMPTIONS = ("assumption_self_consumption", "assumption_single_orientation", "assumption_average_yield",
+               "assumption_profile_simplified", "assumption_no_tariffs", "assumption_no_string_limits",
+               "assumption_fixed_efficiencies", "assumption_backup_additive")
+
+PAGE = """<!DOCTYPE html>
+<html lang="{lang}">
+<head><meta charset="utf-8"><title>[[title]]</title>
+<style>
+body{font-family:system-ui,sans-serif;max-width:46rem;margin:2rem auto;padding:0 1rem;color:#222}
+h2{border-bottom:1px solid #ddd;padding-bottom:.3rem;margin-top:2rem}
+.metrics{display:flex;gap:2rem}.metric .v{font-size:1.6rem;font-weight:600}.metric .l{color:#666}
+.warn{background:#fff4e5;border-left:4px solid #f0a020;padding:.5rem .8rem}
+.info{background:#e8f1fb;border-left:4px solid #3b82c4;padding:.5rem .8rem}
+.caption{color:#666;font-size:.9rem}
+</style></head>
+<body>
+<h1>[[title]]</h1>
+<p class="caption">[[subtitle]]</p>
+<p class="caption">{lead}</p>
+<h2>[[inv_reco]]</h2>
+<div class="metrics">
+<div class="metric"><div class="l">[[pv_dc_size]]</div><div class="v">{dc_kw}</div></div>
+<div class="metric"><div class="l">[[suggested_inverter]]</div><div class="v">{inverter}</div></div>
+</div>
+<p class="caption">{dcac_help}</p>
+{inverter_notes}
+<h2>[[battery_inputs]]</h2>
+{inputs}
+<h2>[[batt_reco]]</h2>
+<div class="metrics">
+<div class="metric"><div class="l">[[usable_capacity]]</div><div class="v">{battery_kwh}</div></div>
+<div class="metric"><div class="l">[[suggested_battery]]</div><div class="v">{battery}</div></div>
+</div>
+{battery_notes}
+<h2>[[constraints_title]]</h2>
+{constraints}
+<p class="caption">[[quick_estimate]]</p>
+</body>
+</html>
+"""
+
+# ---- Templates ----
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+def _html(text: str) -> str:
+    # Escaped text with the catalogs' **bold** markup
+    return _BOLD.sub(r"<strong>\1</strong>", html.escape(text))
+
+def _para(text: str, cls: str = None) -> str:
+    return f'<p class="{cls}">{_html(text)}</p>' if cls else f"<p>{_html(text)}</p>"
+
+def _orientation_text(T, orientation) -> str:
+    # Translated name for any alias orientation_azimuth accepts ("se", "South-East"), else the azimuth
+    if isinstance(orientation, str):
+        o = orientation.strip().lower().replace("-", "")
+        name = ORIENT_ALIASES.get(o, o)
+        if name in ORIENT_AZIMUTH:
+            return T(name)
+    return f"{orientation_azimuth(orientation):.0f}°"
+
+class ReportTemplate:
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.T = lambda key: get_text(lang, key)
+        # Headings and fixed notes are escaped once here; braces are doubled so they stay literal
+        page = re.sub(r"\[\[(\w+)\]\]", lambda m: _html(self.T(m.group(1))).replace("{", "{{").replace("}", "}}"),
+                      PAGE.replace("{", "{{").replace("}", "}}"))
+        self.page = re.sub(r"\{\{(\w+)\}\}", r"{\1}", page)
+        self.assumptions = {key: _html(self.T(key).lstrip("- ")) for key in ASSUMPTIONS}
+
+    def render(self, row: dict) -> str:
+        T = self.T
+        SYS = SYSTEMS[row["system"]]
+        warn = lambda text: _para(text, "warn")
+        inverter_notes = []
+        if not row["layout_ok"]:
+            inverter_notes.append(warn(T("no_string_layout")))
+        if not row["within_cap"]:
+            inverter_notes.append(warn(T("dcac_warn").format(cap=SYS["max_dc_ac_ratio"])))
+        if row["backup_kw"] > 0 and row["inverter_ac_kw"] < row["backup_kw"]:
+            inverter_notes.append(warn(T("backup_power_warn").format(need=row["backup_kw"], ac=row["inverter_ac_kw"])))
+
+        day_pct = int(round(row["day_fraction"] * 100))
+        inputs = [
+            _para(T("orientation_tilt_line").format(orientation=_orientation_text(T, row["orientation"]),
+                                                    tilt=f"{row['tilt']:g}")),
+            _para(T("profile_line").format(profile=T(row["profile"]), day=day_pct, night=100 - day_pct)),
+            _para(T("daily_load_line").format(daily_load=row["daily_load"], daily_pv=row["daily_pv"],
+                                              dc_kw=row["dc_kw"], specific_yield=row["specific_yield"])),
+            _para(T("day_night_line").format(day_load=row["day_load"], night_load=row["night_load"])),
+            _para(T("surplus_shift_line").format(surplus=row["surplus_day"], shiftable=row["shiftable"])),
+        ]
+        if row["backup_kw"] > 0 and row["backup_hours"] > 0:
+            inputs.append(_para(T("backup_req_line").format(kw=row["backup_kw"], h=row["backup_hours"],
+                                                            energy=row["backup_energy"])))
+
+        if row["battery_kwh"] > 0:
+            battery_notes = [
+                _para(T("rounded_caption").format(battery_type=SYS["battery_type"],
+                                                  battery_step_display=SYS["battery_step_display"]), "caption"),
+                _para(T("breakdown_line").format(self=row["shiftable"], backup=row["backup_energy"],
+                                                 total=row["usable_needed"])),
+            ]
+        else:
+            battery_notes = [_para(T("small_benefit"), "info")]
+
+        constraints = [
+            _para(T("mppt_strings").format(mppts=SYS["mppts"], strings=SYS["max_strings_total"])),
+            _para(T("string_current").format(current=SYS["max_string_current_a"])),
+            _para(T("dcac_cap").format(cap=SYS["max_dc_ac_ratio"])),
+            "<ul>" + "".join(f"<li>{self.assumptions[key]}</li>" for key in ASSUMPTIONS
+                             if key != "assumption_no_string_limits" or not row["has_string_limits"]) + "</ul>",
+        ]
+        return self.page.format(
+            lang=html.escape(self.lang), lead=html.escape(str(row["lead_id"])),
+            dc_kw=f"{row['dc_kw']:.2f} kW", inverter=html.escape(row["inverter_model"]),
+            dcac_help=_html(T("dcac_help").format(ratio=f"{row['dc_ac_ratio']:.2f}", cap=SYS["max_dc_ac_ratio"])),
+            inverter_notes="\n".join(inverter_notes), inputs="\n".join(inputs),
+            battery_kwh="—" if row["battery_kwh"] == 0 else f"{row['battery_kwh']:.1f} kWh",
+            battery=_html(T("no_battery") if row["battery_kwh"] == 0 else row["battery_label"]),
+            battery_notes="\n".join(battery_notes), constraints="\n".join(constraints),
+        )
+
+_templates = {}
+
+def template(lang: str) -> ReportTemplate:
+    tpl = _templates.get(lang)
+    if tpl is None:
+        tpl = _templates[lang] = ReportTemplate(lang)
+    return tpl
+
+# ---- Rendering ----
+def render_reports(inputs: dict, leads: list, langs: list, profiles: list):
+    # (lead_id, html) per row of size_batch keyword inputs, sized in one call
+    res = size_batch(**inputs)
+    n = len(res["dc_kw"])
+    cols = {k: v.tolist() for k, v in res.items()}
+    for name in ("orientation", "tilt", "day_fraction", "backup_kw", "backup_hours", "system_key"):
+        values = np.broadcast_to(np.asarray(inputs[name]), (n,))
+        cols[name] = values.tolist()
+    limits = {key: any(lim is not None for lim in CATALOG[key].string_limits) for key in set(cols["system_key"])}
+    for i in range(n):
+        row = {k: v[i] for k, v in cols.items()}
+        row.update(system=row["system_key"], lead_id=leads[i], profile=profiles[i],
+                   has_string_limits=limits[row["system_key"]])
+        yield leads[i], template(langs[i]).render(row)
+
+def _render_shard(inputs: dict, leads: list, langs: list, profiles: list) -> list:
+    return [(lead, text.encode("utf-8")) for lead, text in render_reports(inputs, leads, langs, profiles)]
+
+def _shards(path: str, chunk_rows: int, lang: str, system_key: str = None):
+    # (inputs, leads, langs, profiles, rows, skipped) per input chunk; rows are
+    # 1-based input row numbers, skipped lists (row number, error)
+    from .pipeline import _chunks, _column, row_errors, table_inputs
+    row = 0
+    for table in _chunks(path, chunk_rows):
+        n = table.num_rows
+        rows = list(range(row + 1, row + n + 1))
+        lead_col = next((c for c in LEAD_COLUMNS if c in table.column_names), None)
+        leads = [f"{r - 1:08d}" for r in rows]
+        if lead_col:
+            leads = [lead if v is None or str(v) == "" else str(v)
+                     for v, lead in zip(table.column(lead_col).to_pylist(), leads)]
+        langs = [lang] * n
+        if "lang" in table.column_names:
+            langs = [v or lang for v in table.column("lang").cast("string").to_pylist()]
+        if "profile" in table.column_names:
+            profiles = [str(v) for v in _column(table, "profile").tolist()]
+        else:
+            profiles = ["p_custom" if "day_fraction" in table.column_names else "p_balanced"] * n
+        inputs = table_inputs(table, system_key)
+        errors = row_errors(inputs, table)
+        skipped = [(row + int(i) + 1, errors[i]) for i in np.flatnonzero(errors != "")]
+        if skipped:
+            keep = np.flatnonzero(errors == "")
+            leads, langs, profiles, rows = ([v[i] for i in keep] for v in (leads, langs, profiles, rows))
+            inputs = {k: np.asarray(v)[keep] if np.ndim(v) else v for k, v in inputs.items()}
+        inputs = {k: v.tolist() if isinstance(v, np.ndarray) and v.dtype == object else v for k, v in inputs.items()}
+        yield inputs, leads, langs, profiles, rows, skipped
+        row += n
+
+# ---- Output ----
+class _DirectoryWriter:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, name: str, data: bytes):
+        with open(os.path.join(self.path, name), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+class _ZipWriter:
+    def __init__(self, path: str):
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+
+    def write(self, name: str, data: bytes):
+        self.zip.writestr(name, data)
+
+    def close(self):
+        self.zip.close()
+
+_SAFE_NAME = re.compile(r"[^\w.-]+")
+
+def _base_name(lead: str) -> str:
+    return _SAFE_NAME.sub("_", lead).strip("._") or "report"
+
+def _file_name(lead: str, row: int, taken: set) -> str:
+    # A safe name for the lead's report that no earlier report of the run has
+    # taken; compared case-insensitively, as some file systems do
+    base = _base_name(lead)
+    name, n = f"{base}.html", 0
+    while name.lower() in taken:
+        n += 1
+        name = f"{base}-{row}.html" if n == 1 else f"{base}-{row}-{n}.html"
+    taken.add(name.lower())
+    return name
+
+# ---- Driver ----
+def run_reports(in_path: str, out_path: str, lang: str = "en", workers: int = None, chunk_rows: int = 2_000,
+                system_key: str = None, progress=None) -> dict:
+    # Writes one <lead_id>.html per valid input row into out_path (a directory, or a .zip)
+    workers = workers or os.cpu_count() or 1
+    writer = _ZipWriter(out_path) if out_path.endswith(".zip") else _DirectoryWriter(out_path)
+    done, skipped, renamed, taken = 0, [], 0, set()
+
+    def write(rows: list, fut) -> int:
+        nonlocal renamed
+        for row, (lead, data) in zip(rows, fut.result()):
+            name = _file_name(lead, row, taken)
+            renamed += name != f"{_base_name(lead)}.html"
+            writer.write(name, data)
+        return len(rows)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Bounded window in flight, written in submission order (as in sweep.run_sweep)
+            pending = deque()
+            for inputs, leads, langs, profiles, rows, bad in _shards(in_path, chunk_rows, lang, system_key):
+                skipped += bad
+                pending.append((rows, pool.submit(_render_shard, inputs, leads, langs, profiles)))
+                if len(pending) >= 2 * workers:
+                    done += write(*pending.popleft())
+                    if progress: progress(done)
+            while pending:
+                done += write(*pending.popleft())
+                if progress: progress(done)
+    finally:
+        writer.close()
+    return {"reports": done, "renamed": renamed, "skipped": len(skipped), "errors": skipped[:20]}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render a localized HTML sizing report per lead")
+    ap.add_argument("input", help="CSV or Parquet with the pipeline's site columns, plus lead_id and lang")
+    ap.add_argument("out", help="output directory, or a .zip file")
+    ap.add_argument("--lang", default="en", help="language for rows without a 'lang' column")
+    ap.add_argument("--system", choices=list(SYSTEMS.keys()), default=None,
+                    help="system for rows without a 'system' column")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk-rows", type=int, default=2_000)
+    args = ap.parse_args(argv)
+    started = time.perf_counter()
+
+    def report(rows: int):
+        rate = rows / max(time.perf_counter() - started, 1e-9)
+        print(f"\r{rows:,} reports — {rate:,.0f}/s", end="", file=sys.stderr, flush=True)
+
+    stats = run_reports(args.input, args.out, args.lang, args.workers, args.chunk_rows, args.system, report)
+    print(f"\n{stats['reports']:,} reports in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    if stats["renamed"]:
+        print(f"{stats['renamed']:,} reports got their row number appended: lead id taken by another row",
+              file=sys.stderr)
+    if stats["skipped"]:
+        print(f"{stats['skipped']:,} rows skipped, e.g. " +
+              "; ".join(f"row {row}: {error}" for row, error in stats["errors"][:3]), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# roof.py
+import numpy as np
+from .simulation import hourly_load_profile
+from .sizing import DEFAULT_YIELD_PER_KWP_YR, DEFAULT_RTE, DEFAULT_DOD, ORIENT_AZIMUTH, apply_system_factors
+from .solar import DEFAULT_LATITUDE, typical_poa
+from .transposition import REFERENCE_PLANE
+from .systems import CATALOG
+from .timing import span
+
+# Multi-plane (split roof) PV. A plane is (modules, azimuth_deg, tilt_deg) with
+# azimuth clockwise from north. Hourly curves for all planes come out of one
+# (planes × 8760) array pass and are scaled so that a south-facing 30° plane
+# earns the regional specific yield; other planes keep their irradiance ratio.
+OPPOSITE = {k: next(o for o, a in ORIENT_AZIMUTH.items() if a == (v + 180) % 360) for k, v in ORIENT_AZIMUTH.items()}
+
+# ---- Generation ----
+def plane_profiles(planes, module_wp: float, region_yield: float = DEFAULT_YIELD_PER_KWP_YR,
+                   latitude: float = DEFAULT_LATITUDE) -> np.ndarray:
+    p = np.asarray(planes, dtype=float).reshape(-1, 3)
+    poa = typical_poa(np.r_[REFERENCE_PLANE[0], p[:, 1]], np.r_[REFERENCE_PLANE[1], p[:, 2]], latitude)
+    ref, poa = poa[0], poa[1:]
+    kwp = p[:, 0] * module_wp / 1000.0
+    return poa * (kwp * region_yield / ref.sum())[:, None]
+
+def combined_profile(planes, module_wp: float, region_yield: float = DEFAULT_YIELD_PER_KWP_YR,
+                     latitude: float = DEFAULT_LATITUDE) -> np.ndarray:
+    return plane_profiles(planes, module_wp, region_yield, latitude).sum(axis=0)
+
+# ---- Battery need from hourly curves ----
+def hourly_components(pv_kwh, load_kwh, day_fraction: float, backup_kw: float, backup_hours: float) -> dict:
+    # Same keys as sizing.estimate_battery_need_components, but surplus and the
+    # shiftable share come from the hour-by-hour overlap of PV and load.
+    pv = np.asarray(pv_kwh, dtype=float).reshape(365, 24)
+    load = np.asarray(load_kwh, dtype=float).reshape(365, 24)
+    diff = pv - load
+    surplus = np.maximum(diff, 0.0).sum(axis=1)
+    deficit = np.maximum(-diff, 0.0).sum(axis=1)
+    daily_load = load.sum() / 365.0
+    day_load = daily_load * day_fraction
+    return {
+        "daily_load": daily_load, "daily_pv": pv.sum() / 365.0,
+        "day_load": day_load, "night_load": daily_load - day_load,
+        "surplus_day": float(surplus.mean()), "shiftable": float(np.minimum(surplus, deficit).mean()),
+        "backup_energy": max(0.0, backup_kw) * max(0.0, backup_hours),
+    }
+
+def size_roof(system_key: str, planes, module_wp: float, annual_kwh: float, day_fraction: float,
+              backup_kw: float = 0.0, backup_hours: float = 0.0,
+              region_yield: float = DEFAULT_YIELD_PER_KWP_YR, rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD,
+              latitude: float = DEFAULT_LATITUDE, module: dict = None) -> dict:
+    index = CATALOG[system_key]
+    with span("yield_estimation"):
+        pv = combined_profile(planes, module_wp, region_yield, latitude)
+        dc_kw = sum(p[0] for p in planes) * module_wp / 1000.0
+        specific_yield = float(pv.sum() / dc_kw) if dc_kw > 0 else 0.0
+    with span("inverter_pick"):
+        # Each plane gets its own MPPTs
+        inv_choice = index.pick_inverter(dc_kw, [int(p[0]) for p in planes], module)
+    with span("battery_sizing"):
+        comp = hourly_components(pv, hourly_load_profile(annual_kwh, day_fraction), day_fraction,
+                                 backup_kw, backup_hours)
+        usable_needed, nominal_needed = apply_system_factors(comp["shiftable"], comp["backup_energy"], rte, dod)
+        rec_kwh, rec_label = index.pick_battery(usable_needed)
+    return {
+        "dc_kw": dc_kw, "specific_yield": specific_yield, "inverter": inv_choice, "components": comp,
+        "usable_needed": usable_needed, "nominal_needed": nominal_needed,
+        "battery_kwh": rec_kwh, "battery_label": rec_label,
+    }
@@ -0,0 +1,449 @@
+# service.py
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+
+import numpy as np
+from .batch import size_batch
+from .cache import cached_hourly_simulation, cached_meter_import, cached_size_roof
+from .layout import DEFAULT_MODULE, solve_layout
+from .sizing import DEFAULT_RTE, DEFAULT_DOD, LOAD_PROFILES, ORIENT_AZIMUTH
+from .systems import CATALOG, SYSTEMS
+
+# HTTP/JSON access to the sizer for other systems (CRM, installer portal).
+# Requests take the inputs of the app's form under the same names and limits;
+# results have the shape of sizing.size_system plus the optional sections the
+# app shows. Concurrent POST /size requests are queued for up to window_ms (or
+# until max_batch are waiting) and sized together with one size_batch call in
+# a worker thread, so the event loop keeps accepting while NumPy runs. POST
+# /size/bulk sizes a list in one call. Meter imports, split roofs, hourly
+# simulation, uncertainty and economics are per-request work done off the
+# event loop; when one of them fails, only that request fails (a bulk entry
+# becomes {"error": ...}), never the others batched with it.
+#
+# The HTTP layer is a small HTTP/1.1 server on asyncio streams (keep-alive,
+# Content-Length bodies) so the service has no dependencies beyond NumPy.
+# SizingService.handle() is the transport-free entry point; LocalClient calls
+# it in-process for tests and scripts.
+#
+#   python -m sizer.service --port 8080
+#   curl -d '{"total_modules": 20, "annual_kwh": 6000}' localhost:8080/size
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BULK = 100_000
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+# name: (type, min, max, default), with the limits of the app's form inputs
+NUMBERS = {
+    "total_modules": (int, 1, 300, 16),
+    "module_wp": (float, 250, 700, 430),
+    "annual_kwh": (float, 500, 50000, 5000),
+    "tilt": (float, 0, 90, 30),
+    "day_fraction": (float, 0.2, 0.8, None),
+    "main_share": (float, 0, 100, 50),
+    "backup_kw": (float, 0, 30, 0.0),
+    "backup_hours": (float, 0, 48, 0.0),
+    "warranty_years": (int, 5, 20, 10),
+}
+MODULE_NUMBERS = {"voc_v": (float, 10, 100), "vmp_v": (float, 10, 100), "imp_a": (float, 1, 30)}
+ECONOMICS_NUMBERS = {
+    "tariff": (float, 0, 2, 0.30), "feed_in": (float, 0, 1, 0.08), "battery_price": (float, 0, 3000, 500.0),
+    "fixed_cost": (float, 0, 20000, 1500.0), "horizon": (int, 10, 20, 15), "discount_pct": (float, 0, 15, 3.0),
+}
+FLAGS = ("split_roof", "degradation", "uncertainty", "hourly_sim")
+
+class RequestError(ValueError):
+    pass
+
+# ---- Input validation ----
+def _number(name: str, value, kind, lo, hi):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise RequestError(f"'{name}' must be a number")
+    if kind is int and value != int(value):
+        raise RequestError(f"'{name}' must be a whole number")
+    if not lo <= value <= hi:
+        raise RequestError(f"'{name}' must be between {lo} and {hi}")
+    return kind(value)
+
+def _choice(name: str, value, options) -> str:
+    if value not in options:
+        raise RequestError(f"'{name}' must be one of {sorted(options)}")
+    return value
+
+def parse_request(data: dict) -> dict:
+    # Form inputs with defaults filled in; raises RequestError on bad input
+    if not isinstance(data, dict):
+        raise RequestError("request must be a JSON object")
+    known = {"system", "orientation", "profile", "load_shape", "module", "economics", "meter_csv",
+             *NUMBERS, *FLAGS}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise RequestError(f"unknown fields {unknown}")
+    req = {name: _number(name, data[name], kind, lo, hi) if name in data else default
+           for name, (kind, lo, hi, default) in NUMBERS.items()}
+    req["system"] = _choice("system", data.get("system", next(iter(SYSTEMS))), SYSTEMS)
+    req["orientation"] = _choice("orientation", data.get("orientation", "south"), ORIENT_AZIMUTH)
+    req["profile"] = _choice("profile", data.get("profile", next(iter(LOAD_PROFILES))), LOAD_PROFILES)
+    for flag in FLAGS:
+        if not isinstance(data.get(flag, False), bool):
+            raise RequestError(f"'{flag}' must be true or false")
+        req[flag] = data.get(flag, False)
+    if req["day_fraction"] is None:
+        req["day_fraction"] = LOAD_PROFILES[req["profile"]] or 0.40
+    req["module"] = None
+    if data.get("module") is not None:
+        if not isinstance(data["module"], dict):
+            raise RequestError("'module' must be an object")
+        req["module"] = {**DEFAULT_MODULE, **{k: _number(f"module.{k}", data["module"][k], kind, lo, hi)
+                                              for k, (kind, lo, hi) in MODULE_NUMBERS.items() if k in data["module"]}}
+    req["load_shape"] = data.get("load_shape")
+    if req["load_shape"] is not None:
+        from .profiles import names
+        req["load_shape"] = _choice("load_shape", req["load_shape"], names())
+    req["economics"] = None
+    if data.get("economics") is not None:
+        econ = data["economics"]
+        if not isinstance(econ, dict):
+            raise RequestError("'economics' must be an object")
+        req["economics"] = {name: _number(f"economics.{name}", econ[name], kind, lo, hi) if name in econ else default
+                            for name, (kind, lo, hi, default) in ECONOMICS_NUMBERS.items()}
+    # Parsed later, off the event loop (load_meter)
+    req["meter_csv"] = None if data.get("meter_csv") is None else str(data["meter_csv"])
+    req["meter"] = None
+    return req
+
+def load_meter(req: dict) -> dict:
+    # Smart-meter data replaces the consumption and day-fraction inputs, as in the app
+    if req["meter_csv"] is not None and req["meter"] is None:
+        try:
+            req["meter"] = cached_meter_import(req["meter_csv"].encode("utf-8"))
+        except ValueError as e:
+            raise RequestError(f"meter_csv: {e}") from None
+        req["annual_kwh"], req["day_fraction"] = req["meter"]["annual_kwh"], req["meter"]["day_fraction"]
+    return req
+
+# ---- Sizing ----
+def _plain(value):
+    # JSON-ready copy: NumPy values to Python, non-finite floats to null
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_plain(v) for v in (value.tolist() if isinstance(value, np.ndarray) else value)]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def _planes(req: dict) -> list:
+    n_main = int(round(req["total_modules"] * req["main_share"] / 100))
+    from .roof import OPPOSITE
+    return [(n_main, ORIENT_AZIMUTH[req["orientation"]], req["tilt"]),
+            (req["total_modules"] - n_main, ORIENT_AZIMUTH[OPPOSITE[req["orientation"]]], req["tilt"])]
+
+def _row_results(reqs: list, module) -> list:
+    # One size_batch call for requests that share the module spec
+    cols = {name: np.array([r[name] for r in reqs]) for name in
+            ("total_modules", "module_wp", "annual_kwh", "tilt", "orientation", "day_fraction",
+             "backup_kw", "backup_hours")}
+    res = size_batch(**cols, system_key=np.array([r["system"] for r in reqs]), module=module)
+    res = {k: v.tolist() for k, v in res.items()}
+    out = []
+    for i, req in enumerate(reqs):
+        index = CATALOG[req["system"]]
+        inverter = {"ac_kw": res["inverter_ac_kw"][i], "model": res["inverter_model"][i],
+                    "dc_ac_ratio": res["dc_ac_ratio"][i], "within_cap": res["within_cap"][i]}
+        if any(lim is not None for lim in index.string_limits):
+            limits = index.string_limits[index.ac_sizes.index(inverter["ac_kw"])]
+            inverter["layout"] = solve_layout(req["total_modules"], module, limits)
+        out.append({
+            "dc_kw": res["dc_kw"][i], "specific_yield": res["specific_yield"][i], "inverter": inverter,
+            "components": {k: res[k][i] for k in ("daily_load", "daily_pv", "day_load", "night_load",
+                                                   "surplus_day", "shiftable", "backup_energy")},
+            "usable_needed": res["usable_needed"][i], "nominal_needed": res["nominal_needed"][i],
+            "battery_kwh": res["battery_kwh"][i], "battery_label": res["battery_label"][i],
+        })
+    return out
+
+def _add_lifetime(reqs: list, rows: list):
+    # End-of-warranty battery picks, one vectorized call per system and warranty period
+    from .degradation import pick_lifetime_batteries
+    groups = {}
+    for i, req in enumerate(reqs):
+        if req["degradation"]:
+            groups.setdefault((req["system"], req["warranty_years"]), []).append(i)
+    for (system_key, years), idx in groups.items():
+        SYS = SYSTEMS[system_key]
+        life = pick_lifetime_batteries(np.array([rows[i]["components"]["shiftable"] for i in idx]),
+                                       np.array([rows[i]["components"]["backup_energy"] for i in idx]),
+                                       SYS["battery_options_kwh"], SYS["battery_labels"], years)
+        life = {k: np.asarray(v).tolist() for k, v in life.items()}
+        for j, i in enumerate(idx):
+            rows[i]["lifetime"] = {k: v[j] for k, v in life.items()}
+
+def _add_extras(req: dict, row: dict):
+    SYS = SYSTEMS[req["system"]]
+    if req["uncertainty"]:
+        from .uncertainty import monte_carlo
+        row["monte_carlo"] = _plain(monte_carlo(req["system"], row["dc_kw"], row["specific_yield"],
+                                                req["annual_kwh"], req["day_fraction"], req["backup_kw"],
+                                                req["backup_hours"]))
+    sim = None
+    if req["hourly_sim"]:
+        planes = _planes(req) if req["split_roof"] else None
+        sim = cached_hourly_simulation(req["system"], row["dc_kw"], row["specific_yield"], req["annual_kwh"],
+                                       req["day_fraction"], DEFAULT_RTE, DEFAULT_DOD, planes, req["module_wp"],
+                                       req["load_shape"], req["meter"]["hourly_kwh"] if req["meter"] else None)
+        row["simulation"] = _plain(sim)
+    if req["economics"]:
+        from .economics import evaluate_options
+        e = req["economics"]
+        row["economics"] = _plain(evaluate_options(SYS, row["components"]["shiftable"], e["tariff"], e["feed_in"],
+                                                   e["battery_price"], e["fixed_cost"], e["horizon"],
+                                                   e["discount_pct"] / 100.0,
+                                                   annual_discharge_kwh=sim["discharged_kwh"][1:] if sim else None))
+    if req["meter"]:
+        row["meter"] = {k: v for k, v in req["meter"].items() if k != "hourly_kwh"}
+
+def size_requests(reqs: list) -> list:
+    # Results for parsed requests, in order. A request whose own work fails
+    # (meter import, split roof, extras) gets the exception in its place; only
+    # a failure of the shared size_batch call raises.
+    out = [None] * len(reqs)
+    groups = {}
+    for i, req in enumerate(reqs):
+        try:
+            load_meter(req)
+            if req["split_roof"]:
+                out[i] = _plain(cached_size_roof(system_key=req["system"], planes=_planes(req),
+                                                 module_wp=req["module_wp"], annual_kwh=req["annual_kwh"],
+                                                 day_fraction=req["day_fraction"], backup_kw=req["backup_kw"],
+                                                 backup_hours=req["backup_hours"], module=req["module"]))
+                continue
+        except Exception as e:
+            out[i] = e
+            continue
+        module = req["module"]
+        groups.setdefault(None if module is None else tuple(sorted(module.items())), []).append(i)
+    for module, idx in groups.items():
+        for i, row in zip(idx, _row_results([reqs[i] for i in idx], None if module is None else dict(module))):
+            out[i] = row
+    ok = [i for i, row in enumerate(out) if not isinstance(row, Exception)]
+    _add_lifetime([reqs[i] for i in ok], [out[i] for i in ok])
+    for i in ok:
+        req = reqs[i]
+        if req["uncertainty"] or req["hourly_sim"] or req["economics"] or req["meter"]:
+            try:
+                _add_extras(req, out[i])
+            except Exception as e:
+                out[i] = e
+    return out
+
+def _error_text(e: Exception) -> str:
+    return str(e) if isinstance(e, RequestError) else f"{type(e).__name__}: {e}"
+
+# ---- Micro-batching ----
+class MicroBatcher:
+    # Collects submitted requests for up to window_ms and sizes them in one call
+    def __init__(self, window_ms: float = DEFAULT_WINDOW_MS, max_batch: int = DEFAULT_MAX_BATCH):
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, req: dict) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((req, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: list):
+        self.batches += 1
+        self.requests += len(batch)
+        loop = asyncio.get_running_loop()
+        reqs = [r for r, _ in batch]
+        try:
+            results = await loop.run_in_executor(None, size_requests, reqs)
+        except Exception as e:
+            if len(batch) == 1:
+                results = [e]
+            else:
+                # The shared call failed: size each request alone so only the culprit fails
+                results = []
+                for req in reqs:
+                    try:
+                        results.append((await loop.run_in_executor(None, size_requests, [req]))[0])
+                    except Exception as e:
+                        results.append(e)
+        for (_, fut), result in zip(batch, results):
+            if fut.done():
+                continue
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+# ---- Service ----
+class SizingService:
+    def __init__(self, window_ms: float = DEFAULT_WINDOW_MS, max_batch: int = DEFAULT_MAX_BATCH):
+        self.batcher = MicroBatcher(window_ms, max_batch)
+        self.started = time.time()
+
+    async def handle(self, method: str, path: str, body: bytes = b"") -> tuple:
+        # (status, JSON-ready payload) for one request
+        routes = {"/health": ("GET", self._health), "/systems": ("GET", self._systems),
+                  "/size": ("POST", self._size), "/size/bulk": ("POST", self._bulk)}
+        if path not in routes:
+            return 404, {"error": f"no route {path}"}
+        allowed, fn = routes[path]
+        if method != allowed:
+            return 405, {"error": f"{path} takes {allowed}"}
+        try:
+            data = json.loads(body) if body else {}
+            return 200, await fn(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+        except RequestError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": _error_text(e)}
+
+    async def _health(self, data) -> dict:
+        return {"status": "ok", "catalog_version": CATALOG.version, "uptime_s": round(time.time() - self.started, 1),
+                "batches": self.batcher.batches, "requests": self.batcher.requests}
+
+    async def _systems(self, data) -> dict:
+        return {key: {"inverters": [{"ac_kw": ac, "model": SYS["models"].get(ac, f"{ac:.1f} kW")}
+                                    for ac in SYS["inverter_ac_sizes"]],
+                      "batteries": [{"usable_kwh": kwh, "label": label}
+                                    for kwh, label in zip(SYS["battery_options_kwh"], SYS["battery_labels"])],
+                      "max_dc_ac_ratio": SYS["max_dc_ac_ratio"]}
+                for key, SYS in SYSTEMS.items()}
+
+    async def _size(self, data) -> dict:
+        req = parse_request(data)
+        if req["meter_csv"] is not None:
+            # Parsed before batching, in a worker thread, so it neither blocks the loop nor delays the batch
+            await asyncio.get_running_loop().run_in_executor(None, load_meter, req)
+        return await self.batcher.submit(req)
+
+    async def _bulk(self, data) -> dict:
+        items = data.get("requests") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise RequestError("expected a list of requests or {\"requests\": [...]}")
+        if len(items) > MAX_BULK:
+            raise RequestError(f"at most {MAX_BULK} requests per bulk call")
+        reqs = []
+        for i, item in enumerate(items):
+            try:
+                reqs.append(parse_request(item))
+            except RequestError as e:
+                raise RequestError(f"requests[{i}]: {e}") from None
+        results = await asyncio.get_running_loop().run_in_executor(None, size_requests, reqs)
+        return {"results": [{"error": _error_text(r)} if isinstance(r, Exception) else r for r in results]}
+
+    # ---- HTTP/1.1 ----
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, {"error": "headers too large"}, False)
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = (lines[0].split(" ", 2) + ["", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close" if version == "HTTP/1.1"
+                              else headers.get("connection", "").lower() == "keep-alive")
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    await self._respond(writer, 411, {"error": "send a Content-Length body"}, False)
+                    break
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": f"body over {MAX_BODY_BYTES} bytes"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.handle(method, target.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n" + ("" if keep_alive else "Connection: close\r\n") + "\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        # One throwaway request first, so the yield grid and lazy imports are not paid by a client
+        await asyncio.get_running_loop().run_in_executor(None, size_requests, [parse_request({})])
+        return await asyncio.start_server(self.serve_connection, host, port, limit=64 * 1024)
+
+class LocalClient:
+    # Calls a SizingService in-process, without sockets; payloads round-trip through JSON
+    def __init__(self, service: SizingService = None):
+        self.service = service or SizingService()
+
+    async def request(self, method: str, path: str, payload=None) -> tuple:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        status, out = await self.service.handle(method, path, body)
+        return status, json.loads(json.dumps(out))
+
+    async def get(self, path: str) -> tuple:
+        return await self.request("GET", path)
+
+    async def post(self, path: str, payload) -> tuple:
+        return await self.request("POST", path, payload)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve battery/inverter sizing over HTTP/JSON")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS,
+                    help="how long a request may wait for others to share its batch")
+    ap.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    args = ap.parse_args(argv)
+
+    async def run():
+        service = SizingService(args.window_ms, args.max_batch)
+        server = await service.serve(args.host, args.port)
+        print(f"serving on http://{args.host}:{args.port}", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# simulation.py
+import numpy as np
+from .sizing import DEFAULT_RTE, DEFAULT_DOD
+
+HOURS_PER_YEAR = 8760
+DAY_HOURS = (7, 19)   # [start, end) hours that count as "day" for day_fraction
+
+# ---- Synthetic hourly series ----
+def hourly_pv_profile(pv_kw: float, specific_yield_kwh_per_kwp_yr: float) -> np.ndarray:
+    # Half-cosine bell around solar noon; day length and amplitude follow the season
+    season = np.cos(2 * np.pi * (np.arange(365) + 10) / 365.0)
+    day_len = 12.0 - 4.0 * season                    # ~8 h in winter, ~16 h in summer
+    amplitude = 1.0 - 0.65 * season
+    x = (np.arange(24) + 0.5 - 12.5) / day_len[:, None]
+    shape = np.where(np.abs(x) < 0.5, np.cos(np.pi * x), 0.0) * amplitude[:, None]
+    return (shape * (pv_kw * specific_yield_kwh_per_kwp_yr / shape.sum())).ravel()
+
+def hourly_load_profile(annual_kwh: float, day_fraction: float) -> np.ndarray:
+    start, end = DAY_HOURS
+    day_h = end - start
+    daily_load = annual_kwh / 365.0
+    day = np.full(24, daily_load * (1.0 - day_fraction) / (24 - day_h))
+    day[start:end] = daily_load * day_fraction / day_h
+    return np.tile(day, 365)
+
+# ---- Battery dispatch ----
+def simulate_battery(pv_kwh, load_kwh, capacities_kwh, rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD) -> dict:
+    pv = np.asarray(pv_kwh, dtype=float)
+    load = np.asarray(load_kwh, dtype=float)
+    window = np.asarray(capacities_kwh, dtype=float) * dod     # usable SoC window per option
+    eta = np.sqrt(rte)                                          # split RTE between charge and discharge
+    surplus = pv - load
+
+    # Greedy self-consumption dispatch, one state vector for all options at once;
+    # SoC carries over between days and starts empty on Jan 1st.
+    soc = np.zeros_like(window)
+    stored_total = np.zeros_like(window)
+    delivered_total = np.zeros_like(window)
+    step = np.empty_like(window)
+    for s in surplus.tolist():
+        if s > 0:
+            np.subtract(window, soc, out=step)
+            np.minimum(step, s * eta, out=step)
+            soc += step
+            stored_total += step
+        elif s < 0:
+            np.multiply(soc, eta, out=step)
+            np.minimum(step, -s, out=step)
+            soc -= step / eta
+            delivered_total += step
+
+    pv_total = pv.sum()
+    load_total = load.sum()
+    export = np.maximum(surplus, 0.0).sum() - stored_total / eta
+    grid_import = np.maximum(-surplus, 0.0).sum() - delivered_total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cycles = np.where(window > 0, delivered_total / window, 0.0)
+    return {
+        "capacity_kwh": np.asarray(capacities_kwh, dtype=float),
+        "self_consumption": (pv_total - export) / pv_total if pv_total > 0 else np.zeros_like(window),
+        "autarky": (load_total - grid_import) / load_total if load_total > 0 else np.ones_like(window),
+        "cycles": cycles,
+        "grid_import_kwh": grid_import, "export_kwh": export,
+        "discharged_kwh": delivered_total,
+    }
+
+def simulate_system(SYS: dict, pv_kwh, load_kwh, rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD) -> dict:
+    options = [0.0] + list(SYS["battery_options_kwh"])
+    res = simulate_battery(pv_kwh, load_kwh, options, rte, dod)
+    res["label"] = [""] + [SYS["battery_labels"][i] if i < len(SYS["battery_labels"]) else f"{o:.1f} kWh"
+                           for i, o in enumerate(SYS["battery_options_kwh"])]
+    return res
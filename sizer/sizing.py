@@ -0,0 +1,114 @@
+# sizing.py
+import math
+
+from .systems import CATALOG
+from .timing import span
+
+# ---- Fixed assumptions (no UI) ----
+DEFAULT_YIELD_PER_KWP_YR = 1050   # kWh/kWp/year
+DEFAULT_RTE = 0.90                # round-trip efficiency
+DEFAULT_DOD = 0.95                # usable depth of discharge
+
+LOAD_PROFILES = {
+    "p_balanced": 0.40,
+    "p_workday": 0.30,
+    "p_home": 0.55,
+    "p_evening": 0.25,
+    "p_heatpump": 0.50,
+    "p_custom": None,
+}
+
+# Azimuth clockwise from north for the named orientations
+ORIENT_AZIMUTH = {"north": 0, "northeast": 45, "east": 90, "southeast": 135,
+                  "south": 180, "southwest": 225, "west": 270, "northwest": 315}
+ORIENT_ALIASES = {"n": "north", "ne": "northeast", "e": "east", "se": "southeast",
+                  "s": "south", "sw": "southwest", "w": "west", "nw": "northwest"}
+
+# ---- Helpers ----
+def orientation_azimuth(orientation) -> float:
+    # Named orientation ("south", "SE", "south-east") or a numeric azimuth; unknown names count as south
+    if isinstance(orientation, (int, float)):
+        return float(orientation)
+    o = orientation.strip().lower().replace("-", "")
+    try:
+        return float(o)
+    except ValueError:
+        return float(ORIENT_AZIMUTH.get(ORIENT_ALIASES.get(o, o), 180))
+
+def orientation_known(orientation) -> bool:
+    # Whether orientation_azimuth reads it as given, rather than as south by default
+    if isinstance(orientation, (int, float)):
+        return math.isfinite(orientation)
+    o = orientation.strip().lower().replace("-", "")
+    try:
+        return math.isfinite(float(o))
+    except ValueError:
+        return ORIENT_ALIASES.get(o, o) in ORIENT_AZIMUTH
+
+def orientation_tilt_factor(orientation, tilt_deg: float) -> float:
+    # Continuous factor from the transposition table; NumPy-backed, so it is
+    # imported on first use to keep `import sizer` light.
+    from .transposition import yield_factor
+    return yield_factor(orientation_azimuth(orientation), tilt_deg)
+
+def pick_inverter(dc_kw: float, ac_sizes: list, models_map: dict, max_ratio: float) -> dict:
+    choices = []
+    for ac in ac_sizes:
+        ratio = dc_kw / ac if ac > 0 else float("inf")
+        ok = ratio <= max_ratio
+        score = abs(1.25 - ratio)
+        choices.append((ac, ratio, ok, score))
+    valid = [c for c in choices if c[2]]
+    best = min(valid, key=lambda x: (x[3], x[0])) if valid else max(choices, key=lambda x: x[0])
+    ac_kw = best[0]
+    return {"ac_kw": ac_kw, "model": models_map.get(ac_kw, f"{ac_kw:.1f} kW"), "dc_ac_ratio": best[1], "within_cap": best[2]}
+
+def estimate_battery_need_components(annual_kwh: float, pv_kw: float, specific_yield_kwh_per_kwp_yr: float,
+                                     day_fraction: float, backup_kw: float, backup_hours: float):
+    daily_load = annual_kwh / 365.0
+    daily_pv = (pv_kw * specific_yield_kwh_per_kwp_yr) / 365.0
+    day_load = daily_load * day_fraction
+    night_load = daily_load - day_load
+    # Single-side assumption -> no curve flattening factor
+    surplus_day = max(0.0, daily_pv - day_load)
+    shiftable = min(surplus_day, night_load)
+    backup_energy = max(0.0, backup_kw) * max(0.0, backup_hours)
+    return {
+        "daily_load": daily_load, "daily_pv": daily_pv,
+        "day_load": day_load, "night_load": night_load,
+        "surplus_day": surplus_day, "shiftable": shiftable,
+        "backup_energy": backup_energy,
+    }
+
+def apply_system_factors(usable_self_kwh: float, usable_backup_kwh: float,
+                         rte: float, dod: float):
+    usable_needed = usable_self_kwh + usable_backup_kwh
+    nominal_needed = 0.0 if usable_needed <= 0 else usable_needed / (dod * rte)
+    return usable_needed, nominal_needed
+
+def pick_battery_model(usable_kwh_needed: float, options: list, labels: list) -> tuple:
+    if usable_kwh_needed <= 0 or not options: return 0.0, ""
+    idx = min(range(len(options)), key=lambda i: abs(options[i] - usable_kwh_needed))
+    return options[idx], labels[idx] if idx < len(labels) else f"{options[idx]:.1f} kWh"
+
+# ---- Full chain ----
+def size_system(system_key: str, total_modules: int, module_wp: float, annual_kwh: float,
+                orientation: str, tilt: float, day_fraction: float,
+                backup_kw: float = 0.0, backup_hours: float = 0.0,
+                region_yield: float = DEFAULT_YIELD_PER_KWP_YR,
+                rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD, module: dict = None) -> dict:
+    index = CATALOG[system_key]
+    with span("yield_estimation"):
+        dc_kw = (total_modules * module_wp) / 1000.0
+        specific_yield = region_yield * orientation_tilt_factor(orientation, tilt)
+    with span("inverter_pick"):
+        inv_choice = index.pick_inverter(dc_kw, total_modules, module)
+    with span("battery_sizing"):
+        comp = estimate_battery_need_components(annual_kwh, dc_kw, specific_yield, day_fraction, backup_kw, backup_hours)
+        usable_needed, nominal_needed = apply_system_factors(comp["shiftable"], comp["backup_energy"], rte, dod)
+        rec_kwh, rec_label = index.pick_battery(usable_needed)
+    return {
+        "dc_kw": dc_kw, "specific_yield": specific_yield, "inverter": inv_choice, "components": comp,
+        "usable_needed": usable_needed, "nominal_needed": nominal_needed,
+        "battery_kwh": rec_kwh, "battery_label": rec_label,
+    }
@@ -0,0 +1,228 @@
+# solar.py
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_LATITUDE = 48.0      # central Europe
+SOLAR_CONSTANT = 1361.0      # W/m²
+DIFFUSE_SHARE = 0.8          # diffuse/beam-horizontal ratio for an average (not clear) sky
+
+# ---- Sun position over a typical year (8760 h, solar time) ----
+@lru_cache(maxsize=16)
+def sun_position(latitude: float = DEFAULT_LATITUDE):
+    hours = np.arange(8760)
+    day = hours // 24 + 1
+    solar_time = hours % 24 + 0.5
+    phi = np.radians(latitude)
+    decl = np.radians(23.45) * np.sin(2 * np.pi * (284 + day) / 365.0)
+    omega = np.radians(15.0 * (solar_time - 12.0))
+    sin_el = np.sin(phi) * np.sin(decl) + np.cos(phi) * np.cos(decl) * np.cos(omega)
+    elevation = np.arcsin(np.clip(sin_el, -1.0, 1.0))
+    # Azimuth clockwise from north (90 = east, 180 = south)
+    azimuth = np.arctan2(np.sin(omega), np.cos(omega) * np.sin(phi) - np.tan(decl) * np.cos(phi)) + np.pi
+    elevation.flags.writeable = False
+    azimuth.flags.writeable = False
+    return elevation, azimuth
+
+# ---- Plane-of-array irradiance ----
+def typical_poa(azimuth_deg, tilt_deg, latitude: float = DEFAULT_LATITUDE) -> np.ndarray:
+    # Meinel beam plus isotropic diffuse, W/m² on each plane. The diffuse share
+    # puts annual plane ratios near typical all-sky values (E/W 30° ≈ 0.82 of
+    # south, flat ≈ 0.89). azimuth_deg/tilt_deg are (P,) arrays of planes; the
+    # result is (P, 8760).
+    elevation, sun_az = sun_position(float(latitude))
+    up = elevation > 0
+    sin_el = np.where(up, np.sin(elevation), 1.0)
+    air_mass = 1.0 / sin_el
+    dni = np.where(up, SOLAR_CONSTANT * 0.7 ** (air_mass ** 0.678), 0.0)
+    dhi = DIFFUSE_SHARE * dni * sin_el
+    az = np.radians(np.atleast_1d(np.asarray(azimuth_deg, dtype=float)))[:, None]
+    beta = np.radians(np.atleast_1d(np.asarray(tilt_deg, dtype=float)))[:, None]
+    cos_inc = np.sin(elevation) * np.cos(beta) + np.cos(elevation) * np.sin(beta) * np.cos(sun_az - az)
+    return dni * np.maximum(cos_inc, 0.0) + dhi * (1 + np.cos(beta)) / 2
+
+# ---- Hourly PV by location ----
+# Clear-sky (Haurwitz GHI, Erbs split into beam and diffuse) or weather-file
+# irradiance on each site's plane, cell temperature, DC output and inverter
+# clipping, for many sites at once. Hours are local standard time of a
+# non-leap year (EPW order), each evaluated at its midpoint. The sun vector of
+# every site is a linear mix of three per-hour terms, so the angle of
+# incidence for a whole chunk of sites is one (sites × 3) @ (3 × 8760) product
+# and only the clear-sky exponent needs a transcendental per hour and site.
+# Clear-sky output is a cloudless upper envelope; pass weather=read_epw(...)
+# for a typical year.
+HOURS_PER_YEAR = 8760
+ALBEDO = 0.2
+NOCT_C = 45.0                # nominal operating cell temperature
+TEMP_COEFF_P = -0.0035       # power temperature coefficient, 1/°C
+DC_LOSSES = 0.14             # soiling, wiring, mismatch, LID
+INVERTER_EFFICIENCY = 0.96
+DEFAULT_AIR_TEMP_C = 12.0    # clear-sky runs without a weather file
+CHUNK_SITES = 256
+
+@lru_cache(maxsize=4)
+def _hour_terms():
+    # (3, 8760) float32: sin δ, cos δ·cos ω0, cos δ·sin ω0 with ω0 the hour angle at 15°E
+    # incl. the equation of time; plus day of year and the extraterrestrial normal irradiance
+    hours = np.arange(HOURS_PER_YEAR)
+    day = hours // 24 + 1
+    decl = np.radians(23.45) * np.sin(2 * np.pi * (284 + day) / 365.0)
+    b = 2 * np.pi * (day - 1) / 365.0
+    eot_min = 229.18 * (0.000075 + 0.001868 * np.cos(b) - 0.032077 * np.sin(b)
+                        - 0.014615 * np.cos(2 * b) - 0.040849 * np.sin(2 * b))
+    omega0 = np.radians(15.0 * (hours % 24 + 0.5 - 12.0) + eot_min / 4.0)
+    terms = np.array([np.sin(decl), np.cos(decl) * np.cos(omega0), np.cos(decl) * np.sin(omega0)], dtype=np.float32)
+    extra = (SOLAR_CONSTANT * (1 + 0.033 * np.cos(2 * np.pi * day / 365.0))).astype(np.float32)
+    terms.flags.writeable = False
+    extra.flags.writeable = False
+    return terms, extra
+
+def _site_weights(latitude, longitude, tz_hours, azimuth_deg, tilt_deg):
+    # (S, 3) weights giving sin(elevation) and cos(incidence) from the hour terms
+    phi, beta, az = np.radians(latitude), np.radians(tilt_deg), np.radians(azimuth_deg)
+    delta = np.radians(longitude - 15.0 * tz_hours)   # hour-angle shift from the zone's meridian
+    sp, cp, sd, cd = np.sin(phi), np.cos(phi), np.sin(delta), np.cos(delta)
+    up = np.stack([sp, cp * cd, -cp * sd], axis=1)
+    east = np.stack([np.zeros_like(sp), -sd, -cd], axis=1)
+    north = np.stack([cp, -sp * cd, sp * sd], axis=1)
+    plane = (np.cos(beta)[:, None] * up + (np.sin(beta) * np.sin(az))[:, None] * east
+             + (np.sin(beta) * np.cos(az))[:, None] * north)
+    return up.astype(np.float32), plane.astype(np.float32)
+
+def _erbs(kt):
+    # Diffuse fraction of global horizontal irradiance from the clearness index
+    # (the polynomial meets the flat 0.165 branch at kt = 0.8, so clamping kt covers it)
+    k = np.minimum(kt, np.float32(0.8))
+    kd = k * np.float32(12.336)
+    for c in (-16.638, 4.388, -0.1604):
+        kd += np.float32(c)
+        kd *= k
+    kd += np.float32(0.9511)
+    low = kt <= 0.22
+    kd[low] = 1.0 - 0.09 * kt[low]
+    return kd
+
+def clear_sky(sin_el, extra):
+    # (GHI, DNI, DHI) in W/m² for sin(elevation) arrays (…, 8760); only daylight hours are evaluated
+    sin_el = np.asarray(sin_el, dtype=np.float32)
+    day = sin_el > 0
+    up = sin_el[day]
+    normal = np.exp(np.float32(-0.057) / up)   # Haurwitz GHI / sin(elevation)
+    normal *= np.float32(1098.0)
+    kd = _erbs(normal / np.broadcast_to(extra, sin_el.shape)[day])
+    ghi, dni, dhi = (np.zeros(sin_el.shape, dtype=np.float32) for _ in range(3))
+    ghi[day] = normal * up
+    dni[day] = normal * (1.0 - kd)
+    dhi[day] = kd * ghi[day]
+    return ghi, dni, dhi
+
+def read_epw(path: str) -> dict:
+    # Location and hourly GHI/DNI/DHI (W/m²) and air temperature (°C) of an EnergyPlus weather file
+    with open(path, encoding="utf-8", errors="replace") as f:
+        location = f.readline().split(",")
+    data = np.loadtxt(path, delimiter=",", skiprows=8, usecols=(1, 2, 6, 13, 14, 15), dtype=float)
+    month, day = data[:, 0].astype(int), data[:, 1].astype(int)
+    data = data[~((month == 2) & (day == 29))]   # a leap-year file keeps 8760 hours
+    if len(data) != HOURS_PER_YEAR:
+        raise ValueError(f"{path}: expected {HOURS_PER_YEAR} hourly rows, found {len(data)}")
+    return {
+        "latitude": float(location[6]), "longitude": float(location[7]), "tz_hours": float(location[8]),
+        "temp_air": data[:, 2].astype(np.float32), "ghi": data[:, 3].astype(np.float32),
+        "dni": data[:, 4].astype(np.float32), "dhi": data[:, 5].astype(np.float32),
+    }
+
+def _chunk(dc_kw, ac_kw, latitude, longitude, tz_hours, azimuth_deg, tilt_deg, weather, air_temp_c):
+    terms, extra = _hour_terms()
+    up_w, plane_w = _site_weights(latitude, longitude, tz_hours, azimuth_deg, tilt_deg)
+    sin_el = up_w @ terms
+    cos_inc = np.maximum(plane_w @ terms, 0.0)
+    cos_inc[sin_el <= 0] = 0.0
+    if weather is None:
+        ghi, dni, dhi = clear_sky(sin_el, extra)
+        temp_air = np.float32(air_temp_c)
+    else:
+        ghi, dni, dhi, temp_air = weather["ghi"], weather["dni"], weather["dhi"], weather["temp_air"]
+    cos_beta = np.cos(np.radians(tilt_deg)).astype(np.float32)[:, None]
+    poa = dni * cos_inc
+    poa += dhi * ((1 + cos_beta) / 2)
+    poa += ghi * (ALBEDO * (1 - cos_beta) / 2)
+    # Power factor from the cell temperature, 1 + γ (T_air + k·POA − 25), then DC kW (= kWh per hour)
+    dc = poa * np.float32(TEMP_COEFF_P * (NOCT_C - 20.0) / 800.0)
+    dc += 1.0 + TEMP_COEFF_P * (temp_air - 25.0)
+    dc *= poa
+    dc *= (dc_kw * (1.0 - DC_LOSSES) / 1000.0).astype(np.float32)[:, None]
+    ac_raw = dc * np.float32(INVERTER_EFFICIENCY)
+    ac = np.minimum(ac_raw, ac_kw.astype(np.float32)[:, None])
+    return poa, dc, ac_raw, ac
+
+def pv_generation(dc_kw, azimuth_deg=180.0, tilt_deg=30.0, latitude=None, longitude=None, tz_hours=None,
+                  ac_kw=None, system_key: str = None, weather: dict = None, air_temp_c: float = DEFAULT_AIR_TEMP_C,
+                  hourly: bool = False, chunk_sites: int = CHUNK_SITES) -> dict:
+    # Year of PV output per site. Array arguments broadcast to (S,). Location
+    # comes from the weather file when one is given; tz_hours defaults to the
+    # zone of the longitude. AC is clipped at ac_kw, or at the inverter that
+    # pick_inverter chooses for system_key, or not at all. hourly=True adds the
+    # (S, 8760) float32 AC series in kWh.
+    if weather is not None:
+        latitude = weather["latitude"] if latitude is None else latitude
+        longitude = weather["longitude"] if longitude is None else longitude
+        tz_hours = weather["tz_hours"] if tz_hours is None else tz_hours
+    latitude = DEFAULT_LATITUDE if latitude is None else latitude
+    longitude = 15.0 if longitude is None else longitude
+    if tz_hours is None:
+        tz_hours = np.round(np.asarray(longitude, dtype=float) / 15.0)
+    dc_kw, azimuth_deg, tilt_deg, latitude, longitude, tz_hours = (
+        np.ravel(a).astype(float) for a in np.broadcast_arrays(dc_kw, azimuth_deg, tilt_deg, latitude, longitude,
+                                                               tz_hours))
+    n = len(dc_kw)
+    if ac_kw is None and system_key is not None:
+        from .batch import pick_inverters
+        from .systems import SYSTEMS
+        SYS = SYSTEMS[system_key]
+        ac_kw = pick_inverters(dc_kw, SYS["inverter_ac_sizes"], SYS["models"], SYS["max_dc_ac_ratio"])["ac_kw"]
+    ac_kw = np.broadcast_to(np.inf if ac_kw is None else np.asarray(ac_kw, dtype=float), (n,))
+
+    out = {name: np.empty(n) for name in ("annual_poa_kwh_m2", "annual_dc_kwh", "annual_ac_kwh", "clipped_kwh",
+                                          "peak_ac_kw")}
+    series = np.empty((n, HOURS_PER_YEAR), dtype=np.float32) if hourly else None
+    for start in range(0, n, chunk_sites):
+        s = slice(start, min(start + chunk_sites, n))
+        poa, dc, ac_raw, ac = _chunk(dc_kw[s], ac_kw[s], latitude[s], longitude[s], tz_hours[s], azimuth_deg[s],
+                                     tilt_deg[s], weather, air_temp_c)
+        out["annual_poa_kwh_m2"][s] = poa.sum(axis=1, dtype=np.float64) / 1000.0
+        out["annual_dc_kwh"][s] = dc.sum(axis=1, dtype=np.float64)
+        out["annual_ac_kwh"][s] = ac.sum(axis=1, dtype=np.float64)
+        out["clipped_kwh"][s] = ac_raw.sum(axis=1, dtype=np.float64) - out["annual_ac_kwh"][s]
+        out["peak_ac_kw"][s] = ac.max(axis=1)
+        if hourly:
+            series[s] = ac
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["specific_yield"] = np.where(dc_kw > 0, out["annual_ac_kwh"] / dc_kw, 0.0)
+    out["ac_kw"] = np.asarray(ac_kw, dtype=float).copy()
+    if hourly:
+        out["hourly_ac_kwh"] = series
+    return out
+
+def main(argv=None):
+    import argparse
+    import json
+    ap = argparse.ArgumentParser(description="Hourly PV output of one plane from clear-sky or EPW weather")
+    ap.add_argument("--dc-kw", type=float, required=True)
+    ap.add_argument("--azimuth", type=float, default=180.0, help="degrees clockwise from north")
+    ap.add_argument("--tilt", type=float, default=30.0)
+    ap.add_argument("--lat", type=float, default=None)
+    ap.add_argument("--lon", type=float, default=None)
+    ap.add_argument("--tz", type=float, default=None, help="UTC offset of local standard time, hours")
+    ap.add_argument("--epw", help="EnergyPlus weather file; clear sky when omitted")
+    ap.add_argument("--system", help="clip at the inverter picked for this system")
+    ap.add_argument("--ac-kw", type=float, default=None, help="clip at this AC rating instead")
+    ap.add_argument("--out", help="write the 8760 hourly AC kWh values to this CSV")
+    args = ap.parse_args(argv)
+    res = pv_generation(args.dc_kw, args.azimuth, args.tilt, args.lat, args.lon, args.tz, args.ac_kw, args.system,
+                        read_epw(args.epw) if args.epw else None, hourly=bool(args.out))
+    if args.out:
+        np.savetxt(args.out, res.pop("hourly_ac_kwh")[0], fmt="%.4f", header="ac_kwh", comments="")
+    print(json.dumps({k: round(float(v[0]), 3) for k, v in res.items()}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# stages.py
+from .sizing import (DEFAULT_YIELD_PER_KWP_YR, DEFAULT_RTE, DEFAULT_DOD, orientation_tilt_factor,
+                     estimate_battery_need_components, apply_system_factors)
+from .systems import CATALOG
+from .timing import span
+
+# Incremental sizing. The chain of size_system/size_roof is split into stages
+# that name the parameters or upstream stages they read. A Graph remembers the
+# inputs and output of every stage from its previous run and recomputes a stage
+# only when one of those inputs changed; a recomputed stage that yields an
+# equal value leaves its dependents untouched. A Graph holds state, so keep one
+# per session (e.g. in st.session_state); the slow roof PV stage also goes
+# through the shared result cache, so other sessions reuse its output.
+SIZING_DEFAULTS = {"region_yield": DEFAULT_YIELD_PER_KWP_YR, "rte": DEFAULT_RTE, "dod": DEFAULT_DOD, "module": None}
+
+class Stage:
+    def __init__(self, name: str, fn, deps: tuple):
+        self.name, self.fn, self.deps = name, fn, tuple(deps)
+
+def _same(a, b) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):   # arrays compare elementwise; a new array counts as changed
+        return False
+
+class Graph:
+    def __init__(self, stages: list, defaults: dict = None):
+        # Stages must be listed so that every stage comes after the stages it reads
+        self.stages = list(stages)
+        self.defaults = dict(defaults or {})
+        seen, names = set(), {s.name for s in self.stages}
+        for stage in self.stages:
+            late = [d for d in stage.deps if d in names and d not in seen]
+            if late:
+                raise ValueError(f"Stage '{stage.name}' is listed before its inputs {late}")
+            seen.add(stage.name)
+        self._memo = {}
+        self.recomputed = []
+
+    def run(self, **params) -> dict:
+        values = {**self.defaults, **params}
+        self.recomputed = []
+        for stage in self.stages:
+            try:
+                args = tuple(values[d] for d in stage.deps)
+            except KeyError as e:
+                raise TypeError(f"Stage '{stage.name}' is missing input {e}") from None
+            memo = self._memo.get(stage.name)
+            if memo is not None and all(map(_same, memo[0], args)):
+                values[stage.name] = memo[1]
+                continue
+            with span(f"stage.{stage.name}"):
+                out = stage.fn(*args)
+            self._memo[stage.name] = (args, out)
+            values[stage.name] = out
+            self.recomputed.append(stage.name)
+        return values
+
+    def invalidate(self):
+        self._memo.clear()
+
+# ---- Sizing stages ----
+def _inverter(system_key, dc_kw, total_modules, module):
+    return CATALOG[system_key].pick_inverter(dc_kw, total_modules, module)
+
+def _roof_inverter(system_key, dc_kw, planes, module):
+    return CATALOG[system_key].pick_inverter(dc_kw, [int(p[0]) for p in planes], module)
+
+def _factors(components, rte, dod):
+    return apply_system_factors(components["shiftable"], components["backup_energy"], rte, dod)
+
+def _battery(system_key, factors):
+    return CATALOG[system_key].pick_battery(factors[0])
+
+def _roof_pv(planes, module_wp, region_yield):
+    import numpy as np
+    from .cache import cached_roof_profile
+    return np.asarray(cached_roof_profile(planes, module_wp, region_yield))
+
+def _roof_load(annual_kwh, day_fraction):
+    from .simulation import hourly_load_profile
+    return hourly_load_profile(annual_kwh, day_fraction)
+
+def _roof_components(pv, load, day_fraction, backup_kw, backup_hours):
+    from .roof import hourly_components
+    return hourly_components(pv, load, day_fraction, backup_kw, backup_hours)
+
+_TAIL = [
+    Stage("factors", _factors, ("components", "rte", "dod")),
+    Stage("battery", _battery, ("system_key", "factors")),
+]
+
+# Same chain as sizing.size_system
+SYSTEM_STAGES = [
+    Stage("dc_kw", lambda total_modules, module_wp: (total_modules * module_wp) / 1000.0,
+          ("total_modules", "module_wp")),
+    Stage("specific_yield", lambda region_yield, orientation, tilt:
+          region_yield * orientation_tilt_factor(orientation, tilt), ("region_yield", "orientation", "tilt")),
+    Stage("components", estimate_battery_need_components,
+          ("annual_kwh", "dc_kw", "specific_yield", "day_fraction", "backup_kw", "backup_hours")),
+    Stage("inverter", _inverter, ("system_key", "dc_kw", "total_modules", "module")),
+] + _TAIL
+
+# Same chain as roof.size_roof
+ROOF_STAGES = [
+    Stage("pv", _roof_pv, ("planes", "module_wp", "region_yield")),
+    Stage("dc_kw", lambda planes, module_wp: sum(p[0] for p in planes) * module_wp / 1000.0, ("planes", "module_wp")),
+    Stage("specific_yield", lambda pv, dc_kw: float(pv.sum() / dc_kw) if dc_kw > 0 else 0.0, ("pv", "dc_kw")),
+    Stage("load", _roof_load, ("annual_kwh", "day_fraction")),
+    Stage("components", _roof_components, ("pv", "load", "day_fraction", "backup_kw", "backup_hours")),
+    Stage("inverter", _roof_inverter, ("system_key", "dc_kw", "planes", "module")),
+] + _TAIL
+
+def sizing_result(values: dict) -> dict:
+    # Graph output in the shape returned by size_system
+    (usable_needed, nominal_needed), (rec_kwh, rec_label) = values["factors"], values["battery"]
+    return {
+        "dc_kw": values["dc_kw"], "specific_yield": values["specific_yield"], "inverter": values["inverter"],
+        "components": values["components"], "usable_needed": usable_needed, "nominal_needed": nominal_needed,
+        "battery_kwh": rec_kwh, "battery_label": rec_label,
+    }
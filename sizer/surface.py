@@ -0,0 +1,190 @@
+# surface.py
+import argparse
+import hashlib
+import os
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+from .profiles import DATA_DIR
+from .simulation import hourly_pv_profile, hourly_load_profile, simulate_battery
+from .sizing import DEFAULT_RTE, DEFAULT_DOD
+
+# Precomputed response surface of the hourly simulation. With the synthetic
+# PV and day/night load curves the dispatch is scale-free: every share and
+# cycle count depends only on
+#   r = annual PV / annual load, d = day fraction, b = usable kWh / daily load.
+# One table over (r, d, b) therefore serves every system and battery option;
+# a system's options are just points on the b axis. Lookups are trilinear.
+# Every served output (shares, energies and cycles) is checked against the
+# live model: the build step evaluates the centre of each grid cell (and each
+# b node at the centre of its r/d cell, where options such as "no battery"
+# land) and only those within TOLERANCE/2 are served, then random off-grid
+# points in served cells give the stored worst error. Shares are compared
+# absolutely, energies and cycles relatively (see ERROR_FLOORS). lookup()
+# returns None (the caller computes live) outside the grid or served cells,
+# for other RTE/DoD, for a stale model, or when that worst error exceeds
+# TOLERANCE. The table ships as
+# data/surface.npz; `python -m sizer.surface` rebuilds it after a change to the
+# simulation. SIZER_SURFACE points at a table kept elsewhere.
+SURFACE_FILE = os.environ.get("SIZER_SURFACE") or os.path.join(DATA_DIR, "surface.npz")
+# Denser where the curves bend: small PV ratios and the first kWh of storage
+R_AXIS = np.round(np.concatenate([np.arange(0.1, 1.0, 0.025), np.arange(1.0, 4.0001, 0.1)]), 6)
+D_AXIS = np.round(np.arange(0.2, 0.8001, 0.05), 6)
+B_AXIS = np.round(np.concatenate([np.arange(0.0, 1.0, 0.05), np.arange(1.0, 4.0001, 0.1)]), 6)
+# Energies per kWh of annual load; cycles follow from the discharged energy
+METRICS = ("self_consumption", "autarky", "discharged", "grid_import", "export")
+# Error = |approx - live| / max(|live|, floor): shares absolutely, energies (per
+# kWh of annual load) and cycles relatively, down to the floor
+ERROR_FLOORS = {"self_consumption": 1.0, "autarky": 1.0, "discharged": 0.05, "grid_import": 0.05,
+                "export": 0.05, "cycles": 10.0}
+TOLERANCE = 0.02
+
+@lru_cache(maxsize=1)
+def model_hash() -> str:
+    # Fingerprint of the curves the table was built from
+    h = hashlib.sha256(hourly_pv_profile(1.0, 1.0).tobytes())
+    h.update(hourly_load_profile(365.0, 0.5).tobytes())
+    return h.hexdigest()[:16]
+
+def _simulate(r: float, d: float, b, rte: float, dod: float) -> np.ndarray:
+    # Live model at daily load 1 kWh, metrics × options; energies per kWh of annual load
+    pv, load = hourly_pv_profile(1.0, r * 365.0), hourly_load_profile(365.0, d)
+    res = simulate_battery(pv, load, b, rte, dod)
+    n = len(res["capacity_kwh"])
+    return np.array([np.broadcast_to(res["self_consumption"], n), np.broadcast_to(res["autarky"], n),
+                     res["discharged_kwh"] / 365.0, res["grid_import_kwh"] / 365.0, res["export_kwh"] / 365.0])
+
+def _errors(live: np.ndarray, approx: np.ndarray, b, dod: float) -> np.ndarray:
+    # Worst error per option over every served output, cycles included
+    b = np.asarray(b, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cycles = lambda m: np.where(b > 0, m[2] * 365.0 / (b * dod), 0.0)
+        floors = np.array([ERROR_FLOORS[m] for m in METRICS])[:, None]
+        err = np.abs(approx - live) / np.maximum(np.abs(live), floors)
+        err_cycles = np.abs(cycles(approx) - cycles(live)) / np.maximum(cycles(live), ERROR_FLOORS["cycles"])
+    return np.maximum(err.max(axis=0), err_cycles)
+
+# ---- Build ----
+def build_surface(rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD, checks: int = 200, seed: int = 0,
+                  progress=None) -> dict:
+    table = np.empty((len(METRICS), len(R_AXIS), len(D_AXIS), len(B_AXIS)), dtype=np.float32)
+    for i, r in enumerate(R_AXIS):
+        for j, d in enumerate(D_AXIS):
+            table[:, i, j, :] = _simulate(r, d, B_AXIS, rte, dod)
+        if progress: progress(i + 1, 2 * len(R_AXIS) - 1)
+    # Error at the centre of every cell and at the b nodes; above TOLERANCE/2 the live model answers
+    cell_error = np.empty((len(R_AXIS) - 1, len(D_AXIS) - 1, len(B_AXIS) - 1), dtype=np.float32)
+    node_error = np.empty((len(R_AXIS) - 1, len(D_AXIS) - 1, len(B_AXIS)), dtype=np.float32)
+    b = np.concatenate([(B_AXIS[:-1] + B_AXIS[1:]) / 2, B_AXIS])
+    for i in range(len(R_AXIS) - 1):
+        r = (R_AXIS[i] + R_AXIS[i + 1]) / 2
+        for j in range(len(D_AXIS) - 1):
+            d = (D_AXIS[j] + D_AXIS[j + 1]) / 2
+            err = _errors(_simulate(r, d, b, rte, dod), _interpolate(table, r, d, b), b, dod)
+            cell_error[i, j], node_error[i, j] = err[:len(B_AXIS) - 1], err[len(B_AXIS) - 1:]
+        if progress: progress(len(R_AXIS) + i + 1, 2 * len(R_AXIS) - 1)
+    surface = {"table": table, "cell_error": cell_error, "node_error": node_error, "rte": rte, "dod": dod,
+               "model": model_hash(), "max_error": 0.0}
+    # Random off-grid points in served cells confirm that the cell centres are representative
+    rng = np.random.default_rng(seed)
+    worst = 0.0
+    for _ in range(checks):
+        r, d = rng.uniform(R_AXIS[0], R_AXIS[-1]), rng.uniform(D_AXIS[0], D_AXIS[-1])
+        b = rng.uniform(B_AXIS[0], B_AXIS[-1], 4)
+        served = _served(surface, r, d, b)
+        if served.any():
+            err = _errors(_simulate(r, d, b, rte, dod), _interpolate(table, r, d, b), b, dod)
+            worst = max(worst, float(err[served].max()))
+    surface["max_error"] = worst
+    surface["served"] = float((cell_error <= TOLERANCE / 2).mean())   # share of cells, for the build report
+    return surface
+
+def save_surface(surface: dict, path: str = SURFACE_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp, **surface)
+    os.replace(tmp, path)
+
+@lru_cache(maxsize=1)
+def load_surface(path: str = SURFACE_FILE):
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as f:
+        surface = {k: f[k] for k in f.files}
+    if surface["table"].shape != (len(METRICS), len(R_AXIS), len(D_AXIS), len(B_AXIS)) \
+            or "node_error" not in surface:
+        return None
+    return surface
+
+# ---- Lookup ----
+def _weights(axis: np.ndarray, x):
+    i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+    return i, (np.asarray(x, dtype=float) - axis[i]) / (axis[i + 1] - axis[i])
+
+def _served(surface: dict, r: float, d: float, b) -> np.ndarray:
+    # Per b value, whether its grid cell (or the b node it sits on) passed the build check
+    i, j = _weights(R_AXIS, r)[0], _weights(D_AXIS, d)[0]
+    k, fb = _weights(B_AXIS, b)
+    on_node = np.isclose(fb, 0.0) | np.isclose(fb, 1.0)
+    node = np.where(np.isclose(fb, 1.0), k + 1, k)
+    err = np.where(on_node, surface["node_error"][i, j, node], surface["cell_error"][i, j, k])
+    return err <= TOLERANCE / 2
+
+def _interpolate(table: np.ndarray, r: float, d: float, b) -> np.ndarray:
+    (i, fr), (j, fd), (k, fb) = _weights(R_AXIS, r), _weights(D_AXIS, d), _weights(B_AXIS, b)
+    out = 0.0
+    for di, wr in ((0, 1 - fr), (1, fr)):
+        for dj, wd in ((0, 1 - fd), (1, fd)):
+            for dk, wb in ((0, 1 - fb), (1, fb)):
+                out = out + wr * wd * wb * table[:, i + di, j + dj, k + dk]
+    return out
+
+def lookup(SYS: dict, dc_kw: float, specific_yield: float, annual_kwh: float, day_fraction: float,
+           rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD) -> dict:
+    # Same result as simulation.simulate_system on the synthetic curves, or None
+    surface = load_surface()
+    if surface is None or annual_kwh <= 0:
+        return None
+    if not (np.isclose(surface["rte"], rte) and np.isclose(surface["dod"], dod)) \
+            or str(surface["model"]) != model_hash() or float(surface["max_error"]) > TOLERANCE:
+        return None
+    daily = annual_kwh / 365.0
+    r = dc_kw * specific_yield / annual_kwh
+    options = np.array([0.0] + list(SYS["battery_options_kwh"]), dtype=float)
+    b = options / daily
+    if not (R_AXIS[0] <= r <= R_AXIS[-1] and D_AXIS[0] <= day_fraction <= D_AXIS[-1] and b.max() <= B_AXIS[-1]) \
+            or not _served(surface, r, day_fraction, b).all():
+        return None
+    m = dict(zip(METRICS, _interpolate(surface["table"], r, day_fraction, b)))
+    discharged = m["discharged"] * annual_kwh
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cycles = np.where(options > 0, discharged / (options * dod), 0.0)
+    return {
+        "capacity_kwh": options, "self_consumption": m["self_consumption"], "autarky": m["autarky"],
+        "cycles": cycles, "grid_import_kwh": m["grid_import"] * annual_kwh,
+        "export_kwh": m["export"] * annual_kwh, "discharged_kwh": discharged,
+        "label": [""] + [SYS["battery_labels"][i] if i < len(SYS["battery_labels"]) else f"{o:.1f} kWh"
+                         for i, o in enumerate(SYS["battery_options_kwh"])],
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the precomputed hourly-simulation response surface")
+    ap.add_argument("out", nargs="?", default=SURFACE_FILE)
+    ap.add_argument("--rte", type=float, default=DEFAULT_RTE)
+    ap.add_argument("--dod", type=float, default=DEFAULT_DOD)
+    args = ap.parse_args(argv)
+    started = time.perf_counter()
+
+    def report(done: int, total: int):
+        print(f"\r{done}/{total} PV-ratio slices", end="" if done < total else "\n", file=sys.stderr, flush=True)
+
+    surface = build_surface(args.rte, args.dod, progress=report)
+    save_surface(surface, args.out)
+    print(f"wrote {args.out} in {time.perf_counter() - started:.0f}s, "
+          f"{surface['served']:.0%} of cells served, max interpolation error {surface['max_error']:.4f}",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# sweep.py
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from .batch import size_batch
+from .sizing import LOAD_PROFILES
+from .systems import SYSTEMS
+
+# Grid axes in output order; the flat point index enumerates them row-major,
+# so the same spec always produces the same file.
+AXES = ("system", "total_modules", "module_wp", "annual_kwh", "profile", "tilt", "orientation")
+AXIS_DEFAULTS = {
+    "system": list(SYSTEMS.keys()),
+    "module_wp": [430],
+    "profile": [k for k, v in LOAD_PROFILES.items() if v is not None],
+    "tilt": [30],
+    "orientation": ["south"],
+}
+RESULT_COLUMNS = ("dc_kw", "specific_yield", "inverter_model", "dc_ac_ratio", "within_cap", "layout_ok",
+                  "shiftable", "usable_needed", "nominal_needed", "battery_kwh", "battery_label")
+
+# ---- Grid spec ----
+def _axis_values(spec: dict, name: str) -> list:
+    values = spec.get(name, AXIS_DEFAULTS.get(name))
+    if values is None:
+        raise ValueError(f"Grid spec is missing axis '{name}'")
+    if isinstance(values, dict):   # {"start": .., "stop": .., "step": ..}, stop inclusive
+        start, stop, step = values["start"], values["stop"], values["step"]
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            values = list(range(start, stop + 1, step))
+        else:
+            values = np.arange(start, stop + step / 2, step).round(9).tolist()
+    if not values:
+        raise ValueError(f"Grid axis '{name}' is empty")
+    return list(values)
+
+def expand_grid(spec: dict) -> dict:
+    axes = {name: _axis_values(spec, name) for name in AXES}
+    unknown = [s for s in axes["system"] if s not in SYSTEMS]
+    if unknown:
+        raise ValueError(f"Unknown systems in grid spec: {unknown}")
+    bad = [p for p in axes["profile"] if LOAD_PROFILES.get(p) is None]
+    if bad:
+        raise ValueError(f"Profiles without a fixed day fraction cannot be swept: {bad}")
+    return axes
+
+def grid_size(axes: dict) -> int:
+    return int(np.prod([len(axes[name]) for name in AXES], dtype=np.int64))
+
+# ---- Worker side ----
+_AXES = None
+
+def _init_worker(axes: dict):
+    global _AXES
+    _AXES = {name: np.asarray(values) for name, values in axes.items()}
+
+def _run_chunk(start: int, stop: int) -> str:
+    shape = tuple(len(_AXES[name]) for name in AXES)
+    idx = dict(zip(AXES, np.unravel_index(np.arange(start, stop), shape)))
+    col = {name: _AXES[name][idx[name]] for name in AXES}
+    day_fraction = np.array([LOAD_PROFILES[p] for p in _AXES["profile"]], dtype=float)[idx["profile"]]
+    res = size_batch(col["total_modules"], col["module_wp"], col["annual_kwh"], col["tilt"],
+                     col["orientation"], day_fraction, system_key=col["system"])
+    out = [col[name].tolist() for name in AXES]
+    for name in RESULT_COLUMNS:
+        values = res[name]
+        out.append(np.round(values, 4).tolist() if values.dtype.kind == "f" else values.tolist())
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(zip(*out))
+    return buf.getvalue()
+
+# ---- Driver ----
+def run_sweep(spec: dict, out_path: str, workers: int = None, chunk_size: int = 50_000, progress=None) -> int:
+    axes = expand_grid(spec)
+    total = grid_size(axes)
+    workers = workers or os.cpu_count() or 1
+    chunks = ((s, min(s + chunk_size, total)) for s in range(0, total, chunk_size))
+    done = 0
+    with open(out_path, "w", newline="") as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(axes,)) as pool:
+        f.write(",".join(AXES + RESULT_COLUMNS) + "\n")
+        # Keep a bounded window of chunks in flight and write them back in
+        # submission order: ordering stays deterministic, memory stays flat.
+        pending = deque()
+        for start, stop in chunks:
+            pending.append((stop - start, pool.submit(_run_chunk, start, stop)))
+            if len(pending) >= 2 * workers:
+                n, fut = pending.popleft()
+                f.write(fut.result())
+                done += n
+                if progress: progress(done, total)
+        while pending:
+            n, fut = pending.popleft()
+            f.write(fut.result())
+            done += n
+            if progress: progress(done, total)
+    return total
+
+def _print_progress(started: float):
+    def report(done: int, total: int):
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        print(f"\r{done:,}/{total:,} points ({done / total:.0%}) — {rate:,.0f} pts/s — ETA {eta:.0f}s",
+              end="" if done < total else "\n", file=sys.stderr, flush=True)
+    return report
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parameter sweep of the battery sizer across SYSTEMS")
+    ap.add_argument("spec", help="JSON grid spec: lists (or start/stop/step objects) per axis")
+    ap.add_argument("out", help="output CSV path")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk-size", type=int, default=50_000)
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args(argv)
+    with open(args.spec, encoding="utf-8") as f:
+        spec = json.load(f)
+    progress = None if args.quiet else _print_progress(time.perf_counter())
+    run_sweep(spec, args.out, args.workers, args.chunk_size, progress)
+
+if __name__ == "__main__":
+    main()
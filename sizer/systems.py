@@ -0,0 +1,10 @@
+# systems.py
+import os
+from .catalog import load_catalog
+
+# The product catalog lives in data/systems.json. SIZER_CATALOG may point at
+# other catalog files or directories (os.pathsep-separated) and SIZER_REGION
+# selects a regional variant.
+_paths = os.environ.get("SIZER_CATALOG")
+CATALOG = load_catalog(_paths.split(os.pathsep) if _paths else None, os.environ.get("SIZER_REGION") or None)
+SYSTEMS = CATALOG.legacy()
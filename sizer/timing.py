@@ -0,0 +1,138 @@
+# timing.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Named timing spans around pipeline stages. Off by default: span() then hands
+# back one shared no-op context manager, so instrumented code pays a function
+# call and nothing else. SIZER_TRACE=1 (or enable()) turns recording on;
+# SIZER_TRACE_FILE picks the export written by flush() (.prom for Prometheus
+# text format, anything else JSON). SIZER_PROFILE_DIR enables one cProfile
+# dump per profiled run.
+_enabled = os.environ.get("SIZER_TRACE", "") not in ("", "0")
+_NULL = nullcontext()
+_stats = {}   # name -> [calls, total_ns, max_ns]
+_lock = threading.Lock()
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+def is_enabled() -> bool:
+    return _enabled
+
+def _record(name: str, dt: int):
+    with _lock:
+        rec = _stats.get(name)
+        if rec is None:
+            _stats[name] = [1, dt, dt]
+        else:
+            rec[0] += 1
+            rec[1] += dt
+            if dt > rec[2]: rec[2] = dt
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, time.perf_counter_ns() - self.t0)
+        return False
+
+def span(name: str):
+    return _Span(name) if _enabled else _NULL
+
+# Stopwatch for straight-line scripts such as app.py, where wrapping every
+# stage in a with-block is impractical: lap(name) books the time since the
+# previous lap under that span name.
+class _Laps:
+    __slots__ = ("last",)
+
+    def __init__(self):
+        self.last = time.perf_counter_ns()
+
+    def lap(self, name: str):
+        now = time.perf_counter_ns()
+        _record(name, now - self.last)
+        self.last = now
+
+class _NullLaps:
+    __slots__ = ()
+
+    def lap(self, name: str):
+        pass
+
+_NULL_LAPS = _NullLaps()
+
+def laps():
+    return _Laps() if _enabled else _NULL_LAPS
+
+# ---- Reporting ----
+def stats() -> dict:
+    with _lock:
+        return {name: {"calls": c, "total_ms": t / 1e6, "mean_ms": t / c / 1e6, "max_ms": m / 1e6}
+                for name, (c, t, m) in _stats.items()}
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def prometheus_text() -> str:
+    lines = ["# TYPE sizer_span_calls_total counter",
+             "# TYPE sizer_span_seconds_total counter",
+             "# TYPE sizer_span_seconds_max gauge"]
+    for name, s in sorted(stats().items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'sizer_span_calls_total{{span="{label}"}} {s["calls"]}')
+        lines.append(f'sizer_span_seconds_total{{span="{label}"}} {s["total_ms"] / 1e3:.9f}')
+        lines.append(f'sizer_span_seconds_max{{span="{label}"}} {s["max_ms"] / 1e3:.9f}')
+    return "\n".join(lines) + "\n"
+
+def export(path: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        if path.endswith(".prom"):
+            f.write(prometheus_text())
+        else:
+            json.dump({"generated": time.time(), "pid": os.getpid(), "spans": stats()}, f, indent=2)
+    os.replace(tmp, path)
+
+def flush():
+    path = os.environ.get("SIZER_TRACE_FILE")
+    if _enabled and path:
+        export(path)
+
+# ---- Profiling ----
+def start_profile():
+    if not os.environ.get("SIZER_PROFILE_DIR"):
+        return None
+    import cProfile
+    prof = cProfile.Profile()
+    prof.enable()
+    return prof
+
+def stop_profile(prof, label: str = "run"):
+    if prof is None:
+        return None
+    prof.disable()
+    out_dir = os.environ["SIZER_PROFILE_DIR"]
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{label}-{os.getpid()}-{time.time_ns()}.prof")
+    prof.dump_stats(path)
+    return path
+
+@contextmanager
+def profile_run(label: str = "run"):
+    prof = start_profile()
+    try:
+        yield prof
+    finally:
+        stop_profile(prof, label)
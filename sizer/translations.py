@@ -0,0 +1,74 @@
+# translations.py
+import json
+import os
+from collections.abc import Mapping
+
+# UI strings live in one JSON catalog per language (data/i18n/<lang>.json) and
+# a language is read only when it is first asked for. Its fallback chain
+# (FALLBACKS, ending in "en") is merged once at that point, so get_text is a
+# single dict lookup. Missing or mismatched keys are reported by
+#   python -m sizer.i18n check
+# (part of the build), not at lookup time.
+CATALOG_DIR = os.path.join(os.path.dirname(__file__), "data", "i18n")
+DEFAULT_LANG = "en"
+FALLBACKS = {}   # lang -> the language it falls back to before DEFAULT_LANG, e.g. {"de_at": "de"}
+
+LANG_CHOICES = [
+    ("en", "English"),
+    ("de", "Deutsch"),
+    ("it", "Italiano"),
+    ("fr", "Français"),
+    ("es", "Español")
+]
+
+# ---- Catalogs ----
+def _read(lang: str) -> dict:
+    path = os.path.join(CATALOG_DIR, f"{lang}.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def chain(lang: str) -> list:
+    # Languages consulted for lang, most specific first
+    out = []
+    while lang and lang not in out:
+        out.append(lang)
+        lang = FALLBACKS.get(lang)
+    return out if DEFAULT_LANG in out else out + [DEFAULT_LANG]
+
+_catalogs = {}
+
+def catalog(lang: str) -> dict:
+    # key -> text with the fallback chain applied; built on first use
+    cat = _catalogs.get(lang)
+    if cat is None:
+        merged = {}
+        for code in reversed(chain(lang)):
+            merged.update(_read(code))
+        cat = _catalogs[lang] = merged
+    return cat
+
+class _Translations(Mapping):
+    # Raw per-language strings (without fallbacks), read on access
+    def __init__(self):
+        self._raw = {}
+
+    def __getitem__(self, lang: str) -> dict:
+        if lang not in self._raw:
+            if not os.path.exists(os.path.join(CATALOG_DIR, f"{lang}.json")):
+                raise KeyError(lang)
+            self._raw[lang] = _read(lang)
+        return self._raw[lang]
+
+    def __iter__(self):
+        return iter(sorted(f[:-5] for f in os.listdir(CATALOG_DIR) if f.endswith(".json")))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+TRANSLATIONS = _Translations()
+
+def get_text(lang, key):
+    cat = _catalogs.get(lang) or catalog(lang)
+    return cat.get(key, key)
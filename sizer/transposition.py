@@ -0,0 +1,73 @@
+# transposition.py
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+from .solar import DEFAULT_LATITUDE, typical_poa
+
+# Annual yield factor of a plane relative to south/30°, tabulated at 1° over
+# azimuth 0–360 (360 duplicates 0 for wrap-around) × tilt 0–90. The table is
+# derived from the same irradiance model as roof.py, evaluated on a 5° grid
+# and refined to 1°; lookups are bilinear and take scalars or arrays, and a NaN
+# azimuth or tilt gives a NaN factor.
+# The table ships prebuilt as data/transposition_grid.npy (building it takes
+# about half a second, which every fresh worker process would pay);
+# SIZER_TRANSPOSITION_GRID may point at another one. Regenerate with
+#   python -m sizer.transposition sizer/data/transposition_grid.npy
+GRID_FILE = os.path.join(os.path.dirname(__file__), "data", "transposition_grid.npy")
+COARSE_STEP = 5
+REFERENCE_PLANE = (180.0, 30.0)
+
+# ---- Table ----
+def build_grid(latitude: float = DEFAULT_LATITUDE) -> np.ndarray:
+    az = np.arange(0, 361, COARSE_STEP, dtype=float)
+    tilt = np.arange(0, 91, COARSE_STEP, dtype=float)
+    coarse = np.empty((len(az), len(tilt)))
+    for j, t in enumerate(tilt):   # one (azimuths × 8760) block per tilt keeps memory small
+        coarse[:, j] = typical_poa(az, np.full_like(az, t), latitude).sum(axis=1)
+    coarse /= typical_poa([REFERENCE_PLANE[0]], [REFERENCE_PLANE[1]], latitude).sum()
+    fine_az, fine_tilt = np.arange(361, dtype=float), np.arange(91, dtype=float)
+    rows = np.array([np.interp(fine_tilt, tilt, coarse[i]) for i in range(len(az))])
+    grid = np.array([np.interp(fine_az, az, rows[:, j]) for j in range(len(fine_tilt))]).T
+    return grid.astype(np.float32)
+
+def save_grid(path: str, grid: np.ndarray = None):
+    np.save(path, build_grid() if grid is None else grid)
+
+def load_grid(path: str) -> np.ndarray:
+    grid = np.load(path)
+    if grid.shape != (361, 91):
+        raise ValueError(f"{path}: expected a 361×91 transposition table, got {grid.shape}")
+    return grid
+
+@lru_cache(maxsize=1)
+def grid() -> np.ndarray:
+    path = os.environ.get("SIZER_TRANSPOSITION_GRID") or GRID_FILE
+    table = load_grid(path) if os.path.exists(path) else build_grid()
+    table.flags.writeable = False
+    return table
+
+# ---- Lookup ----
+def yield_factors(azimuth_deg, tilt_deg) -> np.ndarray:
+    g = grid()
+    with np.errstate(invalid="ignore"):
+        a = np.mod(np.asarray(azimuth_deg, dtype=float), 360.0)
+    t = np.clip(np.asarray(tilt_deg, dtype=float), 0.0, 90.0)
+    nan = np.isnan(a) | np.isnan(t)   # also an infinite azimuth
+    if nan.any():
+        a, t = np.where(nan, 0.0, a), np.where(nan, 0.0, t)
+    i = np.minimum(a.astype(np.intp), 359)
+    j = np.minimum(t.astype(np.intp), 89)
+    fa, ft = a - i, t - j
+    out = ((1 - fa) * (1 - ft) * g[i, j] + fa * (1 - ft) * g[i + 1, j]
+           + (1 - fa) * ft * g[i, j + 1] + fa * ft * g[i + 1, j + 1])
+    return np.where(nan, np.nan, out) if nan.any() else out
+
+def yield_factor(azimuth_deg: float, tilt_deg: float) -> float:
+    return float(yield_factors(azimuth_deg, tilt_deg))
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else GRID_FILE
+    save_grid(out)
+    print(f"wrote {out}")
@@ -0,0 +1,50 @@
+# uncertainty.py
+import numpy as np
+from .batch import estimate_battery_need_components_batch, apply_system_factors_batch, pick_battery_models
+from .sizing import DEFAULT_RTE, DEFAULT_DOD
+from .systems import SYSTEMS
+
+# Monte Carlo around one sizing. Specific yield, annual consumption and the
+# daytime share of the load are drawn independently (normal, 1 σ given as a
+# fraction of the central value; the day fraction's σ is absolute) and all
+# samples go through the vectorized battery chain at once. The PV size is
+# fixed, so the inverter does not change between samples. A fixed seed keeps
+# repeated runs of the same inputs identical.
+DEFAULT_SAMPLES = 10_000
+YIELD_SIGMA = 0.07           # year-to-year weather plus model error
+CONSUMPTION_SIGMA = 0.15     # household estimates are rarely better than this
+DAY_FRACTION_SIGMA = 0.05
+PERCENTILES = (10, 50, 90)
+
+def draw_samples(specific_yield: float, annual_kwh: float, day_fraction: float, n: int = DEFAULT_SAMPLES,
+                 seed: int = 0, yield_sigma: float = YIELD_SIGMA, consumption_sigma: float = CONSUMPTION_SIGMA,
+                 day_fraction_sigma: float = DAY_FRACTION_SIGMA) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "specific_yield": np.maximum(specific_yield * (1.0 + yield_sigma * rng.standard_normal(n)), 0.0),
+        "annual_kwh": np.maximum(annual_kwh * (1.0 + consumption_sigma * rng.standard_normal(n)), 0.0),
+        "day_fraction": np.clip(day_fraction + day_fraction_sigma * rng.standard_normal(n), 0.05, 0.95),
+    }
+
+def monte_carlo(system_key: str, dc_kw: float, specific_yield: float, annual_kwh: float, day_fraction: float,
+                backup_kw: float = 0.0, backup_hours: float = 0.0, rte: float = DEFAULT_RTE, dod: float = DEFAULT_DOD,
+                n: int = DEFAULT_SAMPLES, seed: int = 0, **sigmas) -> dict:
+    SYS = SYSTEMS[system_key]
+    s = draw_samples(specific_yield, annual_kwh, day_fraction, n, seed, **sigmas)
+    comp = estimate_battery_need_components_batch(s["annual_kwh"], dc_kw, s["specific_yield"], s["day_fraction"],
+                                                  backup_kw, backup_hours)
+    usable_needed, _ = apply_system_factors_batch(comp["shiftable"], comp["backup_energy"], rte, dod)
+    rec_kwh, rec_label = pick_battery_models(usable_needed, SYS["battery_options_kwh"], SYS["battery_labels"])
+
+    # Battery picks as (label, kWh, share), smallest first; "" is no battery
+    picked, counts = np.unique(rec_kwh, return_counts=True)
+    first = {kwh: label for kwh, label in zip(rec_kwh[::-1], rec_label[::-1])}
+    return {
+        "samples": n,
+        "percentiles": PERCENTILES,
+        "specific_yield": np.percentile(s["specific_yield"], PERCENTILES).tolist(),
+        "annual_kwh": np.percentile(s["annual_kwh"], PERCENTILES).tolist(),
+        "shiftable": np.percentile(comp["shiftable"], PERCENTILES).tolist(),
+        "usable_needed": np.percentile(usable_needed, PERCENTILES).tolist(),
+        "battery_share": [(first[kwh], float(kwh), int(c) / n) for kwh, c in zip(picked, counts)],
+    }
@@ -0,0 +1,8 @@
+# conftest.py
+import os
+import sys
+
+# Lets `pytest` run from any directory without installing the package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,26 @@
+# test_catalog.py
+import numpy as np
+import pytest
+
+from sizer.catalog import SystemIndex
+from sizer.sizing import pick_inverter
+
+AC_SIZES = [3.0, 3.6, 4.0, 4.6, 5.0, 6.0, 8.0, 10.0]
+
+def _index(max_ratio: float) -> SystemIndex:
+    return SystemIndex("test", {"max_dc_ac_ratio": max_ratio, "batteries": [],
+                                "inverters": [{"model": f"M{ac}", "ac_kw": ac} for ac in AC_SIZES]})
+
+@pytest.mark.parametrize("max_ratio", [1.05, 1.1, 1.2, 1.25, 1.3, 1.5])
+def test_pick_inverter_matches_linear_scan(max_ratio):
+    # Caps below the 1.25 target used to leave no candidate (ValueError from min())
+    index = _index(max_ratio)
+    models = {ac: f"M{ac}" for ac in AC_SIZES}
+    dcs = np.concatenate([[5.5, 6.0], np.random.default_rng(0).uniform(0.5, 16.0, 500)])
+    for dc in dcs.tolist():
+        got, want = index.pick_inverter(dc), pick_inverter(dc, AC_SIZES, models, max_ratio)
+        assert (got["ac_kw"], got["within_cap"]) == (want["ac_kw"], want["within_cap"]), dc
+
+def test_cap_below_target_picks_smallest_inverter_within_cap():
+    assert _index(1.1).pick_inverter(5.5)["ac_kw"] == 5.0
+    assert _index(1.2).pick_inverter(6.0)["ac_kw"] == 5.0
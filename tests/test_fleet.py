@@ -0,0 +1,29 @@
+# test_fleet.py
+import numpy as np
+import pytest
+
+from sizer.batch import size_batch
+from sizer.fleet import aggregate, open_table, read_sites
+
+HEADER = "total_modules,annual_kwh,tilt,orientation\n"
+
+def _write(tmp_path, rows: list) -> str:
+    path = tmp_path / "sites.csv"
+    path.write_text(HEADER + "".join(r + "\n" for r in rows), encoding="utf-8")
+    return str(path)
+
+def test_fractional_tilt_survives_the_table(tmp_path):
+    table = read_sites(_write(tmp_path, ["20,5000,22.5,south", "16,4000,37.5,west"]))
+    table.save(str(tmp_path / "table"))
+    tilt = open_table(str(tmp_path / "table")).columns["tilt"]
+    assert tilt.tolist() == [22.5, 37.5]
+    direct = size_batch([20, 16], 430, [5000, 4000], [22.5, 37.5], ["south", "west"], 0.4)
+    (system,) = aggregate(table)["systems"].values()
+    assert system["dc_kw"] == pytest.approx(direct["dc_kw"].sum())
+    assert system["battery_kwh"] == pytest.approx(direct["battery_kwh"].sum())
+
+@pytest.mark.parametrize("tilt", ["-5", "91"])
+def test_out_of_range_tilt_is_rejected(tmp_path, tilt):
+    # -5 used to wrap to 251 in the uint8 column
+    with pytest.raises(ValueError, match="Row 2: tilt is not a number or outside 0..90"):
+        read_sites(_write(tmp_path, ["20,5000,30,south", f"20,5000,{tilt},south"]))
@@ -0,0 +1,46 @@
+# test_pipeline.py
+import pyarrow.csv as pcsv
+import pytest
+
+from sizer.fleet import read_sites
+from sizer.pipeline import run_pipeline
+
+HEADER = "lead_id,total_modules,annual_kwh,system,profile,orientation\n"
+
+def _write(tmp_path, rows: list) -> str:
+    path = tmp_path / "in.csv"
+    path.write_text(HEADER + "".join(r + "\n" for r in rows), encoding="utf-8")
+    return str(path)
+
+def _run(tmp_path, rows: list) -> list:
+    out = str(tmp_path / "out.csv")
+    run_pipeline(_write(tmp_path, rows), out)
+    return pcsv.read_csv(out).to_pylist()
+
+def test_valid_rows_and_aliases_are_sized(tmp_path):
+    rows = _run(tmp_path, ["a,20,5000,,p_home,south", "b,20,5000,,,se", "c,20,5000,,p_home,south-east",
+                           "d,20,5000,,p_home,200"])
+    assert not any(r["error"] for r in rows)
+    assert all(r["dc_kw"] == pytest.approx(8.6) for r in rows)
+
+@pytest.mark.parametrize("row, error", [
+    ("x,20,5000,Nope,p_home,south", "unknown system 'Nope'"),
+    ("x,20,5000,,p_weird,south", "unknown profile 'p_weird'"),
+    ("x,20,5000,,p_custom,south", "profile 'p_custom' has no fixed day fraction"),
+    ("x,20,5000,,p_home,sout", "unknown orientation 'sout'"),
+    ("x,,5000,,p_home,south", "total_modules is blank or not positive"),
+])
+def test_invalid_rows_get_an_error_and_no_results(tmp_path, row, error):
+    # One bad row must not abort the run or take its neighbours with it
+    ok, bad = _run(tmp_path, ["ok,20,5000,,p_home,south", row])
+    assert not ok["error"] and ok["dc_kw"] is not None
+    assert bad["error"].startswith(error)
+    assert bad["dc_kw"] is None and bad["battery_kwh"] is None
+
+def test_layout_ok_flags_modules_no_inverter_can_string(tmp_path):
+    rows = _run(tmp_path, ["fits,16,5000,,p_home,south", "too_many,40,5000,,p_home,south"])
+    assert [r["layout_ok"] for r in rows] == [True, False]
+
+def test_fleet_import_rejects_invalid_rows(tmp_path):
+    with pytest.raises(ValueError, match="Row 2: unknown orientation 'sout'"):
+        read_sites(_write(tmp_path, ["ok,20,5000,,p_home,south", "x,20,5000,,p_home,sout"]))
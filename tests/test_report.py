@@ -0,0 +1,32 @@
+# test_report.py
+import os
+import zipfile
+
+import pytest
+
+from sizer.report import run_reports
+from sizer.translations import get_text
+
+HEADER = "lead_id,lang,total_modules,annual_kwh,orientation\n"
+
+def _write(tmp_path, rows: list) -> str:
+    path = tmp_path / "leads.csv"
+    path.write_text(HEADER + "".join(r + "\n" for r in rows), encoding="utf-8")
+    return str(path)
+
+@pytest.mark.parametrize("orientation, shown", [("se", "southeast"), ("South-East", "southeast"),
+                                                ("W", "west"), ("200", "200°")])
+def test_orientation_aliases_are_translated(tmp_path, orientation, shown):
+    run_reports(_write(tmp_path, [f"a,de,20,5000,{orientation}"]), str(tmp_path / "out"), workers=1)
+    page = (tmp_path / "out" / "a.html").read_text(encoding="utf-8")
+    expected = shown if shown.endswith("°") else get_text("de", shown)
+    assert get_text("de", "orientation_tilt_line").format(orientation=expected, tilt="30") in page
+
+@pytest.mark.parametrize("out", ["out", "out.zip"])
+def test_colliding_lead_ids_keep_every_report(tmp_path, out):
+    rows = ["A/1,en,20,5000,south", "A_1,en,20,5000,south", "A_1,en,20,5000,south", "a_1,en,20,5000,south"]
+    stats = run_reports(_write(tmp_path, rows), str(tmp_path / out), workers=1)
+    path = str(tmp_path / out)
+    names = zipfile.ZipFile(path).namelist() if out.endswith(".zip") else os.listdir(path)
+    assert stats["reports"] == len(set(names)) == len(names) == 4
+    assert stats["renamed"] == 3
@@ -0,0 +1,34 @@
+# test_surface.py
+import numpy as np
+
+from sizer import SYSTEMS
+from sizer.simulation import hourly_pv_profile, hourly_load_profile, simulate_system
+from sizer.surface import ERROR_FLOORS, TOLERANCE, load_surface, lookup
+
+def test_shipped_table_loads_and_passed_its_check():
+    surface = load_surface()
+    assert surface is not None
+    assert float(surface["max_error"]) <= TOLERANCE and float(surface["served"]) > 0.5
+
+def test_served_lookups_match_the_live_model():
+    rng = np.random.default_rng(1)
+    served = 0
+    for _ in range(60):
+        SYS = SYSTEMS[rng.choice(list(SYSTEMS))]
+        dc_kw, specific_yield = rng.uniform(3.0, 12.0), rng.uniform(850.0, 1150.0)
+        annual_kwh, day_fraction = rng.uniform(2500.0, 9000.0), rng.uniform(0.25, 0.6)
+        approx = lookup(SYS, dc_kw, specific_yield, annual_kwh, day_fraction)
+        if approx is None:
+            continue
+        served += 1
+        live = simulate_system(SYS, hourly_pv_profile(dc_kw, specific_yield),
+                               hourly_load_profile(annual_kwh, day_fraction))
+        # The build's error measure: shares absolutely, energies and cycles relative to a floor
+        for key in ("self_consumption", "autarky"):
+            assert np.all(np.abs(approx[key] - live[key]) <= TOLERANCE)
+        for key in ("discharged_kwh", "grid_import_kwh", "export_kwh"):
+            floor = ERROR_FLOORS[key[:-4]] * annual_kwh
+            assert np.all(np.abs(approx[key] - live[key]) <= TOLERANCE * np.maximum(np.abs(live[key]), floor))
+        floor = ERROR_FLOORS["cycles"]
+        assert np.all(np.abs(approx["cycles"] - live["cycles"]) <= TOLERANCE * np.maximum(live["cycles"], floor))
+    assert served >= 20
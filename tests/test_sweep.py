@@ -0,0 +1,18 @@
+# test_sweep.py
+import csv
+
+from sizer import SYSTEMS
+from sizer.sweep import AXES, RESULT_COLUMNS, run_sweep
+
+SINGLE_PHASE = next(iter(SYSTEMS))
+
+def test_sweep_writes_every_point_with_layout_ok(tmp_path):
+    # 40 modules exceed what the single-phase inverters can string; 16 fit
+    out = tmp_path / "sweep.csv"
+    spec = {"system": [SINGLE_PHASE], "total_modules": [16, 40], "annual_kwh": [4000, 6000],
+            "profile": ["p_balanced"]}
+    assert run_sweep(spec, str(out), workers=1) == 4
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(AXES + RESULT_COLUMNS)
+    assert {r["total_modules"]: r["layout_ok"] for r in rows} == {"16": "True", "40": "False"}
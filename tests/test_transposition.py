@@ -0,0 +1,17 @@
+# test_transposition.py
+import numpy as np
+
+from sizer.transposition import REFERENCE_PLANE, yield_factor, yield_factors
+
+def test_reference_plane_is_one():
+    assert yield_factor(*REFERENCE_PLANE) == np.float32(1.0)
+
+def test_no_steps_between_the_old_tilt_buckets():
+    # The bucketed helpers jumped at 15/16° and 45/46°; the table is continuous
+    tilt = np.arange(10.0, 50.0, 0.1)
+    assert np.abs(np.diff(yield_factors(180.0, tilt))).max() < 0.005
+
+def test_nan_in_nan_out():
+    out = yield_factors([180.0, np.nan, np.inf, 90.0], [30.0, 30.0, 30.0, np.nan])
+    assert out[0] == np.float32(1.0) and np.isnan(out[1:]).all()
+    assert np.isnan(yield_factor(np.nan, 30.0))
@@ -1,357 +0,0 @@
-# translations.py
-
-LANG_CHOICES = [
-    ("en", "English"),
-    ("de", "Deutsch"),
-    ("it", "Italiano"),
-    ("fr", "Français"),
-    ("es", "Español")
-]
-
-TRANSLATIONS = {
-    "en": {
-        "title": "🔋 Sungrow Battery Sizer",
-        "subtitle": "Estimate the ideal Sungrow battery and inverter size for your PV system.",
-        "system_type": "System type",
-        "pv_consumption": "Your PV & Consumption",
-        "modules_installed": "Total PV modules installed",
-        "module_wattage": "Module wattage (Wp)",
-        "annual_consumption": "Annual electricity consumption (kWh)",
-        "roof_layout": "Roof layout",
-        "where_modules": "Where are your modules?",
-        "all_one_side": "All on one side",
-        "split_two_sides": "Split across two opposite sides",
-        "orientation": "Orientation",
-        "tilt": "Tilt (degrees)",
-        "main_side_orientation": "Main side orientation",
-        "daily_load_profile": "Daily load profile",
-        "choose_profile": "Choose a profile",
-        "p_balanced": "Balanced day/night",
-        "p_workday": "Workday away (lower daytime use)",
-        "p_home": "Home most of day",
-        "p_evening": "Evening peaks",
-        "p_heatpump": "Heat pump / daytime loads",
-        "p_custom": "Custom",
-        "custom_day_pct": "Custom: % of daily load in daytime",
-        "backup_optional": "Backup (optional)",
-        "backup_kw": "Critical load power (kW)",
-        "backup_h": "Duration of backup (hours)",
-        "advanced": "Advanced settings",
-        "specific_yield": "Specific PV yield (kWh/kWp/year)",
-        "rte": "Battery round-trip efficiency",
-        "dod": "Battery usable depth of discharge",
-        "degradation": "Extra capacity reserve for degradation",
-        "calculate": "Calculate recommendation",
-        "inv_reco": "Inverter recommendation",
-        "pv_dc_size": "PV DC size",
-        "suggested_inverter": "Suggested inverter model",
-        "dcac_help": "DC/AC ratio is {ratio}, max allowed is {cap}",
-        "dcac_warn": "Your DC/AC ratio exceeds the max {cap}",
-        "backup_power_warn": "Backup power need ({need} kW) exceeds inverter AC rating ({ac} kW)",
-        "battery_inputs": "Battery sizing inputs",
-        "orientation_tilt_line": "Orientation: {orientation}, Tilt: {tilt}°",
-        "profile_line": "Profile: {profile} — Day {day}% / Night {night}%",
-        "daily_load_line": "Daily load: {daily_load:.1f} kWh — PV generation: {daily_pv:.1f} kWh/day ({dc_kw:.1f} kW DC × {specific_yield:.0f} kWh/kWp/year)",
-        "day_night_line": "Day load: {day_load:.1f} kWh — Night load: {night_load:.1f} kWh",
-        "surplus_shift_line": "Day surplus: {surplus:.1f} kWh — Shiftable to night: {shiftable:.1f} kWh",
-        "two_side_caption": "East/West layout reduces midday peak and increases morning/evening production.",
-        "backup_req_line": "Backup need: {kw:.1f} kW × {h:.1f} h = {energy:.1f} kWh",
-        "batt_reco": "Suggested battery model",
-        "usable_capacity": "Usable capacity",
-        "suggested_battery": "Suggested model",
-        "no_battery": "No battery recommended",
-        "rounded_caption": "Rounded to nearest step for {battery_type} ({battery_step_display}).",
-        "breakdown_line": "Self-consumption: {self:.1f} kWh + Backup reserve: {backup:.1f} kWh = Total: {total:.1f} kWh",
-        "small_benefit": "Battery benefit too small based on your inputs.",
-        "sanity": "System constraints & sanity check",
-        "mppt_strings": "MPPTs: {mppts}, Max strings total: {strings}",
-        "string_current": "Max string current: {current} A",
-        "dcac_cap": "Max DC/AC ratio: {cap}",
-        "quick_estimate": "This is a quick sizing tool — confirm with your installer.",
-        "landing_hint": "Fill in your PV system details above to get a recommendation.",
-        "south": "South", "southeast": "South-East", "southwest": "South-West",
-        "east": "East", "west": "West", "north": "North",
-        "northeast": "North-East", "northwest": "North-West",
-        "constraints_title": "System Constraints & Assumptions",
-        "assumption_self_consumption": "- Focus: **self-consumption** only (store daytime PV and use it in the evening/night).",
-        "assumption_single_orientation": "- PV layout simplified to **one orientation/tilt** (no multi-roof or mixed strings).",
-        "assumption_average_yield": "- PV production uses an **average specific yield** (no monthly/seasonal modeling).",
-        "assumption_profile_simplified": "- Load profile simplified to a **day/night split**; intraday peaks not modeled.",
-        "assumption_no_tariffs": "- **Tariffs, feed-in limits, export credits** and grid constraints are **not** modeled.",
-        "assumption_no_string_limits": "- **String voltage/length limits** and minimum modules per string are not validated here.",
-        "assumption_fixed_efficiencies": "- **Fixed** battery DoD=95% and RTE=90%; inverter/aux losses not explicitly modeled.",
-        "assumption_backup_additive": "- **Backup energy** (kW × h) is added on top of self-consumption and is not cycled daily.",
-    },
-    # --- German ---
-    "de": {
-        "title": "🔋 Sungrow Batteriesizer",
-        "subtitle": "Schätzen Sie die ideale Sungrow-Batterie- und Wechselrichtergröße für Ihre PV-Anlage.",
-        "system_type": "Systemtyp",
-        "pv_consumption": "Ihre PV- & Verbrauchsdaten",
-        "modules_installed": "Gesamtzahl der PV-Module",
-        "module_wattage": "Modulleistung (Wp)",
-        "annual_consumption": "Jährlicher Stromverbrauch (kWh)",
-        "roof_layout": "Dachanordnung",
-        "where_modules": "Wo sind Ihre Module?",
-        "all_one_side": "Alle auf einer Seite",
-        "split_two_sides": "Auf zwei gegenüberliegenden Seiten verteilt",
-        "orientation": "Ausrichtung",
-        "tilt": "Neigung (Grad)",
-        "main_side_orientation": "Ausrichtung Hauptseite",
-        "daily_load_profile": "Tägliches Lastprofil",
-        "choose_profile": "Profil auswählen",
-        "p_balanced": "Ausgeglichen Tag/Nacht",
-        "p_workday": "Arbeitstag abwesend (weniger Tageslast)",
-        "p_home": "Meistens zuhause",
-        "p_evening": "Abendspitzen",
-        "p_heatpump": "Wärmepumpe / Tageslasten",
-        "p_custom": "Benutzerdefiniert",
-        "custom_day_pct": "Benutzerdefiniert: % der Tageslast am Tag",
-        "backup_optional": "Backup (optional)",
-        "backup_kw": "Kritische Lastleistung (kW)",
-        "backup_h": "Dauer des Backups (Stunden)",
-        "advanced": "Erweiterte Einstellungen",
-        "specific_yield": "Spezifischer PV-Ertrag (kWh/kWp/Jahr)",
-        "rte": "Batterie-Wirkungsgrad",
-        "dod": "Batterie-Nutzungstiefe",
-        "degradation": "Zusätzliche Kapazitätsreserve für Alterung",
-        "calculate": "Empfehlung berechnen",
-        "inv_reco": "Wechselrichterempfehlung",
-        "pv_dc_size": "PV-DC-Leistung",
-        "suggested_inverter": "Empfohlenes Modell",
-        "dcac_help": "DC/AC-Verhältnis: {ratio}, max erlaubt: {cap}",
-        "dcac_warn": "Ihr DC/AC-Verhältnis überschreitet das Maximum {cap}",
-        "backup_power_warn": "Backup-Leistung ({need} kW) übersteigt AC-Nennleistung ({ac} kW)",
-        "battery_inputs": "Eingaben zur Batteriesizing",
-        "orientation_tilt_line": "Ausrichtung: {orientation}, Neigung: {tilt}°",
-        "profile_line": "Profil: {profile} — Tag {day}% / Nacht {night}%",
-        "daily_load_line": "Tageslast: {daily_load:.1f} kWh — PV-Erzeugung: {daily_pv:.1f} kWh/Tag ({dc_kw:.1f} kW DC × {specific_yield:.0f} kWh/kWp/Jahr)",
-        "day_night_line": "Tageslast: {day_load:.1f} kWh — Nachtlast: {night_load:.1f} kWh",
-        "surplus_shift_line": "Tagüberschuss: {surplus:.1f} kWh — Verschiebbar in Nacht: {shiftable:.1f} kWh",
-        "two_side_caption": "Ost/West-Anordnung reduziert Mittags-Peak und erhöht Morgen/Abendproduktion.",
-        "backup_req_line": "Backup-Bedarf: {kw:.1f} kW × {h:.1f} h = {energy:.1f} kWh",
-        "batt_reco": "Empfohlene Batterie",
-        "usable_capacity": "Nutzbare Kapazität",
-        "suggested_battery": "Empfohlenes Modell",
-        "no_battery": "Keine Batterie empfohlen",
-        "rounded_caption": "Aufgerundet auf nächstes {battery_type}-Schrittmaß ({battery_step_display}).",
-        "breakdown_line": "Eigenverbrauch: {self:.1f} kWh + Backup-Reserve: {backup:.1f} kWh = Gesamt: {total:.1f} kWh",
-        "small_benefit": "Batterienutzen zu gering basierend auf Ihren Eingaben.",
-        "sanity": "Systemgrenzen & Prüfung",
-        "mppt_strings": "MPPTs: {mppts}, Max Strings gesamt: {strings}",
-        "string_current": "Max. Stringstrom: {current} A",
-        "dcac_cap": "Max DC/AC-Verhältnis: {cap}",
-        "quick_estimate": "Dies ist ein Schnellrechner – bitte mit Installateur bestätigen.",
-        "landing_hint": "Geben Sie oben Ihre PV-Anlagedaten ein, um eine Empfehlung zu erhalten.",
-        "south": "Süd", "southeast": "Südost", "southwest": "Südwest",
-        "east": "Ost", "west": "West", "north": "Nord",
-        "northeast": "Nordost", "northwest": "Nordwest",
-        "constraints_title": "Systemgrenzen & Annahmen",
-        "assumption_self_consumption": "- Fokus: **Eigenverbrauch** (PV vom Tag wird für Abend/Nacht gespeichert).",
-        "assumption_single_orientation": "- PV-Layout vereinfacht auf **eine Ausrichtung/Neigung** (keine Mischdächer/Strings).",
-        "assumption_average_yield": "- PV-Erzeugung mit **durchschnittlichem spezifischem Ertrag** (keine Saison/Monatsmodelle).",
-        "assumption_profile_simplified": "- Lastprofil als **Tag/Nacht-Aufteilung** vereinfacht; Tages-Spitzen nicht modelliert.",
-        "assumption_no_tariffs": "- **Tarife, Einspeisegrenzen, Vergütungen** und Netzrestriktionen werden **nicht** berücksichtigt.",
-        "assumption_no_string_limits": "- **String-Spannungs-/Längenlimits** und Mindestmodule pro String werden hier nicht geprüft.",
-        "assumption_fixed_efficiencies": "- **Feste** Werte: DoD=95% und RTE=90%; WR/Hilfsverluste nicht explizit modelliert.",
-        "assumption_backup_additive": "- **Backup-Energie** (kW × h) wird zusätzlich zum Eigenverbrauch reserviert, nicht täglich zyklisiert.",
-    },
-    # --- Italian ---
-    "it": {
-        "title": "🔋 Calcolatore Batteria Sungrow",
-        "subtitle": "Stima la dimensione ideale della batteria e dell'inverter Sungrow per il tuo impianto FV.",
-        "system_type": "Tipo di sistema",
-        "pv_consumption": "Il tuo FV e consumo",
-        "modules_installed": "Numero totale di moduli FV",
-        "module_wattage": "Potenza modulo (Wp)",
-        "annual_consumption": "Consumo annuo di energia (kWh)",
-        "roof_layout": "Disposizione del tetto",
-        "where_modules": "Dove sono i tuoi moduli?",
-        "all_one_side": "Tutti su un lato",
-        "split_two_sides": "Su due lati opposti",
-        "orientation": "Orientamento",
-        "tilt": "Inclinazione (gradi)",
-        "main_side_orientation": "Orientamento lato principale",
-        "daily_load_profile": "Profilo di carico giornaliero",
-        "choose_profile": "Scegli un profilo",
-        "p_balanced": "Bilanciato giorno/notte",
-        "p_workday": "Giorno lavorativo fuori casa",
-        "p_home": "A casa la maggior parte del giorno",
-        "p_evening": "Picchi serali",
-        "p_heatpump": "Pompa di calore / carichi diurni",
-        "p_custom": "Personalizzato",
-        "custom_day_pct": "% carico giornaliero diurno",
-        "backup_optional": "Backup (opzionale)",
-        "backup_kw": "Potenza carichi critici (kW)",
-        "backup_h": "Durata backup (ore)",
-        "advanced": "Impostazioni avanzate",
-        "specific_yield": "Rendimento specifico FV (kWh/kWp/anno)",
-        "rte": "Efficienza ciclo carica/scarica",
-        "dod": "Profondità di scarica utilizzabile",
-        "degradation": "Riserva extra per degradazione",
-        "calculate": "Calcola raccomandazione",
-        "inv_reco": "Inverter raccomandato",
-        "pv_dc_size": "Potenza FV DC",
-        "suggested_inverter": "Modello suggerito",
-        "dcac_help": "Rapporto DC/AC {ratio}, max consentito {cap}",
-        "dcac_warn": "Rapporto DC/AC supera il massimo {cap}",
-        "backup_power_warn": "Potenza backup richiesta ({need} kW) supera AC inverter ({ac} kW)",
-        "battery_inputs": "Dati per calcolo batteria",
-        "orientation_tilt_line": "Orientamento: {orientation}, Inclinazione: {tilt}°",
-        "profile_line": "Profilo: {profile} — Giorno {day}% / Notte {night}%",
-        "daily_load_line": "Carico giornaliero: {daily_load:.1f} kWh — Produzione FV: {daily_pv:.1f} kWh/giorno ({dc_kw:.1f} kW DC × {specific_yield:.0f} kWh/kWp/anno)",
-        "day_night_line": "Carico giorno: {day_load:.1f} kWh — Carico notte: {night_load:.1f} kWh",
-        "surplus_shift_line": "Eccesso giorno: {surplus:.1f} kWh — Spostabile a notte: {shiftable:.1f} kWh",
-        "two_side_caption": "Disposizione Est/Ovest riduce picco di mezzogiorno e aumenta produzione mattina/sera.",
-        "backup_req_line": "Richiesta backup: {kw:.1f} kW × {h:.1f} h = {energy:.1f} kWh",
-        "batt_reco": "Batteria consigliata",
-        "usable_capacity": "Capacità utilizzabile",
-        "suggested_battery": "Modello suggerito",
-        "no_battery": "Nessuna batteria consigliata",
-        "rounded_caption": "Arrotondato al passo più vicino per {battery_type} ({battery_step_display}).",
-        "breakdown_line": "Autoconsumo: {self:.1f} kWh + Riserva backup: {backup:.1f} kWh = Totale: {total:.1f} kWh",
-        "small_benefit": "Beneficio batteria troppo basso per i tuoi dati.",
-        "sanity": "Limiti di sistema e verifica",
-        "mppt_strings": "MPPT: {mppts}, Stringhe max totali: {strings}",
-        "string_current": "Corrente max stringa: {current} A",
-        "dcac_cap": "Rapporto DC/AC max: {cap}",
-        "quick_estimate": "Calcolo rapido — conferma con l’installatore.",
-        "landing_hint": "Inserisci i dati FV per ottenere raccomandazione.",
-        "south": "Sud", "southeast": "Sud-Est", "southwest": "Sud-Ovest",
-        "east": "Est", "west": "Ovest", "north": "Nord",
-        "northeast": "Nord-Est", "northwest": "Nord-Ovest",
-    },
-    # --- French ---
-    "fr": {
-        "title": "🔋 Calculateur de Batterie Sungrow",
-        "subtitle": "Estimez la taille idéale de batterie et d'onduleur Sungrow pour votre installation PV.",
-        "system_type": "Type de système",
-        "pv_consumption": "Votre PV & consommation",
-        "modules_installed": "Nombre total de modules PV",
-        "module_wattage": "Puissance du module (Wp)",
-        "annual_consumption": "Consommation annuelle d'électricité (kWh)",
-        "roof_layout": "Disposition du toit",
-        "where_modules": "Où sont vos modules ?",
-        "all_one_side": "Tous d'un côté",
-        "split_two_sides": "Répartis sur deux côtés opposés",
-        "orientation": "Orientation",
-        "tilt": "Inclinaison (degrés)",
-        "main_side_orientation": "Orientation côté principal",
-        "daily_load_profile": "Profil de charge journalier",
-        "choose_profile": "Choisir un profil",
-        "p_balanced": "Équilibré jour/nuit",
-        "p_workday": "En journée au travail (faible usage diurne)",
-        "p_home": "À la maison la plupart de la journée",
-        "p_evening": "Pics en soirée",
-        "p_heatpump": "Pompe à chaleur / charges diurnes",
-        "p_custom": "Personnalisé",
-        "custom_day_pct": "% de la charge quotidienne en journée",
-        "backup_optional": "Backup (optionnel)",
-        "backup_kw": "Puissance des charges critiques (kW)",
-        "backup_h": "Durée du backup (heures)",
-        "advanced": "Paramètres avancés",
-        "specific_yield": "Productible PV spécifique (kWh/kWp/an)",
-        "rte": "Rendement aller-retour batterie",
-        "dod": "Profondeur de décharge utilisable",
-        "degradation": "Réserve de capacité supplémentaire pour dégradation",
-        "calculate": "Calculer la recommandation",
-        "inv_reco": "Onduleur recommandé",
-        "pv_dc_size": "Puissance PV DC",
-        "suggested_inverter": "Modèle suggéré",
-        "dcac_help": "Rapport DC/AC {ratio}, max autorisé {cap}",
-        "dcac_warn": "Rapport DC/AC dépasse le max {cap}",
-        "backup_power_warn": "Besoins backup ({need} kW) dépassent la puissance AC ({ac} kW)",
-        "battery_inputs": "Données pour dimensionnement batterie",
-        "orientation_tilt_line": "Orientation : {orientation}, Inclinaison : {tilt}°",
-        "profile_line": "Profil : {profile} — Jour {day}% / Nuit {night}%",
-        "daily_load_line": "Charge journalière : {daily_load:.1f} kWh — Production PV : {daily_pv:.1f} kWh/jour ({dc_kw:.1f} kW DC × {specific_yield:.0f} kWh/kWp/an)",
-        "day_night_line": "Charge jour : {day_load:.1f} kWh — Charge nuit : {night_load:.1f} kWh",
-        "surplus_shift_line": "Surplus jour : {surplus:.1f} kWh — Transférable la nuit : {shiftable:.1f} kWh",
-        "two_side_caption": "Disposition Est/Ouest réduit le pic de midi et augmente la production matin/soir.",
-        "backup_req_line": "Besoins backup : {kw:.1f} kW × {h:.1f} h = {energy:.1f} kWh",
-        "batt_reco": "Batterie recommandée",
-        "usable_capacity": "Capacité utilisable",
-        "suggested_battery": "Modèle suggéré",
-        "no_battery": "Aucune batterie recommandée",
-        "rounded_caption": "Arrondi à l'étape la plus proche pour {battery_type} ({battery_step_display}).",
-        "breakdown_line": "Autoconsommation : {self:.1f} kWh + Réserve backup : {backup:.1f} kWh = Total : {total:.1f} kWh",
-        "small_benefit": "Avantage batterie trop faible selon vos données.",
-        "sanity": "Contraintes système & vérification",
-        "mppt_strings": "MPPT : {mppts}, Nombre max de strings : {strings}",
-        "string_current": "Courant max string : {current} A",
-        "dcac_cap": "Rapport DC/AC max : {cap}",
-        "quick_estimate": "Ceci est un calcul rapide — confirmez avec votre installateur.",
-        "landing_hint": "Remplissez vos données PV ci-dessus pour obtenir une recommandation.",
-        "south": "Sud", "southeast": "Sud-Est", "southwest": "Sud-Ouest",
-        "east": "Est", "west": "Ouest", "north": "Nord",
-        "northeast": "Nord-Est", "northwest": "Nord-Ouest"
-    },
-    # --- Spanish ---
-    "es": {
-        "title": "🔋 Calculadora de Batería Sungrow",
-        "subtitle": "Estima el tamaño ideal de la batería e inversor Sungrow para tu sistema FV.",
-        "system_type": "Tipo de sistema",
-        "pv_consumption": "Tu FV y consumo",
-        "modules_installed": "Número total de módulos FV",
-        "module_wattage": "Potencia del módulo (Wp)",
-        "annual_consumption": "Consumo anual de electricidad (kWh)",
-        "roof_layout": "Diseño del tejado",
-        "where_modules": "¿Dónde están tus módulos?",
-        "all_one_side": "Todos en un lado",
-        "split_two_sides": "Divididos en dos lados opuestos",
-        "orientation": "Orientación",
-        "tilt": "Inclinación (grados)",
-        "main_side_orientation": "Orientación del lado principal",
-        "daily_load_profile": "Perfil de carga diario",
-        "choose_profile": "Elegir un perfil",
-        "p_balanced": "Equilibrado día/noche",
-        "p_workday": "Día laboral fuera de casa",
-        "p_home": "En casa la mayor parte del día",
-        "p_evening": "Picos nocturnos",
-        "p_heatpump": "Bomba de calor / cargas diurnas",
-        "p_custom": "Personalizado",
-        "custom_day_pct": "% de carga diaria en el día",
-        "backup_optional": "Respaldo (opcional)",
-        "backup_kw": "Potencia de cargas críticas (kW)",
-        "backup_h": "Duración del respaldo (horas)",
-        "advanced": "Configuraciones avanzadas",
-        "specific_yield": "Producción específica FV (kWh/kWp/año)",
-        "rte": "Eficiencia ciclo completo batería",
-        "dod": "Profundidad de descarga utilizable",
-        "degradation": "Reserva extra por degradación",
-        "calculate": "Calcular recomendación",
-        "inv_reco": "Inversor recomendado",
-        "pv_dc_size": "Potencia FV DC",
-        "suggested_inverter": "Modelo sugerido",
-        "dcac_help": "Relación DC/AC {ratio}, máximo permitido {cap}",
-        "dcac_warn": "Relación DC/AC supera el máximo {cap}",
-        "backup_power_warn": "Necesidad de respaldo ({need} kW) excede la potencia AC ({ac} kW)",
-        "battery_inputs": "Datos para dimensionar la batería",
-        "orientation_tilt_line": "Orientación: {orientation}, Inclinación: {tilt}°",
-        "profile_line": "Perfil: {profile} — Día {day}% / Noche {night}%",
-        "daily_load_line": "Carga diaria: {daily_load:.1f} kWh — Producción FV: {daily_pv:.1f} kWh/día ({dc_kw:.1f} kW DC × {specific_yield:.0f} kWh/kWp/año)",
-        "day_night_line": "Carga día: {day_load:.1f} kWh — Carga noche: {night_load:.1f} kWh",
-        "surplus_shift_line": "Excedente día: {surplus:.1f} kWh — Transferible a noche: {shiftable:.1f} kWh",
-        "two_side_caption": "Disposición Este/Oeste reduce el pico del mediodía y aumenta producción mañana/tarde.",
-        "backup_req_line": "Necesidad de respaldo: {kw:.1f} kW × {h:.1f} h = {energy:.1f} kWh",
-        "batt_reco": "Batería recomendada",
-        "usable_capacity": "Capacidad utilizable",
-        "suggested_battery": "Modelo sugerido",
-        "no_battery": "No se recomienda batería",
-        "rounded_caption": "Redondeado al paso más cercano para {battery_type} ({battery_step_display}).",
-        "breakdown_line": "Autoconsumo: {self:.1f} kWh + Reserva respaldo: {backup:.1f} kWh = Total: {total:.1f} kWh",
-        "small_benefit": "Beneficio de batería demasiado pequeño según tus datos.",
-        "sanity": "Restricciones del sistema y verificación",
-        "mppt_strings": "MPPT: {mppts}, Máx. cadenas totales: {strings}",
-        "string_current": "Corriente máx. por cadena: {current} A",
-        "dcac_cap": "Relación DC/AC máx: {cap}",
-        "quick_estimate": "Cálculo rápido — confirma con tu instalador.",
-        "landing_hint": "Introduce los datos FV para obtener recomendación.",
-        "south": "Sur", "southeast": "Sureste", "southwest": "Suroeste",
-        "east": "Este", "west": "Oeste", "north": "Norte",
-        "northeast": "Noreste", "northwest": "Noroeste"
-    }
-}
-
-def get_text(lang, key):
-    return TRANSLATIONS.get(lang, {}).get(key, TRANSLATIONS["en"].get(key, key))
\ No newline at end of file